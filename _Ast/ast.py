@@ -3,6 +3,7 @@ import _Token.token as token
 
 # Abstract class for a Node in AST
 class Node:
+    __slots__ = ()
     def tokenLiteral(self) -> str:
         pass
     def string(self) -> str:
@@ -10,16 +11,19 @@ class Node:
 
 # Abstract class for a Statement in AST
 class Statement(Node):
+    __slots__ = ()
     def statementNode(self):
         pass
 
 # Abstract class for an Expression in AST
 class Expression(Node):
+    __slots__ = ()
     def expressionNode(self):
         pass
 
 # Program as a collection of statements
 class Program:
+    __slots__ = ("statements",)
     def __init__(self):
         self.statements = []
     
@@ -40,9 +44,13 @@ class Program:
 
 # Identifier node
 class Identifier(Expression):
+    __slots__ = ("token", "value", "depth", "slot")
     def __init__(self, token : token.Token, value):
         self.token = token
         self.value = value
+        # lexical address (scopes to go up, slot), set by the resolver
+        self.depth = None
+        self.slot = None
     
     def expressionNode(self):
         return super().expressionNode()
@@ -55,12 +63,16 @@ class Identifier(Expression):
 
 # LetStatement node
 class LetStatement(Statement):
+    __slots__ = ("token", "name", "value", "instance", "depth", "slot")
     def __init__(self, token : token.Token, name : Identifier = None, 
                  value : Expression = None):
         self.token = token
         self.name = name
         self.value = value
         self.instance = None
+        # slot bound in the current scope, set by the resolver
+        self.depth = None
+        self.slot = None
 
     def statementNode(self):
         return super().statementNode()
@@ -82,6 +94,7 @@ class LetStatement(Statement):
 
 # ReturnStatement node
 class ReturnStatement(Statement):
+    __slots__ = ("token", "value")
     def __init__(self, token : token.Token = None, 
                  value : Expression = None):
         self.token = token
@@ -106,6 +119,7 @@ class ReturnStatement(Statement):
 
 # ExpressionStatement node
 class ExpressionStatement(Statement):
+    __slots__ = ("token", "expression")
     def __init__(self, token : token.Token, 
                  expression : Expression = None):
         self.token = token
@@ -125,10 +139,13 @@ class ExpressionStatement(Statement):
 
 # IntegerLiteral node
 class IntegerLiteral(Expression):
+    __slots__ = ("token", "value", "constant")
     def __init__(self, token : token.Token, 
                  value : int = None):
         self.token = token
         self.value = value
+        # object the literal evaluates to, made once by the evaluator
+        self.constant = None
     
     def expressionNode(self):
         return super().expressionNode()
@@ -141,6 +158,7 @@ class IntegerLiteral(Expression):
 
 # PrefixExpression node
 class PrefixExpression(Expression):
+    __slots__ = ("token", "operator", "right")
     def __init__(self, token : token.Token, 
                  operator : str = None, right : Expression = None):
         self.token = token
@@ -158,12 +176,21 @@ class PrefixExpression(Expression):
 
 # InfixExpression node
 class InfixExpression(Expression):
+    __slots__ = ("token", "left", "operator", "right", "leftClass", "rightClass", "hits", "quick", "member")
     def __init__(self, token : token.Token, left : Expression = None, 
                  operator : str = None, right : Expression = None):
         self.token = token
         self.left = left
         self.operator = operator
         self.right = right
+        # type feedback: classes of the operands seen in a row, and the
+        # specialized operation installed for them (see evaluator.applyInfix)
+        self.leftClass = None
+        self.rightClass = None
+        self.hits = 0
+        self.quick = None
+        # inline cache of the member read by obj.name and obj.name(...)
+        self.member = None
     
     def expressionNode(self):
         return super().expressionNode()
@@ -176,6 +203,7 @@ class InfixExpression(Expression):
     
 # Boolean node
 class Boolean(Expression):
+    __slots__ = ("token", "value")
     def __init__(self, token : token.Token, 
                  value : bool = None):
         self.token = token
@@ -192,9 +220,23 @@ class Boolean(Expression):
 
 # BlockStatement node (colletion of statements)
 class BlockStatement(Statement):
+    __slots__ = ("token", "statements", "layout", "scoped", "frames", "calls", "jit")
     def __init__(self, token, statements = None):
         self.token = token
         self.statements = statements
+        # layout (name -> slot) of the scope the block runs in, set by the resolver
+        self.layout = None
+        # False if the block binds no names and runs in the enclosing environment
+        self.scoped = True
+        # environments of finished calls of the function with this body, free
+        # for the next calls; None if they may still be referenced (no reuse)
+        self.frames = None
+        # calls of the functions with this body run by Eval, until the body
+        # is compiled (see evaluator.JIT_THRESHOLD)
+        self.calls = 0
+        # python function of the body of a hot function, False if it can't
+        # be compiled, None until it is tried (see _Jit)
+        self.jit = None
     
     def tokenLiteral(self) -> str:
         return self.token.literal
@@ -210,6 +252,7 @@ class BlockStatement(Statement):
     
 # IfExpression node
 class IfExpression(Expression):
+    __slots__ = ("token", "condition", "consequence", "alternative")
     def __init__(self, token : token.Token, condition : Expression = None, 
                  consequence : BlockStatement = None, alternative : BlockStatement = None):
         self.token = token
@@ -232,6 +275,7 @@ class IfExpression(Expression):
 
 # FunctionLiteral node
 class FunctionLiteral(Expression):
+    __slots__ = ("token", "parameters", "body")
     def __init__(self, token : token.Token, 
                  parameters : List[Identifier] = None, body : BlockStatement = None):
         self.token = token
@@ -256,6 +300,7 @@ class FunctionLiteral(Expression):
     
 # CallExpression node
 class CallExpression(Expression):
+    __slots__ = ("token", "function", "arguments")
     def __init__(self, token : token.Token, 
                  function : Expression = None, arguments : List[Expression] = None):
         self.token = token
@@ -281,9 +326,12 @@ class CallExpression(Expression):
         return out
     
 class StringLiteral(Expression):
+    __slots__ = ("token", "value", "constant")
     def __init__(self, token : token.Token, value : str = None):
         self.token = token
         self.value = value
+        # object the literal evaluates to, made once by the evaluator
+        self.constant = None
     
     def expressionNode(self):
         return super().expressionNode()
@@ -295,6 +343,7 @@ class StringLiteral(Expression):
         return self.token.literal
 
 class ArrayLiteral(Expression):
+    __slots__ = ("token", "elements")
     def __init__(self, token : token.Token, elements : List[Expression] = None):
         self.token = token
         self.elements = elements
@@ -313,10 +362,16 @@ class ArrayLiteral(Expression):
         return "[" + ", ".join(elements) + "]"
 
 class IndexExpression(Expression):
+    __slots__ = ("token", "left", "index", "leftClass", "rightClass", "hits", "quick")
     def __init__(self, token : token.Token, left : Expression = None, index : Expression = None):
         self.token = token
         self.left = left
         self.index = index
+        # type feedback, as in InfixExpression
+        self.leftClass = None
+        self.rightClass = None
+        self.hits = 0
+        self.quick = None
     
     def expressionNode(self):
         return super().expressionNode()
@@ -328,6 +383,7 @@ class IndexExpression(Expression):
         return "(" + self.left.string() + "[" + self.index.string() + "])"
     
 class HashLiteral(Expression):
+    __slots__ = ("token", "pairs")
     def __init__(self, token : token.Token, pairs : Dict = None):
         self.token = token
         self.pairs = pairs
@@ -346,6 +402,7 @@ class HashLiteral(Expression):
         return "{" + ", ".join(pairs) + "}"
 
 class WhileExpression(Expression):
+    __slots__ = ("token", "condition", "block")
     def __init__(self, token : token.Token, condition : Expression = None, block : BlockStatement = None):
         self.token = token
         self.condition = condition
@@ -358,15 +415,19 @@ class WhileExpression(Expression):
         return self.token.litearl
     
     def string(self) -> str:
-        return "while" + self.condition.string() + " " + self.consequence.string()
+        return "while" + self.condition.string() + " " + self.block.string()
 
 # Assign statement node
 class AssignStatement(Statement):
+    __slots__ = ("token", "name", "value", "depth", "slot")
     def __init__(self, token : token.Token, name : Identifier = None, 
                  value : Expression = None):
         self.token = token
         self.name = name
         self.value = value
+        # lexical address of the assigned name, set by the resolver
+        self.depth = None
+        self.slot = None
 
     def statementNode(self):
         return super().statementNode()
@@ -384,8 +445,45 @@ class AssignStatement(Statement):
 
         return msg
 
+# CompoundAssignStatement node: target op= value, and target++ / target--
+# (value 1). The target is an identifier, an index expression (arr[i]) or
+# a member (obj.field); it is looked up once and updated in place
+class CompoundAssignStatement(Statement):
+    __slots__ = ("token", "target", "operator", "value", "leftClass", "rightClass", "hits", "quick", "member")
+    def __init__(self, token : token.Token, target : Expression = None, operator : str = None,
+                 value : Expression = None):
+        self.token = token
+        self.target = target
+        # infix operator combining the old value and value
+        self.operator = operator
+        self.value = value
+        # type feedback, as in InfixExpression
+        self.leftClass = None
+        self.rightClass = None
+        self.hits = 0
+        self.quick = None
+        # inline cache of a member target
+        self.member = None
+
+    def statementNode(self):
+        return super().statementNode()
+    
+    def tokenLiteral(self) -> str:
+        return self.token.literal
+    
+    def string(self) -> str:
+        if self.token.literal in ["++", "--"]:
+            return self.target.string() + self.token.literal + ";"
+        return self.target.string() + " " + self.token.literal + " " + self.value.string() + ";"
+
 # Break statement
 class BreakStatement(Statement):
+    __slots__ = ("token", "inLoop")
+    def __init__(self, token = None):
+        self.token = token
+        # whether the statement is inside a loop, set by the resolver
+        # (None: it depends on the environment)
+        self.inLoop = None
 
     def statementNode(self):
         return super().statementNode()
@@ -398,6 +496,12 @@ class BreakStatement(Statement):
 
 # Continue statement
 class ContinueStatement(Statement):
+    __slots__ = ("token", "inLoop")
+    def __init__(self, token = None):
+        self.token = token
+        # whether the statement is inside a loop, set by the resolver
+        # (None: it depends on the environment)
+        self.inLoop = None
 
     def statementNode(self):
         return super().statementNode()
@@ -409,6 +513,7 @@ class ContinueStatement(Statement):
         return "continue;"
 
 class ForExpression(Expression):
+    __slots__ = ("token", "initial", "condition", "update", "block", "counter")
     def __init__(self, token : token.Token, initial : Statement = None, condition : Expression = None,
                  update : Statement = None, block : BlockStatement = None):
         self.token = token
@@ -416,6 +521,9 @@ class ForExpression(Expression):
         self.condition = condition
         self.update = update
         self.block = block
+        # name of the loop variable of a counting loop the body doesn't
+        # assign, set by the resolver (see evaluator.evalCountingLoop)
+        self.counter = None
     
     def expressionNode(self):
         return super().expressionNode()
@@ -438,6 +546,7 @@ class ForExpression(Expression):
 
 # Classliteral node
 class Classliteral(Expression):
+    __slots__ = ("token", "body")
     def __init__(self, token : token.Token, body : BlockStatement = None):
         self.token = token
         self.body = body
@@ -452,6 +561,7 @@ class Classliteral(Expression):
         return self.tokenLiteral() + self.body.string()
 
 class AssignStatementClass(Statement):
+    __slots__ = ("token", "name", "value")
     def __init__(self, token : token.Token, name : Expression = None, 
                  value : Expression = None):
         self.token = token
@@ -1,6 +1,8 @@
 import unittest
 from _Token.token import *
 from _Ast.ast import *
+import _Ast.ast as ast
+import _Object.object as object
 
 class TestAst(unittest.TestCase):
     def testString(self):
@@ -29,4 +31,11 @@ class TestAst(unittest.TestCase):
         ]
 
         self.assertEqual(p.string(), "let myVar = anotherVar;",
-            "program.string() wrong. Got: {}".format(p.string()))
\ No newline at end of file
+            "program.string() wrong. Got: {}".format(p.string()))
+
+    # nodes have a fixed layout, without an attribute dict
+    def testSlots(self):
+        for module in [ast, object]:
+            for name, cls in vars(module).items():
+                if isinstance(cls, type) and cls.__module__ == module.__name__:
+                    self.assertEqual(cls.__dictoffset__, 0, name)
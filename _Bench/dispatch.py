@@ -0,0 +1,86 @@
+import sys
+import timeit
+import _Ast.ast as ast
+import _Lexer.lexer as lexer
+import _Parser.parser as parser
+import _Object.object as object
+import _Evaluator.evaluator as evaluator
+
+# Microbenchmark of the dispatch of Eval: for every node type, the time of
+# finding the handler with the former isinstance chain and with the
+# dispatch table, and the time of a whole Eval of a small node of that type.
+#
+#   python -m _Bench.dispatch [runs]
+
+# order of the isinstance chain Eval used before the dispatch table
+chain = [
+    ast.Program, ast.ExpressionStatement, ast.IntegerLiteral, ast.Boolean, ast.PrefixExpression,
+    ast.InfixExpression, ast.BlockStatement, ast.IfExpression, ast.WhileExpression,
+    ast.ForExpression, ast.ReturnStatement, ast.LetStatement, ast.Identifier,
+    ast.FunctionLiteral, ast.CallExpression, ast.StringLiteral, ast.ArrayLiteral,
+    ast.IndexExpression, ast.HashLiteral, ast.AssignStatement, ast.ContinueStatement,
+    ast.BreakStatement, ast.Classliteral,
+]
+
+# a small node of each type, the source of the statement containing it
+samples = [
+    ("Program",             "1",                    lambda p: p),
+    ("ExpressionStatement", "1",                    lambda p: p.statements[0]),
+    ("IntegerLiteral",      "1",                    lambda p: p.statements[0].expression),
+    ("Boolean",             "true",                 lambda p: p.statements[0].expression),
+    ("PrefixExpression",    "-1",                   lambda p: p.statements[0].expression),
+    ("InfixExpression",     "1 + 2",                lambda p: p.statements[0].expression),
+    ("BlockStatement",      "if (true) { 1 }",      lambda p: p.statements[0].expression.consequence),
+    ("IfExpression",        "if (true) { 1 }",      lambda p: p.statements[0].expression),
+    ("WhileExpression",     "while (false) { 1 }",  lambda p: p.statements[0].expression),
+    ("ForExpression",       "for (;false;) { 1 }",  lambda p: p.statements[0].expression),
+    ("ReturnStatement",     "return 1;",            lambda p: p.statements[0]),
+    ("LetStatement",        "let a = 1;",           lambda p: p.statements[0]),
+    ("Identifier",          "a",                    lambda p: p.statements[0].expression),
+    ("FunctionLiteral",     "fn() { 1 }",           lambda p: p.statements[0].expression),
+    ("CallExpression",      "f()",                  lambda p: p.statements[0].expression),
+    ("StringLiteral",       '"a"',                  lambda p: p.statements[0].expression),
+    ("ArrayLiteral",        "[1]",                  lambda p: p.statements[0].expression),
+    ("IndexExpression",     "[1][0]",               lambda p: p.statements[0].expression),
+    ("HashLiteral",         "{1: 1}",               lambda p: p.statements[0].expression),
+    ("AssignStatement",     "a = 1;",               lambda p: p.statements[0]),
+    ("ContinueStatement",   "continue;",            lambda p: p.statements[0]),
+    ("BreakStatement",      "break;",               lambda p: p.statements[0]),
+    ("Classliteral",        "class { }",            lambda p: p.statements[0].expression),
+]
+
+def chainDispatch(node : ast.Node) -> type:
+    for nodeClass in chain:
+        if isinstance(node, nodeClass):
+            return nodeClass
+    return None
+
+def tableDispatch(node : ast.Node) -> type:
+    return evaluator.evaluators.get(node.__class__)
+
+# Eval of a single node: return, break and continue leave it as exceptions
+def evaluate(node : ast.Node, env : object.Environment) -> object.Object:
+    try:
+        return evaluator.Eval(node, env)
+    except (evaluator.ReturnSignal, evaluator.BreakSignal, evaluator.ContinueSignal):
+        return None
+
+# ns per call of fn(node)
+def measure(fn, node, runs : int) -> float:
+    return min(timeit.repeat(lambda: fn(node), number=runs, repeat=3)) / runs * 1e9
+
+def main(runs : int = 100000):
+    env = object.Environment(None, True)
+    env.set("a", object.Integer(1), True)
+    env.set("f", object.Function([], parser.Parser(lexer.Lexer("{ 1 }")).parseBlockStatement()), True)
+
+    print("{:<20} {:>10} {:>10} {:>10}".format("node", "chain ns", "table ns", "Eval ns"))
+    for name, source, select in samples:
+        node = select(parser.Parser(lexer.Lexer(source)).parseProgram())
+        chainTime = measure(chainDispatch, node, runs)
+        tableTime = measure(tableDispatch, node, runs)
+        evalTime = measure(lambda node: evaluate(node, env), node, runs)
+        print("{:<20} {:>10.1f} {:>10.1f} {:>10.1f}".format(name, chainTime, tableTime, evalTime))
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
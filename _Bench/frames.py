@@ -0,0 +1,56 @@
+import sys
+import threading
+import time
+import _Lexer.lexer as lexer
+import _Parser.parser as parser
+import _Object.object as object
+import _Resolver.resolver as resolver
+import _Evaluator.evaluator as evaluator
+import _Repl.backends as backends
+
+# Benchmark of the environments of short calls: with and without reusing
+# the environments of finished calls, the environments allocated and
+# taken back from the pools, and the time taken.
+#
+#   python -m _Bench.frames [backend ...]
+
+SOURCE = """
+let add = fn(a, b) { let c = a + b; c };
+let fib = fn(n) { if (n < 2) { return n; } return add(fib(n - 1), fib(n - 2)); };
+let total = 0;
+for (let i = 0; i < 20000; i = i + 1) { total = add(total, i % 7); }
+total + fib(16)
+"""
+
+# seconds taken by backend to run SOURCE, environments allocated and reused
+def measure(backend : str, poolSize : int):
+    evaluator.FRAME_POOL_SIZE = poolSize
+    program = parser.Parser(lexer.Lexer(SOURCE)).parseProgram()
+    env = object.Environment()
+    resolver.resolve(program, env)
+    counts = dict(evaluator.frameCounts)
+    start = time.perf_counter()
+    evaluated = backends.backends[backend](program, env)
+    elapsed = time.perf_counter() - start
+    if not isinstance(evaluated, object.Integer):
+        raise RuntimeError("{}: wrong result {}".format(backend, evaluated.inspect()))
+    allocated = evaluator.frameCounts["allocated"] - counts["allocated"]
+    reused = evaluator.frameCounts["reused"] - counts["reused"]
+    return elapsed, allocated, reused
+
+def main(names):
+    poolSize = evaluator.FRAME_POOL_SIZE
+    print("{:<8} {:>6} {:>10} {:>10} {:>10}".format("backend", "pool", "allocated", "reused", "time s"))
+    for backend in names:
+        for size in [0, poolSize]:
+            elapsed, allocated, reused = min(measure(backend, size) for _ in range(3))
+            print("{:<8} {:>6} {:>10} {:>10} {:>10.3f}".format(backend, size, allocated, reused, elapsed))
+    evaluator.FRAME_POOL_SIZE = poolSize
+
+if __name__ == "__main__":
+    # the recursive backends need a deep python stack
+    sys.setrecursionlimit(1000000)
+    threading.stack_size(512 * 1024 * 1024)
+    thread = threading.Thread(target=main, args=(sys.argv[1:] or ["eval", "stack"],))
+    thread.start()
+    thread.join()
@@ -0,0 +1,116 @@
+import gc
+import os
+import sys
+import tracemalloc
+import _Token.token as token
+import _Ast.ast as ast
+import _Lexer.lexer as lexer
+import _Parser.parser as parser
+import _Object.object as object
+from _Optimizer.nodes import countNodes
+
+# Benchmark of memory: the bytes taken by one object of the runtime and
+# ast classes (with its __dict__, if it has one), and the memory taken by
+# a 1M-element array of integers and by the ast of a 50k-line script,
+# traced by tracemalloc and as growth of the resident set size.
+#
+#   python -m _Bench.memory [array length] [script lines]
+
+# statements the script repeats: N is replaced by the line number, V by
+# the line number spelled with letters (names can't contain digits)
+LINES = [
+    "let aV = N * 2 + 1;",
+    "let fV = fn(x, y) { if (x < y) { return x + y; } x - y };",
+    "let hV = {\"k\": [N, N + 1, \"s\"], \"f\": fn(a) { a }};",
+    "for (let i = 0; i < N; i = i + 1) { aV = aV + i; }",
+    "printl(str(fV(N, aV)));",
+]
+
+TOKEN = token.Token(token.INT, "1")
+KEY = object.String("k")
+
+# a function making an object of each class, its attributes shared
+# between the objects (an Environment has its own names and values)
+samples = [
+    ("Integer",         lambda: object.Integer(1000)),
+    ("Boolean",         lambda: object.Boolean(True)),
+    ("String",          lambda: object.String("abc")),
+    ("Array",           lambda: object.Array(None)),
+    ("HashPair",        lambda: object.HashPair(KEY, KEY)),
+    ("Environment",     lambda: object.Environment()),
+    ("Identifier",      lambda: ast.Identifier(TOKEN, "a")),
+    ("IntegerLiteral",  lambda: ast.IntegerLiteral(TOKEN, 1)),
+    ("InfixExpression", lambda: ast.InfixExpression(TOKEN, None, "+", None)),
+    ("BlockStatement",  lambda: ast.BlockStatement(TOKEN, None)),
+]
+
+# bytes taken by each object make returns
+def sizeOf(make, count : int = 10000) -> float:
+    kept = [None] * count
+    gc.collect()
+    tracemalloc.start()
+    for idx in range(count):
+        kept[idx] = make()
+    traced, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return traced / count
+
+# resident set size in bytes, None where /proc is not available
+def residentSize() -> int:
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except OSError:
+        return None
+
+# traced and resident bytes taken by the result of build, and the result:
+# the resident size is measured on a first build, without tracing
+def measure(build):
+    gc.collect()
+    before = residentSize()
+    result = build()
+    rss = None if before is None else residentSize() - before
+    del result
+    gc.collect()
+
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    traced, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return traced, rss, result
+
+# source of a script of the given number of lines
+def script(lines : int) -> str:
+    source = []
+    for n in range(lines):
+        # the names of line n refer to the previous lines
+        line = LINES[n % len(LINES)]
+        name = str(n - n % len(LINES)).translate(str.maketrans("0123456789", "abcdefghij"))
+        source.append(line.replace("V", name).replace("N", str(n)))
+    return "\n".join(source)
+
+def main(length : int = 1000000, lines : int = 50000):
+    print("{:<16} {:>8}".format("class", "bytes"))
+    for name, make in samples:
+        print("{:<16} {:>8.0f}".format(name, sizeOf(make)))
+
+    source = script(lines)
+    cases = [
+        ("array {}".format(length), lambda: object.Array([object.Integer(n + 1000) for n in range(length)]),
+         lambda array: len(array.elements)),
+        ("script {}".format(lines), lambda: parser.Parser(lexer.Lexer(source)).parseProgram(),
+         countNodes),
+    ]
+
+    print()
+    print("{:<16} {:>10} {:>10} {:>10} {:>10}".format("case", "objects", "traced MB", "rss MB", "bytes/obj"))
+    for name, build, count in cases:
+        traced, rss, result = measure(build)
+        objects = count(result)
+        rssMB = "-" if rss is None else "{:.1f}".format(rss / 2**20)
+        print("{:<16} {:>10} {:>10.1f} {:>10} {:>10.1f}".format(name, objects, traced / 2**20, rssMB, traced / objects))
+        del result
+
+if __name__ == "__main__":
+    main(*[int(arg) for arg in sys.argv[1:]])
@@ -0,0 +1,44 @@
+import sys
+import threading
+import time
+import _Lexer.lexer as lexer
+import _Parser.parser as parser
+import _Object.object as object
+import _Resolver.resolver as resolver
+import _Repl.backends as backends
+
+# Benchmark of deep recursion: a function calling itself (not in tail
+# position) n times, looking up its own global name at every level. The
+# time per call must not grow with n.
+#
+#   python -m _Bench.recursion [backend ...]
+
+SOURCE = "let sum = fn(n) { if (n == 0) { return 0; } return n + sum(n - 1); }; sum(N);"
+DEPTHS = [1000, 2000, 4000, 8000, 16000]
+
+# seconds taken by backend to run SOURCE with depth n
+def measure(backend : str, n : int) -> float:
+    program = parser.Parser(lexer.Lexer(SOURCE.replace("N", str(n)))).parseProgram()
+    env = object.Environment()
+    resolver.resolve(program, env)
+    start = time.perf_counter()
+    evaluated = backends.backends[backend](program, env)
+    elapsed = time.perf_counter() - start
+    if not isinstance(evaluated, object.Integer) or evaluated.value != n * (n + 1) // 2:
+        raise RuntimeError("{}: wrong result {}".format(backend, evaluated.inspect()))
+    return elapsed
+
+def main(names):
+    print("{:<8} {:>8} {:>10} {:>12}".format("backend", "depth", "time s", "us per call"))
+    for backend in names:
+        for n in DEPTHS:
+            elapsed = measure(backend, n)
+            print("{:<8} {:>8} {:>10.3f} {:>12.2f}".format(backend, n, elapsed, elapsed / n * 1e6))
+
+if __name__ == "__main__":
+    # the recursive backends need a deep python stack
+    sys.setrecursionlimit(1000000)
+    threading.stack_size(512 * 1024 * 1024)
+    thread = threading.Thread(target=main, args=(sys.argv[1:] or ["eval", "stack", "closure"],))
+    thread.start()
+    thread.join()
@@ -0,0 +1,559 @@
+import operator
+from typing import Callable, List
+import _Ast.ast as ast
+import _Object.object as object
+import _Evaluator.builtins as builtins
+import _Evaluator.evaluator as evaluator
+from _Evaluator.evaluator import Abort, ReturnSignal, BreakSignal, ContinueSignal
+from _Evaluator.utils import newError
+
+# Closure compiler: every ast node is turned, once, into a python function
+# taking the current environment and returning the node's value. Operator
+# strings and node types are looked at only at compile time.
+#
+# Errors stop the whole program, so they travel as an exception; return,
+# break and continue unwind to the function or loop that handles them, with
+# the same exceptions as Eval. As in Eval, the call of a return statement
+# is handed back to applyFunction as a TailCall, which runs it in a loop.
+
+BREAK = BreakSignal()
+CONTINUE = ContinueSignal()
+
+# function value carrying the compiled body
+class CompiledFunction(object.Function):
+    __slots__ = ("code",)
+    def __init__(self, parameters : List[ast.Identifier], body : ast.BlockStatement, code : Callable,
+                 env : object.Environment = None):
+        super().__init__(parameters, body, env)
+        self.code = code
+
+    def bind(self, env : object.Environment) -> object.Function:
+        return CompiledFunction(self.parameters, self.body, self.code, env)
+
+def check(obj : object.Object) -> object.Object:
+    if isinstance(obj, object.Error):
+        raise Abort(obj)
+    return obj
+
+# compile a program into a function of the environment
+def compileProgram(program : ast.Program) -> Callable:
+    statements = [compileNode(elem) for elem in program.statements[:-1]]
+    if len(program.statements) > 0:
+        statements.append(compileTail(program.statements[-1]))
+    EXIT = object.EXIT
+
+    def run(env):
+        result = None
+        try:
+            for statement in statements:
+                result = statement(env)
+                if result is EXIT:
+                    return result
+        except ReturnSignal as signal:
+            result = signal.value
+        except Abort as abort:
+            return abort.value
+        if result.__class__ is object.TailCall:
+            try:
+                return applyFunction(result.fn, result.args)
+            except Abort as abort:
+                return abort.value
+        return result
+    return run
+
+# compile and run a program: same signature and result as evaluator.Eval
+def run(program : ast.Program, env : object.Environment) -> object.Object:
+    return compileProgram(program)(env)
+
+def compileNode(node : ast.Node) -> Callable:
+    if node is None:
+        return lambda env: None
+    compiler = compilers.get(type(node))
+    if compiler is None:
+        return lambda env: None
+    return compiler(node)
+
+# a statement whose value is the value of the enclosing function: a
+# return there needs no unwinding
+def compileTail(node : ast.Node) -> Callable:
+    if isinstance(node, ast.ReturnStatement):
+        if node.value is None:
+            zero = object.integer(0)
+            return lambda env: zero
+        return compileReturnValue(node.value)
+
+    if isinstance(node, ast.ExpressionStatement) and isinstance(node.expression, ast.IfExpression):
+        return compileIfExpression(node.expression, True)
+
+    return compileNode(node)
+
+def compileBlock(block : ast.BlockStatement, tail : bool = False) -> Callable:
+    nodes = block.statements
+    if len(nodes) == 0:
+        return lambda env: None
+
+    statements = [compileNode(elem) for elem in nodes[:-1]]
+    statements.append(compileTail(nodes[-1]) if tail else compileNode(nodes[-1]))
+    if len(statements) == 1:
+        return statements[0]
+
+    EXIT = object.EXIT
+
+    def block(env):
+        for statement in statements:
+            result = statement(env)
+            if result is EXIT:
+                return result
+        return result
+    return block
+
+def compileExpressionStatement(node : ast.ExpressionStatement) -> Callable:
+    return compileNode(node.expression)
+
+def compileIntegerLiteral(node : ast.IntegerLiteral) -> Callable:
+    value = object.integer(node.value)
+    return lambda env: value
+
+def compileStringLiteral(node : ast.StringLiteral) -> Callable:
+    value = object.String(node.value)
+    return lambda env: value
+
+def compileBoolean(node : ast.Boolean) -> Callable:
+    value = object.TRUE if node.value else object.FALSE
+    return lambda env: value
+
+def compileIdentifier(node : ast.Identifier) -> Callable:
+    name = node.value
+    builtin = builtins.builtins.get(name)
+
+    def identifier(env):
+        val, ok = env.get(name)
+        if ok:
+            return val
+        if builtin is not None:
+            return builtin
+        raise Abort(newError("identifier not found: " + name))
+    return identifier
+
+def compilePrefixExpression(node : ast.PrefixExpression) -> Callable:
+    right = compileNode(node.right)
+    op = node.operator
+    Integer, integer = object.Integer, object.integer
+
+    if op == "-":
+        def minus(env):
+            value = right(env)
+            if value.__class__ is Integer:
+                return integer(-value.value)
+            return check(evaluator.evalPrefixExpression(op, value))
+        return minus
+
+    TRUE, FALSE, NULL = object.TRUE, object.FALSE, object.NULL
+    if op == "!":
+        def bang(env):
+            value = right(env)
+            return TRUE if value is FALSE or value is NULL else FALSE
+        return bang
+
+    return lambda env: check(evaluator.evalPrefixExpression(op, right(env)))
+
+arithmeticOperators = {
+    "+" : operator.add,
+    "-" : operator.sub,
+    "*" : operator.mul,
+    "/" : operator.truediv,
+    "%" : operator.mod,
+}
+
+comparisonOperators = {
+    "<"  : operator.lt,
+    ">"  : operator.gt,
+    "<=" : operator.le,
+    ">=" : operator.ge,
+    "==" : operator.eq,
+    "!=" : operator.ne,
+}
+
+def compileInfixExpression(node : ast.InfixExpression) -> Callable:
+    if node.operator == ".":
+        return compileDotExpression(node)
+
+    left = compileNode(node.left)
+    right = compileNode(node.right)
+    op = node.operator
+
+    # logical operators: left to right, with short circuit
+    if op in evaluator.shortCircuit:
+        decided = evaluator.shortCircuit[op]
+
+        def logical(env):
+            l = left(env)
+            if l is decided:
+                return l
+            return check(evaluator.evalInfixExpression(op, l, right(env)))
+        return logical
+    Integer, integer = object.Integer, object.integer
+    TRUE, FALSE = object.TRUE, object.FALSE
+
+    # integer fast paths, every other combination goes through evalInfixExpression
+    if op in arithmeticOperators:
+        fn = arithmeticOperators[op]
+
+        def arithmetic(env):
+            r = right(env)
+            l = left(env)
+            if l.__class__ is Integer and r.__class__ is Integer:
+                return integer(fn(l.value, r.value))
+            return check(evaluator.evalInfixExpression(op, l, r))
+        return arithmetic
+
+    if op in comparisonOperators:
+        fn = comparisonOperators[op]
+
+        def comparison(env):
+            r = right(env)
+            l = left(env)
+            if l.__class__ is Integer and r.__class__ is Integer:
+                return TRUE if fn(l.value, r.value) else FALSE
+            return check(evaluator.evalInfixExpression(op, l, r))
+        return comparison
+
+    def infix(env):
+        r = right(env)
+        return check(evaluator.evalInfixExpression(op, left(env), r))
+    return infix
+
+def compileIfExpression(node : ast.IfExpression, tail : bool = False) -> Callable:
+    condition = compileNode(node.condition)
+    consequence = compileBlock(node.consequence, tail)
+    alternative = compileBlock(node.alternative, tail) if node.alternative is not None else None
+    Environment = object.Environment
+    FALSE, NULL = object.FALSE, object.NULL
+
+    def ifExpression(env):
+        value = condition(env)
+        if value is not FALSE and value is not NULL:
+            return consequence(Environment(env, env.inLoop))
+        if alternative is not None:
+            return alternative(Environment(env, env.inLoop))
+        return NULL
+    return ifExpression
+
+def compileWhileExpression(node : ast.WhileExpression) -> Callable:
+    condition = compileNode(node.condition)
+    body = compileBlock(node.block)
+    Environment = object.Environment
+    FALSE, NULL, EXIT = object.FALSE, object.NULL, object.EXIT
+
+    def whileExpression(env):
+        result = NULL
+        newEnv = Environment(env, True)
+        while True:
+            value = condition(env)
+            if value is FALSE or value is NULL:
+                return result
+            try:
+                result = body(newEnv)
+            except BreakSignal:
+                return NULL
+            except ContinueSignal:
+                result = NULL
+                continue
+            if result is EXIT:
+                return result
+    return whileExpression
+
+def compileForExpression(node : ast.ForExpression) -> Callable:
+    initial = compileNode(node.initial) if node.initial is not None else None
+    condition = compileNode(node.condition) if node.condition is not None else None
+    update = compileNode(node.update) if node.update is not None else None
+    body = compileBlock(node.block)
+    Environment = object.Environment
+    FALSE, NULL, EXIT = object.FALSE, object.NULL, object.EXIT
+
+    def forExpression(env):
+        result = NULL
+        newEnv = Environment(env, True)
+        if initial is not None:
+            initial(newEnv)
+        while True:
+            if condition is not None:
+                value = condition(newEnv)
+                if value is FALSE or value is NULL:
+                    return result
+            try:
+                result = body(newEnv)
+            except BreakSignal:
+                return NULL
+            except ContinueSignal:
+                result = NULL
+            if result is EXIT:
+                return result
+            if update is not None:
+                update(newEnv)
+    return forExpression
+
+def compileReturnStatement(node : ast.ReturnStatement) -> Callable:
+    if node.value is None:
+        zero = object.integer(0)
+
+        def returnZero(env):
+            raise ReturnSignal(zero)
+        return returnZero
+
+    value = compileReturnValue(node.value)
+
+    def returnStatement(env):
+        raise ReturnSignal(value(env))
+    return returnStatement
+
+# value of a return statement: a call of a compiled function is not applied
+# here, but returned to applyFunction
+def compileReturnValue(node : ast.Expression) -> Callable:
+    if not isinstance(node, ast.CallExpression):
+        return compileNode(node)
+    function = compileNode(node.function)
+    arguments = [compileNode(elem) for elem in node.arguments]
+    TailCall = object.TailCall
+
+    def tailCall(env):
+        fn = function(env)
+        if fn.__class__ is CompiledFunction:
+            return TailCall(fn, [arg(env) for arg in arguments])
+        if isinstance(fn, object.Class):
+            return fn.instance()
+        return applyFunction(fn, [arg(env) for arg in arguments])
+    return tailCall
+
+def compileLetStatement(node : ast.LetStatement) -> Callable:
+    value = compileNode(node.value)
+    name = node.name.value
+
+    if node.instance is not None:
+        field = node.instance.value
+
+        def letField(env):
+            val = value(env)
+            instance, exist = env.get(name)
+            if not exist or not isinstance(instance, object.ClassInstance):
+                raise Abort(newError("Can't find object {}", name))
+            _, exist = instance.env.get(field)
+            if not exist:
+                raise Abort(newError("Can't find instance {}", field))
+            instance.env.set(field, val, True)
+        return letField
+
+    def let(env):
+        env.set(name, value(env), True)
+    return let
+
+def compileAssignStatement(node : ast.AssignStatement) -> Callable:
+    value = compileNode(node.value)
+    name = node.name.value
+
+    def assign(env):
+        val = value(env)
+        _, ok = env.get(name)
+        if not ok:
+            raise Abort(newError("Can't assign value before declaration"))
+        env.set(name, val, False)
+    return assign
+
+def compileCompoundAssignStatement(node : ast.CompoundAssignStatement) -> Callable:
+    value = compileNode(node.value)
+    target = node.target
+
+    # the target, found once as in evaluator.evalCompoundAssignStatement
+    if isinstance(target, ast.Identifier):
+        name = target.value
+
+        def cell(env):
+            scope, slot = env.find(name)
+            if scope is None:
+                raise Abort(newError("Can't assign value before declaration"))
+            return scope.values, slot
+    elif isinstance(target, ast.IndexExpression):
+        left = compileNode(target.left)
+        index = compileNode(target.index)
+
+        def cell(env):
+            l = left(env)
+            return check(evaluator.indexCell(l, index(env)))
+    else:
+        def cell(env):
+            return check(evaluator.memberCell(node, env))
+
+    def compound(env):
+        val = value(env)
+        check(evaluator.updateCell(node, cell(env), val))
+    return compound
+
+def compileBreakStatement(node : ast.BreakStatement) -> Callable:
+    def breakStatement(env):
+        if not env.inLoop:
+            raise Abort(newError("Can't use break outside a loop"))
+        raise BREAK
+    return breakStatement
+
+def compileContinueStatement(node : ast.ContinueStatement) -> Callable:
+    def continueStatement(env):
+        if not env.inLoop:
+            raise Abort(newError("Can't use continue outside a loop"))
+        raise CONTINUE
+    return continueStatement
+
+def compileFunctionLiteral(node : ast.FunctionLiteral) -> Callable:
+    parameters = node.parameters
+    body = node.body
+    code = compileBlock(body, True)
+    return lambda env: CompiledFunction(parameters, body, code, env)
+
+# call fn with already evaluated arguments
+def applyFunction(fn : object.Object, args : List[object.Object]) -> object.Object:
+    # calls in tail position are run by this loop, without nesting
+    while isinstance(fn, CompiledFunction):
+        parameters = fn.parameters
+        if len(parameters) != len(args):
+            raise Abort(newError("wrong number of parametrs: wanted {}, got {}", len(parameters), len(args)))
+        newEnv = object.Environment(fn.env)
+        for idx, param in enumerate(parameters):
+            newEnv.set(param.value, args[idx], True)
+        try:
+            result = fn.code(newEnv)
+        except ReturnSignal as signal:
+            result = signal.value
+        if result.__class__ is not object.TailCall:
+            return result
+        fn, args = result.fn, result.args
+
+    if isinstance(fn, object.Builtin):
+        return check(fn.fn(*args))
+
+    raise Abort(newError("not a function: {}", fn.type()))
+
+def compileCallExpression(node : ast.CallExpression) -> Callable:
+    function = compileNode(node.function)
+    arguments = [compileNode(elem) for elem in node.arguments]
+
+    def call(env):
+        fn = function(env)
+        if isinstance(fn, object.Class):
+            return fn.instance()
+        return applyFunction(fn, [arg(env) for arg in arguments])
+    return call
+
+def compileArrayLiteral(node : ast.ArrayLiteral) -> Callable:
+    elements = [compileNode(elem) for elem in node.elements]
+    return lambda env: object.Array([elem(env) for elem in elements])
+
+def compileIndexExpression(node : ast.IndexExpression) -> Callable:
+    left = compileNode(node.left)
+    index = compileNode(node.index)
+    Array, Integer, NULL = object.Array, object.Integer, object.NULL
+
+    def indexExpression(env):
+        l = left(env)
+        i = index(env)
+        if l.__class__ is Array and i.__class__ is Integer:
+            idx = i.value
+            return l.elements[idx] if 0 <= idx < len(l.elements) else NULL
+        return check(evaluator.evalIndexExpression(l, i))
+    return indexExpression
+
+def compileHashLiteral(node : ast.HashLiteral) -> Callable:
+    pairs = [(compileNode(key), compileNode(value)) for key, value in node.pairs.items()]
+
+    def hashLiteral(env):
+        result = {}
+        for keyNode, valueNode in pairs:
+            key = keyNode(env)
+            if not isinstance(key, object.Hashable):
+                raise Abort(newError("unusable as hash key: {}".format(key.type())))
+            result[key.hashKey()] = object.HashPair(key, valueNode(env))
+        return object.Hash(result)
+    return hashLiteral
+
+def compileClassLiteral(node : ast.Classliteral) -> Callable:
+    statements = []
+    for statement in node.body.statements:
+        if not isinstance(statement, ast.LetStatement):
+            message = "in class declaration there must be only Let statements"
+
+            def notLet(env):
+                raise Abort(newError(message))
+            statements.append(notLet)
+            break
+        statements.append(compileNode(statement))
+    body = node.body
+
+    def classLiteral(env):
+        newClass = object.Class(body, object.Environment(None, False))
+        for statement in statements:
+            statement(newClass.env)
+        return newClass
+    return classLiteral
+
+def compileDotExpression(node : ast.InfixExpression) -> Callable:
+    def notSupported(env):
+        raise Abort(newError("Can't find a way to execute DOT operator"))
+
+    if not isinstance(node.left, ast.Identifier):
+        return notSupported
+    name = node.left.value
+
+    def instance(env):
+        classInst, exist = env.get(name)
+        if not exist or not isinstance(classInst, object.ClassInstance):
+            raise Abort(newError("{} does not exist in current scope", name))
+        return classInst
+
+    if isinstance(node.right, ast.Identifier):
+        field = object.MemberCache(node.right.value)
+        return lambda env: field.get(instance(env).env)
+
+    if isinstance(node.right, ast.CallExpression):
+        function = compileNode(node.right.function)
+        arguments = [compileNode(elem) for elem in node.right.arguments]
+        member = None
+        if isinstance(node.right.function, ast.Identifier):
+            member = object.MemberCache(node.right.function.value)
+
+        def method(env):
+            classInst = instance(env)
+            fn = None
+            if member is not None:
+                fn = member.get(classInst.env)
+            if fn is None:
+                fn = function(classInst.env)
+            if isinstance(fn, object.Class):
+                return object.ClassInstance(fn.env)
+            return applyFunction(fn, [arg(env) for arg in arguments])
+        return method
+
+    return notSupported
+
+compilers = {
+    ast.ExpressionStatement : compileExpressionStatement,
+    ast.IntegerLiteral      : compileIntegerLiteral,
+    ast.StringLiteral       : compileStringLiteral,
+    ast.Boolean             : compileBoolean,
+    ast.Identifier          : compileIdentifier,
+    ast.PrefixExpression    : compilePrefixExpression,
+    ast.InfixExpression     : compileInfixExpression,
+    ast.BlockStatement      : compileBlock,
+    ast.IfExpression        : compileIfExpression,
+    ast.WhileExpression     : compileWhileExpression,
+    ast.ForExpression       : compileForExpression,
+    ast.ReturnStatement     : compileReturnStatement,
+    ast.LetStatement        : compileLetStatement,
+    ast.AssignStatement     : compileAssignStatement,
+    ast.CompoundAssignStatement : compileCompoundAssignStatement,
+    ast.BreakStatement      : compileBreakStatement,
+    ast.ContinueStatement   : compileContinueStatement,
+    ast.FunctionLiteral     : compileFunctionLiteral,
+    ast.CallExpression      : compileCallExpression,
+    ast.ArrayLiteral        : compileArrayLiteral,
+    ast.IndexExpression     : compileIndexExpression,
+    ast.HashLiteral         : compileHashLiteral,
+    ast.Classliteral        : compileClassLiteral,
+}
@@ -0,0 +1,38 @@
+from dataclasses import dataclass
+import _Lexer.lexer as lexer
+import _Parser.parser as parser
+import _Object.object as object
+import _Closure.closure as closure
+import _Evaluator.evaluator_test as evaluator_test
+
+# programs run through the closure compiler (the evaluator test suite runs
+# on every backend in _Repl/backends_test.py)
+class TestClosure(evaluator_test.ProgramTest):
+    backend = staticmethod(closure.run)
+
+    def testReturnPositions(self):
+        @dataclass
+        class TestCase:
+            input : str
+            expected : any
+
+        tests = [
+            TestCase("let f = fn(x) { if (x > 1) { return 1; } else { return 2; } }; f(5);", 1),
+            TestCase("let f = fn(x) { if (x > 1) { return 1; } 3 }; f(0);", 3),
+            TestCase("let f = fn(x) { while (true) { if (x > 3) { return x; } x = x + 1; } }; f(0);", 4),
+            TestCase("let f = fn(x) { if (x > 1) { 1 } }; f(0);", None),
+        ]
+
+        for elem in tests:
+            evaluated = self.eval(elem.input)
+            if isinstance(elem.expected, int):
+                self.typeObject(evaluated, elem.expected, object.Integer)
+            else:
+                self.nullObject(evaluated)
+
+    def testCompileOnce(self):
+        program = parser.Parser(lexer.Lexer("let a = 0; for(let i = 0; i < 3; i = i + 1) { a = a + i; }; a;")).parseProgram()
+        code = closure.compileProgram(program)
+
+        self.typeObject(code(object.Environment()), 3, object.Integer)
+        self.typeObject(code(object.Environment()), 3, object.Integer)
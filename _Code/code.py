@@ -0,0 +1,170 @@
+from dataclasses import dataclass
+from typing import Dict, List
+
+# Instructions are stored as a flat list of integers ("wordcode"): the
+# opcode is followed by its operands, one integer each
+
+# stack and constants
+OpConstant      = 0     # push constants[idx]
+OpTrue          = 1     # push TRUE
+OpFalse         = 2     # push FALSE
+OpNull          = 3     # push NULL
+OpNone          = 4     # push None (value of let/assign statements)
+OpPop           = 5     # discard TOS
+OpPopStatement  = 6     # discard TOS, stop the program if it is EXIT
+OpCheckExit     = 7     # stop the program if TOS is EXIT
+
+# infix operators
+OpAdd           = 8
+OpSub           = 9
+OpMul           = 10
+OpDiv           = 11
+OpMod           = 12
+OpEqual         = 13
+OpNotEqual      = 14
+OpLessThan      = 15
+OpGreaterThan   = 16
+OpLessEqual     = 17
+OpGreaterEqual  = 18
+OpAnd           = 19    # left operand below the right one (see OpJumpAnd)
+OpOr            = 20    # left operand below the right one (see OpJumpOr)
+
+# prefix operators
+OpMinus         = 21
+OpBang          = 22
+
+# names
+OpGetName       = 23    # push value of constants[idx] (or builtin)
+OpSetLet        = 24    # bind TOS in the current scope, replace it with None
+OpSetAssign     = 25    # update an existing binding with TOS, replace it with None
+
+# jumps and scopes
+OpJump          = 26
+OpJumpIfFalse   = 27    # pop condition, jump if it is not truthy
+OpPushScope     = 28    # new scope, operand: inLoop (0, 1, or 2 to inherit)
+OpPopScope      = 29
+OpSetupLoop     = 30    # operands: break target, continue target, while
+OpLoopScope     = 31    # enter the scope of the innermost while loop
+OpPopBlock      = 32
+OpBreak         = 33
+OpContinue      = 34
+OpError         = 35    # raise the error message in constants[idx]
+
+# functions and calls
+OpClosure       = 36    # push a function built from constants[idx]
+OpCall          = 37    # operand: number of arguments
+OpReturnValue   = 38
+
+# collections
+OpArray         = 39    # operand: number of elements
+OpHash          = 40    # operand: number of pairs
+OpIndex         = 41
+
+# classes
+OpClass         = 42    # run class body constants[idx] in a new scope
+OpClassEnd      = 43
+OpGetInstance   = 44    # push the instance bound to constants[idx]
+OpGetField      = 45    # replace the instance with its field, read by the MemberCache constants[idx]
+OpLoadMethod    = 46    # push the method of the instance, read by the MemberCache constants[idx]
+OpCallMethod    = 47    # operand: number of arguments
+OpSetField      = 48    # operands: instance name, field name (as OpSetLet)
+
+# short circuit of the logical operators
+OpJumpAnd       = 49    # jump, keeping TOS, if it is false (left operand of &&)
+OpJumpOr        = 50    # jump, keeping TOS, if it is true (left operand of ||)
+
+# compound assignments: TOS is the value, replaced with None (as OpSetAssign)
+OpUpdateName    = 51    # operands: name, operator (constants)
+OpUpdateIndex   = 52    # operand: operator; array and index are above the value
+OpUpdateField   = 53    # operands: instance name, MemberCache of the field, operator
+
+# Definition of an opcode: printable name and number of operands
+@dataclass
+class Definition:
+    name:       str
+    operands:   int
+
+definitions : Dict[int, Definition] = {
+    OpConstant      : Definition("OpConstant", 1),
+    OpTrue          : Definition("OpTrue", 0),
+    OpFalse         : Definition("OpFalse", 0),
+    OpNull          : Definition("OpNull", 0),
+    OpNone          : Definition("OpNone", 0),
+    OpPop           : Definition("OpPop", 0),
+    OpPopStatement  : Definition("OpPopStatement", 0),
+    OpCheckExit     : Definition("OpCheckExit", 0),
+    OpAdd           : Definition("OpAdd", 0),
+    OpSub           : Definition("OpSub", 0),
+    OpMul           : Definition("OpMul", 0),
+    OpDiv           : Definition("OpDiv", 0),
+    OpMod           : Definition("OpMod", 0),
+    OpEqual         : Definition("OpEqual", 0),
+    OpNotEqual      : Definition("OpNotEqual", 0),
+    OpLessThan      : Definition("OpLessThan", 0),
+    OpGreaterThan   : Definition("OpGreaterThan", 0),
+    OpLessEqual     : Definition("OpLessEqual", 0),
+    OpGreaterEqual  : Definition("OpGreaterEqual", 0),
+    OpAnd           : Definition("OpAnd", 0),
+    OpOr            : Definition("OpOr", 0),
+    OpMinus         : Definition("OpMinus", 0),
+    OpBang          : Definition("OpBang", 0),
+    OpGetName       : Definition("OpGetName", 1),
+    OpSetLet        : Definition("OpSetLet", 1),
+    OpSetAssign     : Definition("OpSetAssign", 1),
+    OpJump          : Definition("OpJump", 1),
+    OpJumpIfFalse   : Definition("OpJumpIfFalse", 1),
+    OpPushScope     : Definition("OpPushScope", 1),
+    OpPopScope      : Definition("OpPopScope", 0),
+    OpSetupLoop     : Definition("OpSetupLoop", 3),
+    OpLoopScope     : Definition("OpLoopScope", 0),
+    OpPopBlock      : Definition("OpPopBlock", 0),
+    OpBreak         : Definition("OpBreak", 0),
+    OpContinue      : Definition("OpContinue", 0),
+    OpError         : Definition("OpError", 1),
+    OpClosure       : Definition("OpClosure", 1),
+    OpCall          : Definition("OpCall", 1),
+    OpReturnValue   : Definition("OpReturnValue", 0),
+    OpArray         : Definition("OpArray", 1),
+    OpHash          : Definition("OpHash", 1),
+    OpIndex         : Definition("OpIndex", 0),
+    OpClass         : Definition("OpClass", 1),
+    OpClassEnd      : Definition("OpClassEnd", 0),
+    OpGetInstance   : Definition("OpGetInstance", 1),
+    OpGetField      : Definition("OpGetField", 1),
+    OpLoadMethod    : Definition("OpLoadMethod", 1),
+    OpCallMethod    : Definition("OpCallMethod", 1),
+    OpSetField      : Definition("OpSetField", 2),
+    OpJumpAnd       : Definition("OpJumpAnd", 1),
+    OpJumpOr        : Definition("OpJumpOr", 1),
+    OpUpdateName    : Definition("OpUpdateName", 2),
+    OpUpdateIndex   : Definition("OpUpdateIndex", 1),
+    OpUpdateField   : Definition("OpUpdateField", 3),
+}
+
+# get the definition of an opcode
+def lookup(op : int) -> Definition:
+    if op not in definitions:
+        raise KeyError("opcode {} undefined".format(op))
+    return definitions[op]
+
+# build a single instruction
+def make(op : int, *operands : int) -> List[int]:
+    definition = lookup(op)
+    if len(operands) != definition.operands:
+        raise ValueError("{} wants {} operands, got {}".format(
+            definition.name, definition.operands, len(operands)))
+    return [op, *operands]
+
+# human readable form of a list of instructions, one per line
+def string(instructions : List[int]) -> str:
+    out = []
+    ip = 0
+    while ip < len(instructions):
+        definition = lookup(instructions[ip])
+        operands = instructions[ip + 1 : ip + 1 + definition.operands]
+        line = "{:04d} {}".format(ip, definition.name)
+        if len(operands) > 0:
+            line += " " + " ".join(str(elem) for elem in operands)
+        out.append(line)
+        ip += 1 + definition.operands
+    return "\n".join(out)
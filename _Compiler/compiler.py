@@ -0,0 +1,363 @@
+from typing import List
+import _Ast.ast as ast
+import _Code.code as code
+import _Object.object as object
+
+# result of the compilation: the instructions of the main program and
+# the constant pool shared by every function
+class Bytecode:
+    def __init__(self, instructions : List[int], constants : List):
+        self.instructions = instructions
+        self.constants = constants
+
+# instructions being emitted for the program, a function or a class body
+class CompilationScope:
+    def __init__(self):
+        self.instructions = []
+        self.loopDepth = 0
+
+binaryOperators = {
+    "+"   : code.OpAdd,
+    "-"   : code.OpSub,
+    "*"   : code.OpMul,
+    "/"   : code.OpDiv,
+    "%"   : code.OpMod,
+    "=="  : code.OpEqual,
+    "!="  : code.OpNotEqual,
+    "<"   : code.OpLessThan,
+    ">"   : code.OpGreaterThan,
+    "<="  : code.OpLessEqual,
+    ">="  : code.OpGreaterEqual,
+    "&&"  : code.OpAnd,
+    "and" : code.OpAnd,
+    "||"  : code.OpOr,
+    "or"  : code.OpOr,
+}
+
+# jumps skipping the right operand of the logical operators
+shortCircuitJumps = {
+    "&&"  : code.OpJumpAnd,
+    "and" : code.OpJumpAnd,
+    "||"  : code.OpJumpOr,
+    "or"  : code.OpJumpOr,
+}
+
+prefixOperators = {
+    "-" : code.OpMinus,
+    "!" : code.OpBang,
+}
+
+# Compiler: lowers an ast.Program into bytecode. Every statement leaves
+# exactly one value on the stack (None for let and assign statements), so
+# the value of a block is the value of its last statement, as in Eval
+class Compiler:
+    def __init__(self):
+        self.constants = []
+        # index of each name, message and literal value in constants
+        self.constantIndexes = {}
+        self.scopes = [CompilationScope()]
+
+    def bytecode(self) -> Bytecode:
+        return Bytecode(self.currentInstructions(), self.constants)
+
+    def currentScope(self) -> CompilationScope:
+        return self.scopes[-1]
+
+    def currentInstructions(self) -> List[int]:
+        return self.scopes[-1].instructions
+
+    # add an instruction, return its position
+    def emit(self, op : int, *operands : int) -> int:
+        instructions = self.currentInstructions()
+        position = len(instructions)
+        instructions.extend(code.make(op, *operands))
+        return position
+
+    # set the operand of an already emitted instruction (jump targets)
+    def changeOperand(self, position : int, index : int, operand : int):
+        self.currentInstructions()[position + 1 + index] = operand
+
+    # index of obj in the constant pool: equal names, strings and integers
+    # share an entry, functions and member caches (state of a single site)
+    # get their own
+    def addConstant(self, obj) -> int:
+        cls = obj.__class__
+        if cls is str or cls is object.Integer or cls is object.String:
+            value = obj if cls is str else obj.value
+            # 1 and 1.0 are equal keys
+            key = (cls, value.__class__, value)
+            idx = self.constantIndexes.get(key)
+            if idx is None:
+                idx = self.constantIndexes[key] = len(self.constants)
+                self.constants.append(obj)
+            return idx
+        self.constants.append(obj)
+        return len(self.constants) - 1
+
+    def compileProgram(self, program : ast.Program) -> Bytecode:
+        self.compileStatements(program.statements)
+        self.emit(code.OpReturnValue)
+        return self.bytecode()
+
+    # compile a list of statements, the last one leaves its value on the stack
+    def compileStatements(self, statements : List[ast.Statement]):
+        if len(statements) == 0:
+            self.emit(code.OpNone)
+            return
+
+        for idx, statement in enumerate(statements):
+            self.compile(statement)
+            if idx != len(statements) - 1:
+                self.emit(code.OpPopStatement)
+
+    def compile(self, node : ast.Node):
+        if isinstance(node, ast.ExpressionStatement):
+            self.compile(node.expression)
+
+        elif isinstance(node, ast.Identifier):
+            self.emit(code.OpGetName, self.addConstant(node.value))
+
+        elif isinstance(node, ast.IntegerLiteral):
+            self.emit(code.OpConstant, self.addConstant(object.integer(node.value)))
+
+        elif isinstance(node, ast.StringLiteral):
+            self.emit(code.OpConstant, self.addConstant(object.String(node.value)))
+
+        elif isinstance(node, ast.Boolean):
+            self.emit(code.OpTrue if node.value else code.OpFalse)
+
+        elif isinstance(node, ast.InfixExpression):
+            if node.operator == ".":
+                self.compileDotExpression(node)
+                return
+            if node.operator in shortCircuitJumps:
+                self.compileLogicalExpression(node)
+                return
+            # right operand first, as evalInfixExpression does
+            self.compile(node.right)
+            self.compile(node.left)
+            self.emit(binaryOperators[node.operator])
+
+        elif isinstance(node, ast.PrefixExpression):
+            self.compile(node.right)
+            self.emit(prefixOperators[node.operator])
+
+        elif isinstance(node, ast.LetStatement):
+            self.compile(node.value)
+            if node.instance is not None:
+                self.emit(code.OpSetField, self.addConstant(node.name.value),
+                          self.addConstant(node.instance.value))
+            else:
+                self.emit(code.OpSetLet, self.addConstant(node.name.value))
+
+        elif isinstance(node, ast.AssignStatement):
+            self.compile(node.value)
+            self.emit(code.OpSetAssign, self.addConstant(node.name.value))
+
+        elif isinstance(node, ast.CompoundAssignStatement):
+            self.compileCompoundAssignStatement(node)
+
+        elif isinstance(node, ast.ReturnStatement):
+            if node.value is None:
+                self.emit(code.OpConstant, self.addConstant(object.integer(0)))
+            else:
+                self.compile(node.value)
+            self.emit(code.OpReturnValue)
+
+        elif isinstance(node, ast.BlockStatement):
+            self.compileStatements(node.statements)
+
+        elif isinstance(node, ast.IfExpression):
+            self.compileIfExpression(node)
+
+        elif isinstance(node, ast.WhileExpression):
+            self.compileWhileExpression(node)
+
+        elif isinstance(node, ast.ForExpression):
+            self.compileForExpression(node)
+
+        elif isinstance(node, ast.BreakStatement):
+            if self.currentScope().loopDepth == 0:
+                self.emit(code.OpError, self.addConstant("Can't use break outside a loop"))
+            else:
+                self.emit(code.OpBreak)
+
+        elif isinstance(node, ast.ContinueStatement):
+            if self.currentScope().loopDepth == 0:
+                self.emit(code.OpError, self.addConstant("Can't use continue outside a loop"))
+            else:
+                self.emit(code.OpContinue)
+
+        elif isinstance(node, ast.FunctionLiteral):
+            self.scopes.append(CompilationScope())
+            self.compileStatements(node.body.statements)
+            self.emit(code.OpReturnValue)
+            instructions = self.scopes.pop().instructions
+            fn = object.CompiledFunction(instructions, node.parameters, node.body, self.constants)
+            self.emit(code.OpClosure, self.addConstant(fn))
+
+        elif isinstance(node, ast.CallExpression):
+            self.compile(node.function)
+            for arg in node.arguments:
+                self.compile(arg)
+            self.emit(code.OpCall, len(node.arguments))
+
+        elif isinstance(node, ast.ArrayLiteral):
+            for elem in node.elements:
+                self.compile(elem)
+            self.emit(code.OpArray, len(node.elements))
+
+        elif isinstance(node, ast.HashLiteral):
+            for key, value in node.pairs.items():
+                self.compile(key)
+                self.compile(value)
+            self.emit(code.OpHash, len(node.pairs))
+
+        elif isinstance(node, ast.IndexExpression):
+            self.compile(node.left)
+            self.compile(node.index)
+            self.emit(code.OpIndex)
+
+        elif isinstance(node, ast.Classliteral):
+            self.compileClassLiteral(node)
+
+        # nodes Eval does not know about evaluate to None
+        else:
+            self.emit(code.OpNone)
+
+    def compileIfExpression(self, node : ast.IfExpression):
+        self.compile(node.condition)
+        jumpNotTruthy = self.emit(code.OpJumpIfFalse, 0)
+
+        # each branch runs in a new scope inheriting the loop flag
+        self.emit(code.OpPushScope, 2)
+        self.compile(node.consequence)
+        self.emit(code.OpPopScope)
+        jump = self.emit(code.OpJump, 0)
+
+        self.changeOperand(jumpNotTruthy, 0, len(self.currentInstructions()))
+        if node.alternative is None:
+            self.emit(code.OpNull)
+        else:
+            self.emit(code.OpPushScope, 2)
+            self.compile(node.alternative)
+            self.emit(code.OpPopScope)
+
+        self.changeOperand(jump, 0, len(self.currentInstructions()))
+
+    # the condition of a while loop is evaluated in the enclosing scope,
+    # the body in a loop scope created once for all the iterations
+    def compileWhileExpression(self, node : ast.WhileExpression):
+        setup = self.emit(code.OpSetupLoop, 0, 0, 1)
+        self.emit(code.OpNull)
+
+        top = len(self.currentInstructions())
+        self.changeOperand(setup, 1, top)
+        self.compile(node.condition)
+        jumpNotTruthy = self.emit(code.OpJumpIfFalse, 0)
+        self.emit(code.OpPop)
+
+        self.emit(code.OpLoopScope)
+        self.currentScope().loopDepth += 1
+        self.compile(node.block)
+        self.currentScope().loopDepth -= 1
+        self.emit(code.OpCheckExit)
+        self.emit(code.OpPopScope)
+        self.emit(code.OpJump, top)
+
+        self.changeOperand(jumpNotTruthy, 0, len(self.currentInstructions()))
+        self.emit(code.OpPopBlock)
+        self.changeOperand(setup, 0, len(self.currentInstructions()))
+
+    # initial statement, condition, update and body of a for loop share
+    # the same loop scope
+    def compileForExpression(self, node : ast.ForExpression):
+        self.emit(code.OpPushScope, 1)
+        if node.initial is not None:
+            self.compile(node.initial)
+            self.emit(code.OpPop)
+
+        setup = self.emit(code.OpSetupLoop, 0, 0, 0)
+        self.emit(code.OpNull)
+
+        top = len(self.currentInstructions())
+        jumpNotTruthy = None
+        if node.condition is not None:
+            self.compile(node.condition)
+            jumpNotTruthy = self.emit(code.OpJumpIfFalse, 0)
+        self.emit(code.OpPop)
+
+        self.currentScope().loopDepth += 1
+        self.compile(node.block)
+        self.currentScope().loopDepth -= 1
+        self.emit(code.OpCheckExit)
+
+        self.changeOperand(setup, 1, len(self.currentInstructions()))
+        if node.update is not None:
+            self.compile(node.update)
+            self.emit(code.OpPop)
+        self.emit(code.OpJump, top)
+
+        if jumpNotTruthy is not None:
+            self.changeOperand(jumpNotTruthy, 0, len(self.currentInstructions()))
+        self.emit(code.OpPopBlock)
+        self.changeOperand(setup, 0, len(self.currentInstructions()))
+        self.emit(code.OpPopScope)
+
+    # left operand first: if it decides the result, it is the result
+    def compileLogicalExpression(self, node : ast.InfixExpression):
+        self.compile(node.left)
+        jump = self.emit(shortCircuitJumps[node.operator], 0)
+        self.compile(node.right)
+        self.emit(binaryOperators[node.operator])
+        self.changeOperand(jump, 0, len(self.currentInstructions()))
+
+    # the value first, then the target, updated in place
+    def compileCompoundAssignStatement(self, node : ast.CompoundAssignStatement):
+        self.compile(node.value)
+        operator = self.addConstant(node.operator)
+        target = node.target
+        if isinstance(target, ast.Identifier):
+            self.emit(code.OpUpdateName, self.addConstant(target.value), operator)
+        elif isinstance(target, ast.IndexExpression):
+            self.compile(target.left)
+            self.compile(target.index)
+            self.emit(code.OpUpdateIndex, operator)
+        else:
+            self.emit(code.OpUpdateField, self.addConstant(target.left.value),
+                      self.addConstant(object.MemberCache(target.right.value)), operator)
+
+    # obj.field and obj.method(args): the object must be an identifier
+    def compileDotExpression(self, node : ast.InfixExpression):
+        if not isinstance(node.left, ast.Identifier):
+            self.emit(code.OpError, self.addConstant("Can't find a way to execute DOT operator"))
+            return
+
+        if isinstance(node.right, ast.Identifier):
+            self.emit(code.OpGetInstance, self.addConstant(node.left.value))
+            self.emit(code.OpGetField, self.addConstant(object.MemberCache(node.right.value)))
+
+        elif isinstance(node.right, ast.CallExpression) and isinstance(node.right.function, ast.Identifier):
+            self.emit(code.OpGetInstance, self.addConstant(node.left.value))
+            self.emit(code.OpLoadMethod, self.addConstant(object.MemberCache(node.right.function.value)))
+            for arg in node.right.arguments:
+                self.compile(arg)
+            self.emit(code.OpCallMethod, len(node.right.arguments))
+
+        else:
+            self.emit(code.OpError, self.addConstant("Can't find a way to execute DOT operator"))
+
+    # the body of a class runs once, in a new scope, when the literal is evaluated
+    def compileClassLiteral(self, node : ast.Classliteral):
+        self.scopes.append(CompilationScope())
+        for statement in node.body.statements:
+            if not isinstance(statement, ast.LetStatement):
+                self.emit(code.OpError,
+                    self.addConstant("in class declaration there must be only Let statements"))
+                break
+            self.compile(statement)
+            self.emit(code.OpPop)
+        self.emit(code.OpClassEnd)
+        instructions = self.scopes.pop().instructions
+        body = object.CompiledFunction(instructions, None, node.body, self.constants)
+        self.emit(code.OpClass, self.addConstant(body))
@@ -0,0 +1,86 @@
+from dataclasses import dataclass
+from typing import List
+import unittest
+import _Lexer.lexer as lexer
+import _Parser.parser as parser
+import _Object.object as object
+import _Code.code as code
+import _Compiler.compiler as compiler
+
+class TestCompiler(unittest.TestCase):
+    def testMake(self):
+        @dataclass
+        class TestCase:
+            op       : int
+            operands : List[int]
+            expected : List[int]
+
+        tests = [
+            TestCase(code.OpConstant, [65534], [code.OpConstant, 65534]),
+            TestCase(code.OpAdd, [], [code.OpAdd]),
+            TestCase(code.OpSetupLoop, [10, 4, 1], [code.OpSetupLoop, 10, 4, 1]),
+        ]
+
+        for elem in tests:
+            self.assertEqual(code.make(elem.op, *elem.operands), elem.expected)
+
+        self.assertRaises(ValueError, code.make, code.OpConstant)
+
+    def testInstructionsString(self):
+        instructions = code.make(code.OpConstant, 1) + code.make(code.OpAdd) + code.make(code.OpJump, 0)
+        expected = "0000 OpConstant 1\n0002 OpAdd\n0003 OpJump 0"
+
+        self.assertEqual(code.string(instructions), expected)
+
+    def testIntegerArithmetic(self):
+        bytecode = self.compile("1 + 2; 3")
+
+        # right operand first, as in Eval
+        expected = (code.make(code.OpConstant, 0) + code.make(code.OpConstant, 1) + code.make(code.OpAdd)
+                  + code.make(code.OpPopStatement)
+                  + code.make(code.OpConstant, 2) + code.make(code.OpReturnValue))
+
+        self.assertEqual(bytecode.instructions, expected, "\n" + code.string(bytecode.instructions))
+        self.assertEqual([elem.value for elem in bytecode.constants], [2, 1, 3])
+
+    def testConstantsShared(self):
+        bytecode = self.compile("let x = 1; x + 1 + x; \"x\"; 1.0; fn() { x + 1 }")
+
+        # one entry for the integer 1, the name x, the string "x" and 1.0
+        self.assertEqual(len(bytecode.constants), 5)
+        fn = bytecode.constants[-1]
+        self.assertTrue(isinstance(fn, object.CompiledFunction))
+        self.assertIs(fn.constants, bytecode.constants)
+        self.assertEqual(fn.instructions[:4], code.make(code.OpConstant, 0) + code.make(code.OpGetName, 1))
+        self.assertEqual([elem.__class__ for elem in bytecode.constants[:4]], [object.Integer, str, object.String, object.Integer])
+        self.assertEqual(bytecode.constants[3].value.__class__, float)
+
+    def testShortCircuit(self):
+        bytecode = self.compile("true && false")
+
+        # left operand first, the jump skips the right one
+        expected = (code.make(code.OpTrue) + code.make(code.OpJumpAnd, 5) + code.make(code.OpFalse)
+                  + code.make(code.OpAnd) + code.make(code.OpReturnValue))
+
+        self.assertEqual(bytecode.instructions, expected, "\n" + code.string(bytecode.instructions))
+
+    def testFunctionLiteral(self):
+        bytecode = self.compile("fn(x) { return x; }")
+
+        fn = bytecode.constants[-1]
+        self.assertTrue(isinstance(fn, object.CompiledFunction))
+        expected = code.make(code.OpGetName, 0) + code.make(code.OpReturnValue) + code.make(code.OpReturnValue)
+        self.assertEqual(fn.instructions, expected, "\n" + code.string(fn.instructions))
+        self.assertEqual(bytecode.instructions, code.make(code.OpClosure, 1) + code.make(code.OpReturnValue))
+
+    def testBreakOutsideLoop(self):
+        bytecode = self.compile("break;")
+
+        self.assertEqual(bytecode.instructions[0], code.OpError)
+        self.assertEqual(bytecode.constants[bytecode.instructions[1]], "Can't use break outside a loop")
+
+    def compile(self, input : str) -> compiler.Bytecode:
+        p = parser.Parser(lexer.Lexer(input))
+        program = p.parseProgram()
+        self.assertEqual(len(p.getErrors()), 0, p.getErrors())
+        return compiler.Compiler().compileProgram(program)
@@ -8,10 +8,10 @@ def _len(*args : List[object.Object]) -> object.Object:
         return newError("wrong number of arguments. got={}, want=1", len(args))
     
     if isinstance(args[0], object.String):
-        return object.Integer(len(args[0].value))
+        return object.integer(len(args[0].value))
     
     if isinstance(args[0], object.Array):
-        return object.Integer(len(args[0].elements))
+        return object.integer(len(args[0].elements))
     
     return newError("argument to `len` not supported, got {}", args[0].type())
 
@@ -109,20 +109,19 @@ def _int(*args : List[object.Object]) -> object.Object:
     if not isinstance(args[0], object.String):
         return object.NULL
     
-    returnValue = object.Integer(None)
-
+    # small results are shared objects: compute the value first
     if "." in args[0].value:
         try:
-            returnValue.value = float(args[0].value)
+            value = float(args[0].value)
         except ValueError:
             return object.NULL
     else:
         try:
-            returnValue.value = int(args[0].value)
+            value = int(args[0].value)
         except ValueError:
             return object.NULL
     
-    return returnValue
+    return object.integer(value)
 
 def _input(*args : List[object.Object]) -> object.Object:
     str = input()
@@ -141,4 +140,24 @@ builtins = {
     "str"    : object.Builtin(_str),
     "int"    : object.Builtin(_int),
     "input"  : object.Builtin(_input),
-}
\ No newline at end of file
+}
+# effects of the builtins, for the optimizer
+PURE      = "PURE"       # result depends on the arguments only, no effects
+ALLOCATES = "ALLOCATES"  # like PURE, but a new array at every call
+IO        = "IO"         # reads or writes the terminal (or exits), no value changes
+MUTATES   = "MUTATES"    # changes the array it is given
+
+effects = {
+    "len"    : PURE,
+    "first"  : PURE,
+    "last"   : PURE,
+    "rest"   : ALLOCATES,
+    "push"   : MUTATES,
+    "print"  : IO,
+    "printl" : IO,
+    "update" : MUTATES,
+    "exit"   : IO,
+    "str"    : PURE,
+    "int"    : PURE,
+    "input"  : IO,
+}
@@ -1,185 +1,227 @@
 
-from typing import List
-import copy
+from typing import List, Tuple
 import _Ast.ast as ast
 import _Object.object as object
 import _Evaluator.builtins as builtins
+import _Jit.jit as jit
 from _Evaluator.utils import newError
 
-# main evaluator (recursive) function: depending on the curret ast.node,
-# it calls different functions
-def Eval(node : ast.Node, env : object.Environment) -> object.Object:
-    # case of the program, as an array of statements
-    if isinstance(node, ast.Program):
-        return evalProgram(node.statements, env)
-
-    # case of an expression
-    elif isinstance(node, ast.ExpressionStatement):
-        return Eval(node.expression, env)
-
-    # case of an integer literal
-    elif isinstance(node, ast.IntegerLiteral):
-        return object.Integer(node.value)
-
-    # case of a boolean
-    elif isinstance(node, ast.Boolean):
-        return nativeBoolToBooleanObject(node.value)
-
-    # case of a prefix expression
-    elif isinstance(node, ast.PrefixExpression):
-        # first: eval the right expression
-        right = Eval(node.right, env)
-        if isError(right):
-            return right
-
-        # second: apply the prefix operator
-        return evalPrefixExpression(node.operator, right)
-
-    # case of infix expression
-    elif isinstance(node, ast.InfixExpression):
-        if node.operator == ".":
-            return evalClassInstanceExpression(node, env)
-
-        # first: eval the right expression
-        right = Eval(node.right, env)
-        if isError(right):
-            return right
-
-        # second: eval the left expression
-        left  = Eval(node.left, env)
-        if isError(left):
-            return left
-
-        # third: apply the operator
-        return evalInfixExpression(node.operator, left, right)
-    
-    # case of a block statement (eval eash stmt)
-    elif isinstance(node, ast.BlockStatement):
-        return evalBlockStatements(node, env)
-    
-    # case of an if statement (eval consequence depending on condition)
-    elif isinstance(node, ast.IfExpression):
-        return evalIfExpression(node, env)
-    
-    elif isinstance(node, ast.WhileExpression):
-        return evalWhileExpression(node, env)
+# Non-local control flow of Eval travels as exceptions, so that evaluating
+# a statement needs no check of its result: an error stops the whole
+# program, return, break and continue unwind to the function or loop that
+# handles them.
 
-    elif isinstance(node, ast.ForExpression):
-        return evalForExpression(node, env)
-    
-    # case of a return statement
-    elif isinstance(node, ast.ReturnStatement):
-        if node.value is None:
-            return object.ReturnValue(object.Integer(0))
+class Abort(Exception):
+    def __init__(self, value : object.Object):
+        self.value = value
 
-        val = Eval(node.value, env)
-        if isError(val):
-            return val
+class ReturnSignal(Exception):
+    def __init__(self, value : object.Object):
+        self.value = value
 
-        return object.ReturnValue(val)
-    
-    # case of a let statement
-    elif isinstance(node, ast.LetStatement):
-        val = Eval(node.value, env)
-        if isError(val):
-            return val
-        
-        if node.instance is not None:
-            instance, exist = env.get(node.name.value)
-            if not exist or not isinstance(instance, object.ClassInstance):
-                return newError("Can't find object {}", node.name.value)
-            _, exist = instance.env.get(node.instance.value)
-            if not exist:
-                return newError("Can't find instance {}", node.instance.value)
-            instance.env.set(node.instance.value, val, True)
-            return
+class BreakSignal(Exception):
+    pass
 
-        # set the current enviroment value
-        env.set(node.name.value, val, True)
-    
-    # case of an identifier (get its value from env)
-    elif isinstance(node, ast.Identifier):
-        return evalIdentifier(node, env)
-    
-    # case of a function literal
-    elif isinstance(node, ast.FunctionLiteral):
-        params = node.parameters
-        body = node.body
-        return object.Function(params, body)
-    
-    # case of a call expression
-    elif isinstance(node, ast.CallExpression):
-        # eval the function
-        function = Eval(node.function, env)
-        if isError(function):
-            return function
-        
-        if(isinstance(function, object.Class)):
-            return object.ClassInstance(copy.deepcopy(function.env))
-        
-        # eval its arguments
-        args = evalExpressions(node.arguments, env)
-        if len(args) == 1 and isError(args[0]):
-            return args[0]
+class ContinueSignal(Exception):
+    pass
 
-        # apply the function
-        return applyFunction(function, args, env)
-    
-    # case of string
-    elif isinstance(node, ast.StringLiteral):
-        return object.String(node.value)
-
-    # array literals
-    elif isinstance(node, ast.ArrayLiteral):
-        elements = evalExpressions(node.elements, env)
-        if len(elements) == 1 and isError(elements[0]):
-            return elements[0]
-        return object.Array(elements)
-
-    # index expression
-    elif isinstance(node, ast.IndexExpression):
-        left = Eval(node.left, env)
-        if isError(left):
-            return left
-        
-        index = Eval(node.index, env)
-        if isError(index):
-            return index
-        
-        return evalIndexExpression(left, index)
-    
-    # hash literal
-    elif isinstance(node, ast.HashLiteral):
-        return evalHashLiteral(node, env)
-
-    # case of assign statement
-    elif isinstance(node, ast.AssignStatement):
-        val = Eval(node.value, env)
-        if isError(val):
-            return val
-        
-        # set the current enviroment value
-        value, ok = env.get(node.name.value)
-        if not ok:
-            return newError("Can't assign value before declaration")
-        env.set(node.name.value, val, False)
-    
-    elif isinstance(node, ast.ContinueStatement):
-        if not env.inLoop:
-            return newError("Can't use continue outside a loop")
-        return object.CONTINUE
-
-    elif isinstance(node, ast.BreakStatement):
-        if not env.inLoop:
-            return newError("Can't use break outside a loop")
-        return object.BREAK
-    
-    elif isinstance(node, ast.Classliteral):
-        return evalClassLiteral(node)
+def check(obj : object.Object) -> object.Object:
+    if obj.__class__ is object.Error:
+        raise Abort(obj)
+    return obj
+
+# main evaluator (recursive) function: depending on the class of the
+# current ast.node, it calls the handler registered for it
+def Eval(node : ast.Node, env : object.Environment) -> object.Object:
+    handler = evaluators.get(node.__class__)
+    if handler is None:
+        handler = findHandler(node.__class__)
+    return handler(node, env)
+
+# register the function evaluating the nodes of nodeClass (and of its
+# subclasses without a handler of their own): handler(node, env) -> object
+def register(nodeClass : type, handler):
+    # subclasses must look up their base classes again
+    for cached in inherited:
+        del evaluators[cached]
+    inherited.clear()
+    evaluators[nodeClass] = handler
+
+# handler of the closest registered base class, cached in the table
+def findHandler(nodeClass : type):
+    handler = evalUnknownNode
+    for base in nodeClass.__mro__[1:]:
+        if base in evaluators:
+            handler = evaluators[base]
+            break
+    evaluators[nodeClass] = handler
+    inherited.add(nodeClass)
+    return handler
+
+# no function to eval the ast.node
+def evalUnknownNode(node : ast.Node, env : object.Environment) -> object.Object:
+    return None
+
+# case of the program, as an array of statements
+def evalProgramNode(node : ast.Program, env : object.Environment) -> object.Object:
+    return evalProgram(node.statements, env)
+
+# case of an expression
+def evalExpressionStatement(node : ast.ExpressionStatement, env : object.Environment) -> object.Object:
+    return Eval(node.expression, env)
+
+# case of an integer literal
+def evalIntegerLiteral(node : ast.IntegerLiteral, env : object.Environment) -> object.Object:
+    constant = node.constant
+    if constant is None:
+        constant = node.constant = object.integer(node.value)
+    return constant
+
+# case of a boolean
+def evalBoolean(node : ast.Boolean, env : object.Environment) -> object.Object:
+    return nativeBoolToBooleanObject(node.value)
+
+# case of a prefix expression
+def evalPrefixNode(node : ast.PrefixExpression, env : object.Environment) -> object.Object:
+    # first: eval the right expression
+    right = Eval(node.right, env)
+
+    # second: apply the prefix operator
+    return check(evalPrefixExpression(node.operator, right))
+
+# case of infix expression
+def evalInfixNode(node : ast.InfixExpression, env : object.Environment) -> object.Object:
+    if node.operator == ".":
+        return check(evalClassInstanceExpression(node, env))
+    if node.operator in shortCircuit:
+        return evalLogicalNode(node, env)
+
+    # first: eval the right expression
+    right = Eval(node.right, env)
+
+    # second: eval the left expression
+    left  = Eval(node.left, env)
+
+    # third: apply the operator
+    result = applyInfix(node, left, right)
+    if result.__class__ is object.Error:
+        raise Abort(result)
+    return result
+
+# left operands deciding the result of the logical operators on their own:
+# if the left operand is this value, the right one is not evaluated
+shortCircuit = {
+    "&&"  : object.FALSE,
+    "and" : object.FALSE,
+    "||"  : object.TRUE,
+    "or"  : object.TRUE,
+}
+
+# case of a logical operator: left to right, with short circuit
+def evalLogicalNode(node : ast.InfixExpression, env : object.Environment) -> object.Object:
+    left = Eval(node.left, env)
+    if left is shortCircuit[node.operator]:
+        return left
+
+    result = applyInfix(node, left, Eval(node.right, env))
+    if result.__class__ is object.Error:
+        raise Abort(result)
+    return result
 
-    # no functino to eval the ast.node
+# case of a return statement
+def evalReturnStatement(node : ast.ReturnStatement, env : object.Environment) -> object.Object:
+    if node.value is None:
+        raise ReturnSignal(object.integer(0))
+
+    # return f(...): let the caller run the call
+    if isinstance(node.value, ast.CallExpression):
+        raise ReturnSignal(evalTailCall(node.value, env))
+
+    raise ReturnSignal(Eval(node.value, env))
+
+# case of a let statement
+def evalLetStatement(node : ast.LetStatement, env : object.Environment) -> object.Object:
+    error = bindLetStatement(node, Eval(node.value, env), env)
+    if error is not None:
+        raise Abort(error)
+
+# case of a function literal
+def evalFunctionLiteral(node : ast.FunctionLiteral, env : object.Environment) -> object.Object:
+    params = node.parameters
+    body = node.body
+    return object.Function(params, body, env)
+
+# case of a call expression
+def evalCallExpression(node : ast.CallExpression, env : object.Environment) -> object.Object:
+    # eval the function
+    function = Eval(node.function, env)
+    
+    return callFunction(function, node.arguments, env)
+
+# case of string
+def evalStringLiteral(node : ast.StringLiteral, env : object.Environment) -> object.Object:
+    constant = node.constant
+    if constant is None:
+        constant = node.constant = object.String(node.value)
+    return constant
+
+# array literals
+def evalArrayLiteral(node : ast.ArrayLiteral, env : object.Environment) -> object.Object:
+    return object.Array(evalExpressions(node.elements, env))
+
+# index expression
+def evalIndexNode(node : ast.IndexExpression, env : object.Environment) -> object.Object:
+    left = Eval(node.left, env)
+    index = Eval(node.index, env)
+    
+    result = applyIndex(node, left, index)
+    if result.__class__ is object.Error:
+        raise Abort(result)
+    return result
+
+# case of assign statement
+def evalAssignStatement(node : ast.AssignStatement, env : object.Environment) -> object.Object:
+    error = bindAssignStatement(node, Eval(node.value, env), env)
+    if error is not None:
+        raise Abort(error)
+
+# case of a compound assignment: the value first, as in target = target op value
+def evalCompoundAssignStatement(node : ast.CompoundAssignStatement, env : object.Environment) -> object.Object:
+    value = Eval(node.value, env)
+    target = node.target
+    if target.__class__ is ast.Identifier:
+        cell = identifierCell(target, env)
+    elif target.__class__ is ast.IndexExpression:
+        left = Eval(target.left, env)
+        cell = indexCell(left, Eval(target.index, env))
     else:
-        return None
+        cell = memberCell(node, env)
+    if cell.__class__ is object.Error:
+        raise Abort(cell)
+    check(updateCell(node, cell, value))
+
+def evalContinueStatement(node : ast.ContinueStatement, env : object.Environment) -> object.Object:
+    if not inLoop(node, env):
+        raise Abort(newError("Can't use continue outside a loop"))
+    raise ContinueSignal()
+
+def evalBreakStatement(node : ast.BreakStatement, env : object.Environment) -> object.Object:
+    if not inLoop(node, env):
+        raise Abort(newError("Can't use break outside a loop"))
+    raise BreakSignal()
+
+# whether a break or continue statement is inside a loop
+def inLoop(node : ast.Statement, env : object.Environment) -> bool:
+    if node.inLoop is None:
+        return env.inLoop
+    return node.inLoop
+
+# environment the statements of block run in: a new one, unless the
+# resolver found that the block binds no names
+def blockEnvironment(block : ast.BlockStatement, env : object.Environment, inLoop : bool) -> object.Environment:
+    if block.scoped:
+        return object.Environment(env, inLoop, block.layout)
+    return env
 
 # return the corresponding instance of object.Object
 def nativeBoolToBooleanObject(exp : bool) -> object.Object:
@@ -206,7 +248,7 @@ def evalMinusPrefixOperatorExpression(right : object.Object) -> object.Object:
         return newError("unknown operator: -{}", right.type())
     
     value = right.value
-    return object.Integer(-value)
+    return object.integer(-value)
 
 # eval infix expression: get the vlaues of left and right and apply the python's correspondant operator
 def evalInfixExpression(operator : str, left : object.Object, right : object.Object) -> object.Object:  
@@ -230,22 +272,60 @@ def evalInfixExpression(operator : str, left : object.Object, right : object.Obj
     else:
         return newError("unknown operator: {} {} {}", left.type(), operator, right.type())
 
+# number of evaluations with the same operand classes before a node is
+# quickened, that is, it gets the specialized operation for those classes
+QUICKEN_THRESHOLD = 4
+
+# apply the operator of an infix node: the specialized operation if the
+# node is quickened and the operands have the expected classes, else the
+# generic one, recording the classes of the operands
+def applyInfix(node : ast.InfixExpression, left : object.Object, right : object.Object) -> object.Object:
+    quick = node.quick
+    if quick is not None:
+        if left.__class__ is node.leftClass and right.__class__ is node.rightClass:
+            return quick(left, right)
+        node.quick = None
+    recordFeedback(node, left, right, quickInfix.get((left.__class__, right.__class__, node.operator)))
+    return evalInfixExpression(node.operator, left, right)
+
+# as applyInfix, for index expressions
+def applyIndex(node : ast.IndexExpression, left : object.Object, index : object.Object) -> object.Object:
+    quick = node.quick
+    if quick is not None:
+        if left.__class__ is node.leftClass and index.__class__ is node.rightClass:
+            return quick(left, index)
+        node.quick = None
+    recordFeedback(node, left, index, quickIndex.get((left.__class__, index.__class__)))
+    return evalIndexExpression(left, index)
+
+# count the evaluations of node with the same operand classes, install
+# the operation specialized for them once the threshold is reached
+def recordFeedback(node : ast.Expression, left : object.Object, right : object.Object, specialized):
+    if left.__class__ is node.leftClass and right.__class__ is node.rightClass:
+        node.hits += 1
+        if node.hits >= QUICKEN_THRESHOLD:
+            node.quick = specialized
+    else:
+        node.leftClass = left.__class__
+        node.rightClass = right.__class__
+        node.hits = 1
+
 # eval integer infix expression
 def evalIntegerInfixExpression(operator : str, left : object.Object, right : object.Object) -> object.Object:  
     leftValue = left.value
     rightValue = right.value
 
     if operator == "+":
-        return object.Integer(leftValue + rightValue)
+        return object.integer(leftValue + rightValue)
     if operator == "-":
-        return object.Integer(leftValue - rightValue)
+        return object.integer(leftValue - rightValue)
     if operator == "*":
-        return object.Integer(leftValue * rightValue)
+        return object.integer(leftValue * rightValue)
     # in case of integers, '/' is the division between integers
     if operator == "/":
-        return object.Integer(leftValue / rightValue)
+        return object.integer(leftValue / rightValue)
     if operator == "%":
-        return object.Integer(leftValue %  rightValue)
+        return object.integer(leftValue %  rightValue)
     if operator == "<":
         return nativeBoolToBooleanObject(leftValue <  rightValue)
     if operator == ">":
@@ -264,19 +344,15 @@ def evalIntegerInfixExpression(operator : str, left : object.Object, right : obj
 # eval if expression
 def evalIfExpression(ie : ast.IfExpression, env: object.Environment) -> object.Object:
     # eval condition
-    newEnv = object.Environment(env, env.inLoop)
-
     condition = Eval(ie.condition, env)
-    if isError(condition):
-        return condition
     
     # if condition is true, eval consequence
     if isTruthy(condition):
-        return Eval(ie.consequence, newEnv)
+        return Eval(ie.consequence, blockEnvironment(ie.consequence, env, env.inLoop))
     
     # else if there's else branch, eval it
     elif ie.alternative is not None:
-        return Eval(ie.alternative, newEnv)
+        return Eval(ie.alternative, blockEnvironment(ie.alternative, env, env.inLoop))
     
     # else return NULL
     else:
@@ -290,16 +366,26 @@ def isTruthy(obj : object.Object) -> bool:
 # eval each statement of the program
 def evalProgram(program : ast.Program, env : object.Environment) -> object.Object:
     result = None
-    for statement in program:
-        # refresh the result value for each statement, so that that last statement
-        # give the return value of the block
-        result = Eval(statement, env)
+    try:
+        for statement in program:
+            # refresh the result value for each statement, so that that last statement
+            # give the return value of the block
+            result = Eval(statement, env)
+
+            # exit() stops the program once it's the value of a statement
+            if result is object.EXIT:
+                return result
 
-        # if we encounter a return statement, we don't want to go on
-        if isinstance(result, object.ReturnValue):
-            return result.value
-        elif isinstance(result, (object.Exit, object.Error)):
-            return result
+    # if we encounter a return statement, we don't want to go on
+    except ReturnSignal as signal:
+        result = signal.value
+        if isinstance(result, object.TailCall):
+            try:
+                return applyFunction(result.fn, result.args)
+            except Abort as abort:
+                return abort.value
+    except Abort as abort:
+        return abort.value
     return result
 
 # eval each statement of the block
@@ -307,20 +393,127 @@ def evalBlockStatements(block : ast.BlockStatement, env : object.Environment) ->
     result = None
     for statement in block.statements:
         result = Eval(statement, env)
-
-        if result is not None:
-            if result.type() in [object.BREAK_OBJ, object.CONTINUE_OBJ, object.RETURN_VALUE_OBJ, object.ERROR_OBJ, object.EXIT_OBJ]:
-                return result
+        if result is object.EXIT:
+            return result
 
     return result
 
-def isError(obj : object.Object) -> bool:
-    if obj is not None:
-        return obj.type() == object.ERROR_OBJ
-    return False
+# bind the value of a let statement (to a field, if it has an instance)
+def bindLetStatement(node : ast.LetStatement, val : object.Object, env : object.Environment) -> object.Object:
+    if node.instance is not None:
+        instance, exist = env.get(node.name.value)
+        if not exist or not isinstance(instance, object.ClassInstance):
+            return newError("Can't find object {}", node.name.value)
+        _, exist = instance.env.get(node.instance.value)
+        if not exist:
+            return newError("Can't find instance {}", node.instance.value)
+        instance.env.set(node.instance.value, val, True)
+        return
+
+    # set the current enviroment value
+    if node.slot is not None:
+        env.values[node.slot] = val
+    else:
+        env.set(node.name.value, val, True)
+
+# update the binding of an assign statement
+def bindAssignStatement(node : ast.AssignStatement, val : object.Object, env : object.Environment) -> object.Object:
+    # update the binding at the resolved address, if it's bound
+    if node.slot is not None:
+        scope = env
+        depth = node.depth
+        while depth:
+            scope = scope.outer
+            depth -= 1
+        if scope.values[node.slot] is not object.UNBOUND:
+            scope.values[node.slot] = val
+            return
+
+    # set the current enviroment value
+    value, ok = env.get(node.name.value)
+    if not ok:
+        return newError("Can't assign value before declaration")
+    env.set(node.name.value, val, False)
+
+# The target of a compound assignment is found once, as a cell: a list of
+# values (an environment, an array, an instance) and an index in it
+
+# cell of the binding of an identifier
+def identifierCell(node : ast.Identifier, env : object.Environment) -> Tuple[List[object.Object], int]:
+    if node.slot is not None:
+        scope = env
+        depth = node.depth
+        while depth:
+            scope = scope.outer
+            depth -= 1
+        if scope.values[node.slot] is not object.UNBOUND:
+            return scope.values, node.slot
+
+    scope, slot = env.find(node.value)
+    if scope is None:
+        return newError("Can't assign value before declaration")
+    return scope.values, slot
+
+# cell of an element of an array
+def indexCell(left : object.Object, index : object.Object) -> Tuple[List[object.Object], int]:
+    if left.__class__ is not object.Array or index.__class__ is not object.Integer:
+        return newError("index assignment not supported: {}[{}]", left.type(), index.type())
+    if index.value < 0 or index.value >= len(left.elements):
+        return newError("index out of range")
+    return left.elements, index.value
+
+# cell of the field of an instance, the target obj.field of node
+def memberCell(node : ast.CompoundAssignStatement, env : object.Environment) -> Tuple[List[object.Object], int]:
+    name = node.target.left.value
+    instance, exist = env.get(name)
+    if not exist or not isinstance(instance, object.ClassInstance):
+        return newError("Can't find object {}", name)
+    cache = memberCache(node, node.target.right)
+    if cache.get(instance.env) is None:
+        return newError("Can't find instance {}", cache.name)
+    return instance.env.values, cache.slot
+
+# store in cell its value combined with value by the operator of node
+def updateCell(node : ast.CompoundAssignStatement, cell : Tuple[List[object.Object], int],
+               value : object.Object) -> object.Object:
+    values, index = cell
+    result = applyInfix(node, values[index], value)
+    if result.__class__ is object.Error:
+        return result
+    values[index] = result
+
+# case of an identifier
+def evalIdentifierNode(node : ast.Identifier, env : object.Environment) -> object.Object:
+    # resolved identifier: index the environment it is bound in
+    if node.slot is not None:
+        scope = env
+        depth = node.depth
+        while depth:
+            scope = scope.outer
+            depth -= 1
+        val = scope.values[node.slot]
+        if val is not object.UNBOUND:
+            if scope.template is not None:
+                return scope.member(node.slot)
+            return val
+
+    return check(evalIdentifier(node, env))
 
 # get the identifer from the current env
 def evalIdentifier(node : ast.Identifier, env : object.Environment) -> object.Object:
+    # resolved identifier: index the environment it is bound in
+    if node.slot is not None:
+        scope = env
+        depth = node.depth
+        while depth:
+            scope = scope.outer
+            depth -= 1
+        val = scope.values[node.slot]
+        if val is not object.UNBOUND:
+            if scope.template is not None:
+                return scope.member(node.slot)
+            return val
+
     val, ok = env.get(node.value)
     if ok:
         return val
@@ -336,42 +529,105 @@ def evalExpressions(exps : List[ast.Expression], env : object.Object) -> List[ob
     result = []
 
     for elem in exps:
-        evaluated = Eval(elem, env)
-        if isError(evaluated):
-            return [evaluated]
-        result.append(evaluated)
+        result.append(Eval(elem, env))
     
     return result
 
+# call an already evaluated function (a class creates an instance)
+def callFunction(function : object.Object, arguments : List[ast.Expression], env : object.Environment) -> object.Object:
+    if(isinstance(function, object.Class)):
+        return function.instance()
+    
+    # eval its arguments and apply the function
+    return applyFunction(function, evalExpressions(arguments, env))
+
+# eval the function and the arguments of a call in tail position: a user
+# function is not applied here, but returned to applyFunction
+def evalTailCall(node : ast.CallExpression, env : object.Environment) -> object.Object:
+    function = Eval(node.function, env)
+
+    if not isinstance(function, object.Function):
+        return callFunction(function, node.arguments, env)
+
+    return object.TailCall(function, evalExpressions(node.arguments, env))
+
 # apply a function
-def applyFunction(fn : object.Object, args : List[object.Object], env : object.Environment = None) -> object.Object:
+def applyFunction(fn : object.Object, args : List[object.Object]) -> object.Object:
     if isinstance(fn, object.Function):
-    # we extended the environment of a function pushing the arguments too
-        if len(fn.parameters) != len(args):
-            return newError("wrong number of parametrs: wanted {}, got {}", len(fn.parameters), len(args))
-        extendedEnv = extendFunctionEnvironment(fn, args, env)
-        evaluated = Eval(fn.body, extendedEnv)
-        return unwrapReturnValue(evaluated)
+        # calls in tail position are run by this loop, without nesting
+        while True:
+            # we extended the environment of a function pushing the arguments too
+            if len(fn.parameters) != len(args):
+                raise Abort(newError("wrong number of parametrs: wanted {}, got {}", len(fn.parameters), len(args)))
+            # a hot function runs its body compiled to python
+            compiled = fn.body.jit
+            if compiled is None:
+                fn.body.calls += 1
+                if fn.body.calls == JIT_THRESHOLD:
+                    compiled = jit.compileFunction(fn)
+            if compiled:
+                evaluated = compiled(fn.env, *args)
+            else:
+                extendedEnv = extendFunctionEnvironment(fn, args)
+                try:
+                    evaluated = Eval(fn.body, extendedEnv)
+                except ReturnSignal as signal:
+                    evaluated = signal.value
+                releaseFunctionEnvironment(fn, extendedEnv)
+            if not isinstance(evaluated, object.TailCall):
+                return evaluated
+
+            fn, args = evaluated.fn, evaluated.args
     
     if isinstance(fn, object.Builtin):
-        return fn.fn(*args)
-    
-    return newError("not a function: {}", fn.type())
-
-# extend function environment
-def extendFunctionEnvironment(fn : object.Object, args : List[object.Object], env : object.Environment = None) -> object.Environment:
-    env = object.Environment(env)
+        return check(fn.fn(*args))
+    
+    raise Abort(newError("not a function: {}", fn.type()))
+
+# environments of finished calls kept by each function for its next
+# calls, 0 disables the reuse
+FRAME_POOL_SIZE = 16
+
+# calls of a function run by Eval before its body is compiled to a python
+# function (see _Jit), 0 disables the compilation
+JIT_THRESHOLD = 1000
+
+# environments of calls allocated and taken back from a pool
+frameCounts = {"allocated": 0, "reused": 0}
+
+# extend the environment the function was created in (if the function
+# binds names: else its body runs right in it)
+def extendFunctionEnvironment(fn : object.Object, args : List[object.Object]) -> object.Environment:
+    body = fn.body
+    if not body.scoped:
+        return fn.env
+
+    layout = body.layout
+    frames = body.frames
+    if frames:
+        env = frames.pop()
+        env.outer = fn.env
+        frameCounts["reused"] += 1
+    else:
+        env = object.Environment(fn.env, False, layout)
+        frameCounts["allocated"] += 1
 
     for idx, param in enumerate(fn.parameters):
-        env.set(param.value, args[idx], True)
+        if layout is not None:
+            env.values[param.slot] = args[idx]
+        else:
+            env.set(param.value, args[idx], True)
 
     return env
 
-def unwrapReturnValue(ev : object.Object) -> object.Object:
-    if isinstance(ev, object.ReturnValue):
-        return ev.value
-    
-    return ev
+# give back the environment of a finished call of fn to its pool, if the
+# resolver found that nothing can reference it anymore
+def releaseFunctionEnvironment(fn : object.Object, env : object.Environment):
+    frames = fn.body.frames
+    if frames is not None and env.shared and len(frames) < FRAME_POOL_SIZE:
+        env.values[:] = (object.UNBOUND,) * len(env.values)
+        env.outer = None
+        frames.append(env)
 
 def evalStringInfixExpression(operator : str, left : object.Object, right : object.Object) -> object.Object:
     if operator not in ["+", "==", "!="]:
@@ -387,6 +643,43 @@ def evalStringInfixExpression(operator : str, left : object.Object, right : obje
         return nativeBoolToBooleanObject(leftVal == rightVal)
 
 
+# specialized infix operations, by classes of the operands and operator:
+# same results as evalInfixExpression for those classes
+quickInfix = {
+    (object.Integer, object.Integer, "+")   : lambda left, right: object.integer(left.value + right.value),
+    (object.Integer, object.Integer, "-")   : lambda left, right: object.integer(left.value - right.value),
+    (object.Integer, object.Integer, "*")   : lambda left, right: object.integer(left.value * right.value),
+    (object.Integer, object.Integer, "/")   : lambda left, right: object.integer(left.value / right.value),
+    (object.Integer, object.Integer, "%")   : lambda left, right: object.integer(left.value % right.value),
+    (object.Integer, object.Integer, "<")   : lambda left, right: object.TRUE if left.value <  right.value else object.FALSE,
+    (object.Integer, object.Integer, ">")   : lambda left, right: object.TRUE if left.value >  right.value else object.FALSE,
+    (object.Integer, object.Integer, "<=")  : lambda left, right: object.TRUE if left.value <= right.value else object.FALSE,
+    (object.Integer, object.Integer, ">=")  : lambda left, right: object.TRUE if left.value >= right.value else object.FALSE,
+    (object.Integer, object.Integer, "==")  : lambda left, right: object.TRUE if left.value == right.value else object.FALSE,
+    (object.Integer, object.Integer, "!=")  : lambda left, right: object.TRUE if left.value != right.value else object.FALSE,
+    (object.String, object.String, "+")     : lambda left, right: object.String(left.value + right.value),
+    (object.String, object.String, "==")    : lambda left, right: object.TRUE if left.value == right.value else object.FALSE,
+    (object.String, object.String, "!=")    : lambda left, right: object.TRUE if left.value != right.value else object.FALSE,
+    (object.Boolean, object.Boolean, "==")  : lambda left, right: object.TRUE if left is right else object.FALSE,
+    (object.Boolean, object.Boolean, "!=")  : lambda left, right: object.TRUE if left is not right else object.FALSE,
+    (object.Boolean, object.Boolean, "&&")  : lambda left, right: object.TRUE if left.value and right.value else object.FALSE,
+    (object.Boolean, object.Boolean, "and") : lambda left, right: object.TRUE if left.value and right.value else object.FALSE,
+    (object.Boolean, object.Boolean, "||")  : lambda left, right: object.TRUE if left.value or right.value else object.FALSE,
+    (object.Boolean, object.Boolean, "or")  : lambda left, right: object.TRUE if left.value or right.value else object.FALSE,
+}
+
+def quickHashIndex(left : object.Hash, index : object.Object) -> object.Object:
+    pair = left.pairs.get(index.hashKey())
+    return object.NULL if pair is None else pair.value
+
+# specialized index operations, by classes of the operands
+quickIndex = {
+    (object.Array, object.Integer) : lambda left, index: left.elements[index.value] if 0 <= index.value < len(left.elements) else object.NULL,
+    (object.Hash, object.Integer)  : quickHashIndex,
+    (object.Hash, object.String)   : quickHashIndex,
+    (object.Hash, object.Boolean)  : quickHashIndex,
+}
+
 def evalIndexExpression(left : object.Object, index : object.Object) -> object.Object:
     if left.type() == object.ARRAY_OBJ and index.type() == object.INTEGER_OBJ:
         return evalArrayIndexExpression(left, index)
@@ -410,15 +703,11 @@ def evalHashLiteral(node : ast.HashLiteral, env : object.Environment) -> object.
 
     for keyNode, valueNode in node.pairs.items():
         key = Eval(keyNode, env)
-        if isError(key):
-            return key
         
         if not isinstance(key, object.Hashable):
-            return newError("unusable as hash key: {}".format(key.type()))
+            raise Abort(newError("unusable as hash key: {}".format(key.type())))
         
         value = Eval(valueNode, env)
-        if isError(value):
-            return value
 
         hashed = key.hashKey()
         pairs[hashed] = object.HashPair(key, value)
@@ -429,30 +718,26 @@ def evalHashIndexExpression(left : object.Object, index : object.Object) -> obje
     if not isinstance(index, object.Hashable):
         return newError("unusable as hash key: {}".format(index.type()))
     
-    if index.hashKey() in left.pairs:
-        return left.pairs[index.hashKey()].value
-    
-    return object.NULL
+    return quickHashIndex(left, index)
 
 # eval while expression
 def evalWhileExpression(we : ast.WhileExpression, env: object.Environment) -> object.Object:
     result = object.NULL
-    newEnv = object.Environment(env, True)
+    newEnv = blockEnvironment(we.block, env, True)
     while True:
         condition = Eval(we.condition, env)
-        if isError(condition):
-            return condition
     
         # if condition is true, eval consequence
         if isTruthy(condition):
-            result = Eval(we.block, newEnv)
-            if isinstance(result, (object.Break)):
+            try:
+                result = Eval(we.block, newEnv)
+            except BreakSignal:
                 return object.NULL
-            elif isinstance(result, (object.Error, object.Exit, object.ReturnValue)):
-                return result
-            elif isinstance(result, object.Continue):
+            except ContinueSignal:
                 result = object.NULL
                 continue
+            if result is object.EXIT:
+                return result
         else:
             return result
 
@@ -461,50 +746,98 @@ def evalForExpression(floop : ast.ForExpression, env : object.Environment) -> ob
     # result of the for loop -> result of last statemnet executed
     result = object.NULL
     # remember if we were in a loop
-    newEnv = object.Environment(env, True)
+    newEnv = blockEnvironment(floop.block, env, True)
 
     # if there is an initial statement
     if floop.initial is not None:
-        initial = Eval(floop.initial, newEnv)
-        if isError(initial):
-            return initial
+        Eval(floop.initial, newEnv)
+        if floop.counter is not None:
+            slot = newEnv.names[floop.counter]
+            if newEnv.values[slot].__class__ is object.Integer:
+                return evalCountingLoop(floop, newEnv, slot)
     
     while True:
         condition = object.TRUE
         # check condition of floop
         if floop.condition is not None:
             condition = Eval(floop.condition, newEnv)
-            if isError(condition):
-                return condition
 
         if isTruthy(condition):
-            # eval block
-            result = Eval(floop.block, newEnv)
-
-            # case of a result type which stops the loop
-            if isinstance(result, (object.Error, object.Exit, object.ReturnValue, object.Break)):
-                # return NULL if it was an object.Break
-                return object.NULL if isinstance(result, object.Break) else result
+            # eval block: break stops the loop, continue goes on with the update
+            try:
+                result = Eval(floop.block, newEnv)
+            except BreakSignal:
+                return object.NULL
+            except ContinueSignal:
+                result = object.NULL
+            else:
+                if result is object.EXIT:
+                    return result
 
             if floop.update is not None:
-                update = Eval(floop.update, newEnv)
-                if isError(update):
-                    return update
-            
-            if isinstance(result, object.Continue):
-                result = object.NULL
+                Eval(floop.update, newEnv)
 
         else:
             return result
 
-def evalClassLiteral(classLiteral : ast.Classliteral) -> object.Object:
-    newClass = object.Class(classLiteral.body, object.Environment(None, False))
+# case of a for loop counting with an integer variable that only the update
+# assigns (see the resolver): the variable is kept as a python number and
+# stored in its slot for the body at each iteration, the bound is evaluated
+# before each iteration as the condition would
+def evalCountingLoop(floop : ast.ForExpression, env : object.Environment, slot : int) -> object.Object:
+    result = object.NULL
+    values = env.values
+    i = values[slot].value
+    condition = floop.condition.expression
+    bound = condition.right
+    orEqual = condition.operator == "<="
+    update = floop.update
+    step = update.value.right.value if update.__class__ is ast.AssignStatement else update.value.value
+    block = floop.block
+    Integer = object.Integer
+
+    while True:
+        limit = Eval(bound, env)
+        if limit.__class__ is Integer:
+            if not (i <= limit.value if orEqual else i < limit.value):
+                return result
+        elif not isTruthy(check(applyInfix(condition, values[slot], limit))):
+            return result
+
+        # eval block: break stops the loop, continue goes on with the update
+        try:
+            result = Eval(block, env)
+        except BreakSignal:
+            return object.NULL
+        except ContinueSignal:
+            result = object.NULL
+        else:
+            if result is object.EXIT:
+                return result
+
+        i += step
+        values[slot] = object.integer(i)
+
+def evalClassLiteral(classLiteral : ast.Classliteral, env : object.Environment = None) -> object.Object:
+    newClass = object.Class(classLiteral.body, object.Environment(None, False, classLiteral.body.layout))
     for statement in classLiteral.body.statements:
         if not isinstance(statement, ast.LetStatement):
-            return newError("in class declaration there must be only Let statements")
-        _ = Eval(statement, newClass.env)
+            raise Abort(newError("in class declaration there must be only Let statements"))
+        # a field whose value fails is left unbound
+        try:
+            Eval(statement, newClass.env)
+        except Abort:
+            pass
     return newClass
 
+# inline cache of the member name read by node (a dot expression, or a
+# compound assignment of a member)
+def memberCache(node : ast.InfixExpression, name : ast.Identifier) -> object.MemberCache:
+    cache = node.member
+    if cache is None:
+        cache = node.member = object.MemberCache(name.value)
+    return cache
+
 def evalClassInstanceExpression(node : ast.InfixExpression, env : object.Environment) -> object.Object:
     if not isinstance(node.left, ast.Identifier) or not node.operator == ".":
         return newError("Can't find a way to execute DOT operator")
@@ -514,26 +847,53 @@ def evalClassInstanceExpression(node : ast.InfixExpression, env : object.Environ
         return newError("{} does not exist in current scope", node.left.value)
     
     if isinstance(node.right, ast.Identifier):
-        identifierName = node.right.value
-        identifier, exist = classInst.env.get(identifierName)
-        return identifier
+        return memberCache(node, node.right).get(classInst.env)
 
     elif isinstance(node.right, ast.CallExpression):
-        # eval the function
-        function = Eval(node.right.function, classInst.env)
-        if isError(function):
-            return function
+        # eval the function: a method is read through the inline cache,
+        # anything else (e.g. a builtin) in the instance environment
+        function = None
+        if isinstance(node.right.function, ast.Identifier):
+            function = memberCache(node, node.right.function).get(classInst.env)
+        if function is None:
+            function = Eval(node.right.function, classInst.env)
         
         if(isinstance(function, object.Class)):
             return object.ClassInstance(function.env)
         
-        args = evalExpressions(node.right.arguments, env)
-        if len(args) == 1 and isError(args[0]):
-            return args[0]
-
         # apply the function
-        return applyFunction(function, args, classInst.env)
+        return applyFunction(function, evalExpressions(node.right.arguments, env))
     
     else:
         return newError("Can't find a way to execute DOT operator")
 
+# handler of each node class, see register
+evaluators = {
+    ast.Program             : evalProgramNode,
+    ast.ExpressionStatement : evalExpressionStatement,
+    ast.IntegerLiteral      : evalIntegerLiteral,
+    ast.Boolean             : evalBoolean,
+    ast.PrefixExpression    : evalPrefixNode,
+    ast.InfixExpression     : evalInfixNode,
+    ast.BlockStatement      : evalBlockStatements,
+    ast.IfExpression        : evalIfExpression,
+    ast.WhileExpression     : evalWhileExpression,
+    ast.ForExpression       : evalForExpression,
+    ast.ReturnStatement     : evalReturnStatement,
+    ast.LetStatement        : evalLetStatement,
+    ast.Identifier          : evalIdentifierNode,
+    ast.FunctionLiteral     : evalFunctionLiteral,
+    ast.CallExpression      : evalCallExpression,
+    ast.StringLiteral       : evalStringLiteral,
+    ast.ArrayLiteral        : evalArrayLiteral,
+    ast.IndexExpression     : evalIndexNode,
+    ast.HashLiteral         : evalHashLiteral,
+    ast.AssignStatement     : evalAssignStatement,
+    ast.CompoundAssignStatement : evalCompoundAssignStatement,
+    ast.ContinueStatement   : evalContinueStatement,
+    ast.BreakStatement      : evalBreakStatement,
+    ast.Classliteral        : evalClassLiteral,
+}
+
+# node classes whose handler was found through a base class
+inherited = set()
@@ -1,12 +1,57 @@
 from cmath import e
 from dataclasses import dataclass
+import contextlib
+import io
 import unittest
 import _Lexer.lexer as lexer
 import _Parser.parser as parser
 import _Object.object as object
+import _Ast.ast as ast
 import _Evaluator.evaluator as evaluator
+import _Resolver.resolver as resolver
 
-class TestEvaluator(unittest.TestCase):
+# tests running programs: backend runs them (a function of a program and an
+# environment, as in _Repl/backends.py), once the options have prepared
+# them (functions of the test, the program and the environment returning
+# the program to run), in order
+class ProgramTest(unittest.TestCase):
+    backend = staticmethod(evaluator.Eval)
+    options = ()
+
+    def eval(self, input : str) -> object.Object:
+        l = lexer.Lexer(input)
+        p = parser.Parser(l)
+        program = p.parseProgram()
+        env = object.Environment()
+
+        for option in self.options:
+            program = option(self, program, env)
+        return self.backend(program, env)
+
+    def typeObject(self, obj : object.Object, expected : any, typeObject : any):
+        self.checkInstanceOf(obj, typeObject)
+        self.checkValue(obj.value, expected)
+
+    def nullObject(self, evaluated : object.Object):
+        self.assertEqual(evaluated, object.NULL, "object is not NULL")
+
+    def checkInstanceOf(self, stt, className):    
+        self.assertTrue(isinstance(stt, className),
+                "stt not an instance of {}. Got {}".format(className.__name__, stt.__class__.__name__))
+    def checkValue(self, got : any, wanted : any):
+        self.assertEqual(got, wanted,
+                "object has wrong value. got={}, want={}".format(got, wanted))
+
+# option annotating the program with the resolver, as monkey.py does
+def resolved(test : ProgramTest, program : ast.Program, env : object.Environment) -> ast.Program:
+    resolver.resolve(program, env)
+    return program
+
+# the evaluator test suite, run by backend after options (see ProgramTest)
+def suite(backend, *options) -> type:
+    return type("TestEvaluator", (TestEvaluator,), {"backend": staticmethod(backend), "options": options})
+
+class TestEvaluator(ProgramTest):
     def testEvalInteger(self):
         @dataclass
         class TestCase:
@@ -74,18 +119,6 @@ class TestEvaluator(unittest.TestCase):
             evaluated = self.eval(elem.input)
             self.typeObject(evaluated, elem.expected, object.Boolean)
         
-    def eval(self, input : str) -> object.Object:
-        l = lexer.Lexer(input)
-        p = parser.Parser(l)
-        program = p.parseProgram()
-        env = object.Environment()
-
-        return evaluator.Eval(program, env)
-    
-    def typeObject(self, obj : object.Object, expected : any, typeObject : any):
-        self.checkInstanceOf(obj, typeObject)
-        self.checkValue(obj.value, expected)
-
     def testBangOperator(self):
         @dataclass
         class TestCase:
@@ -165,6 +198,12 @@ class TestEvaluator(unittest.TestCase):
             TestCase('{"name":"Monkey"}[fn(x){x}];', "unusable as hash key: FUNCTION"),
             TestCase('let a = 10; a = 20; b = 30;', "Can't assign value before declaration"),
             TestCase("class{ let x = 2; return;}", "in class declaration there must be only Let statements"),
+            TestCase("let f = fn() { 1 + true; 2 }; while (true) { f(); break; }", "type mismatch: INTEGER + BOOLEAN"),
+            TestCase("[1, foo, 3]", "identifier not found: foo"),
+            TestCase("let f = fn(a) { a }; f(1, 2)", "wrong number of parametrs: wanted 1, got 2"),
+            TestCase("let a = 1; a(1)", "not a function: INTEGER"),
+            TestCase("break;", "Can't use break outside a loop"),
+            TestCase("let f = fn() { continue; }; for (;;) { f(); }", "Can't use continue outside a loop"),
         ]
 
         for elem in tests:
@@ -309,6 +348,12 @@ class TestEvaluator(unittest.TestCase):
         self.assertEqual(t3.hashKey(), t4.hashKey(),    "strings with same content have different hash keys")
         self.assertNotEqual(t1.hashKey(), t3.hashKey(), "strings with different content have same hash keys")
 
+        # non ascii strings, and strings against the keys of integers and booleans
+        self.assertEqual(object.String("café").hashKey(), object.String("café").hashKey())
+        self.assertNotEqual(object.String("").hashKey(), object.Integer(0).hashKey())
+        self.assertNotEqual(object.String("").hashKey(), object.FALSE.hashKey())
+        self.assertNotEqual(object.String("1").hashKey(), object.Integer(1).hashKey())
+
     def testHashLiteral(self):
         input = """
             let two = "two";
@@ -356,6 +401,14 @@ class TestEvaluator(unittest.TestCase):
             TestCase('{5: 5}[5]', 5),
             TestCase('{true: 5}[true]', 5),
             TestCase('{false: 5}[false]', 5),
+            TestCase('let h = {"été": 1, "€": 2}; h["€"] + h["é" + "té"]', 3),
+            TestCase('let h = {"": 1, 0: 2}; h[""] * 10 + h[0]', 12),
+            TestCase('let h = {"": 1, false: 3}; h[""] * 10 + h[false]', 13),
+            TestCase('let h = {0: 2, "": 1}; h[""] * 10 + h[0]', 12),
+            TestCase('let e = ""; let z = 0; let h = {z: 2, e: 1}; h[e] * 10 + h[z]', 12),
+            TestCase('let h = {"1": 1, 1: 2}; h["1"] * 10 + h[1]', 12),
+            TestCase('{0: 2}[""]', None),
+            TestCase('{"": 2}[false]', None),
         ]
 
         for elem in tests:
@@ -397,6 +450,45 @@ class TestEvaluator(unittest.TestCase):
         for elem in tests:
             self.typeObject(self.eval(elem.input), elem.expected, object.Integer)
 
+    def testCompoundAssignStatements(self):
+        @dataclass
+        class TestCase:
+            input       : str
+            expected    : any
+
+        counter = "let C = class { let n = 0; let inc = fn() { n++; n }; }; let o = C(); "
+        tests = [
+            TestCase("let x = 1; x += 2; x *= 5; x -= 3; x", 12),
+            TestCase("let x = 17; x %= 5; x /= 2; x", 1),
+            TestCase("let x = 1; x++; x++; --x; ++x; x", 3),
+            TestCase('let s = "a"; s += "b"; s', "ab"),
+            TestCase("let x = 1; let f = fn() { x += 10; }; f(); f(); x", 21),
+            TestCase("let x = 1; if (true) { x += 1; let x = 5; x += 1; }; x", 2),
+            TestCase("let a = [1, 2, 3]; a[1] += 10; a[0]--; ++a[2]; a[0] + a[1] + a[2]", 16),
+            TestCase("let a = [[1], [2]]; let i = 0; a[i + 1][0] *= 7; a[1][0]", 14),
+            TestCase(counter + "o.n += 5; o.inc(); o.n++; o.n", 7),
+            TestCase(counter + "let p = C(); o.n++; p.inc(); p.inc(); o.n * 10 + p.n", 12),
+            TestCase("let t = 0; for (let i = 0; i < 5; i++) { t += i; }; t", 10),
+            TestCase("let t = 0; for (let i = 0; i < 10; i += 3) { t += i; }; t", 18),
+            TestCase("let t = 0; for (let i = 0; i < 10; i++) { i += 1; t++; }; t", 5),
+            TestCase("x += 1", "Can't assign value before declaration"),
+            TestCase("let a = [1]; a[1] += 1", "index out of range"),
+            TestCase('let h = {"a": 1}; h["a"] += 1', "index assignment not supported: HASH[STRING]"),
+            TestCase('let x = "a"; x -= 1', "type mismatch: STRING - INTEGER"),
+            TestCase("let o = 1; o.f += 1", "Can't find object o"),
+            TestCase(counter + "o.m += 1", "Can't find instance m"),
+        ]
+
+        for elem in tests:
+            evaluated = self.eval(elem.input)
+            if isinstance(elem.expected, int):
+                self.typeObject(evaluated, elem.expected, object.Integer)
+            elif elem.expected == "ab":
+                self.typeObject(evaluated, elem.expected, object.String)
+            else:
+                self.checkInstanceOf(evaluated, object.Error)
+                self.assertEqual(evaluated.message, elem.expected)
+
     def testBreakContinueStatements(self):
         @dataclass
         class TestCase:
@@ -436,6 +528,17 @@ class TestEvaluator(unittest.TestCase):
 
                 result;
             """, 50),
+            TestCase("""
+                let f = fn() {
+                    for (let i = 0; ; i = i + 1) {
+                        while (true) {
+                            if (i == 3) { return i * 10; }
+                            break;
+                        }
+                    }
+                };
+                f();
+            """, 30),
         ]
 
         for elem in tests:
@@ -465,6 +568,50 @@ class TestEvaluator(unittest.TestCase):
                 for(let a = 1; a < 40; a = a + 1){}
                 a;
             """, 50),
+            TestCase("""
+                let r = 0;
+                for(let i = 0; i <= 10; i = i + 2){
+                    if (i == 4) { continue; }
+                    if (i == 8) { break; }
+                    r = r + i;
+                }
+                r;
+            """, 8),
+            TestCase("""
+                let r = 0;
+                for(let i = 0; i < 10; i = i + 1){
+                    i = i + 2;
+                    r = r + 1;
+                }
+                r;
+            """, 4),
+            TestCase("""
+                let arr = [1];
+                let fs = [];
+                for(let i = 0; i < len(arr); i = i + 1){
+                    if (len(arr) < 5) { push(arr, i); }
+                    push(fs, fn() { i });
+                }
+                len(arr) * 10 + fs[0]();
+            """, 55),
+            TestCase("""
+                let n = 3;
+                let r = 0;
+                let shrink = fn() { n = n - 1; };
+                for(let i = 0; i < n; i = i + 1){
+                    shrink();
+                    r = r + 1;
+                }
+                r;
+            """, 2),
+            TestCase("""
+                let r = 0;
+                for(let i = 0; i < 3; i = i + 1){
+                    let i = 5;
+                    r = r + 1;
+                }
+                r;
+            """, 1),
         ]
 
         for elem in tests:
@@ -474,6 +621,28 @@ class TestEvaluator(unittest.TestCase):
             else:
                 self.nullObject(evaluated)
 
+    def testClosures(self):
+        @dataclass
+        class TestCase:
+            input       : str
+            expected    : any
+
+        tests = [
+            TestCase("let newAdder = fn(x) { fn(y) { x + y } }; let addTwo = newAdder(2); addTwo(3);", 5),
+            TestCase("let newCounter = fn() { let n = 0; fn() { n = n + 1; n } }; let c = newCounter(); c(); c(); c();", 3),
+            TestCase("let x = 1; let f = fn() { x }; let g = fn() { let x = 2; f() }; g();", 1),
+            TestCase("let fs = []; for (let i = 0; i < 3; i = i + 1) { if (true) { let j = i; push(fs, fn() { j }); } }; fs[0]() + fs[2]();", 2),
+            TestCase("let g = fn() { y }; let f = fn() { let y = 5; g() }; f();", "identifier not found: y"),
+        ]
+
+        for elem in tests:
+            evaluated = self.eval(elem.input)
+            if isinstance(elem.expected, int):
+                self.typeObject(evaluated, elem.expected, object.Integer)
+            else:
+                self.checkInstanceOf(evaluated, object.Error)
+                self.assertEqual(evaluated.message, elem.expected)
+
     def testClassLiteralObject(self):
         input = "let A = class{ let x = 2; let func = fn(){return x;}; }; A;"
 
@@ -487,14 +656,262 @@ class TestEvaluator(unittest.TestCase):
         self.assertEqual(evaluated.body.string(), expectBody,
             "parameters is not {}. got={}".format(expectBody, evaluated.body.string()))
 
-# -------------------- NO TEST ----------------------------------
+    def testLogicalOperators(self):
+        @dataclass
+        class TestCase:
+            input       : str
+            expected    : any
+
+        calls = "let n = 0; let f = fn(x) { n = n * 10 + x; true }; "
+        tests = [
+            TestCase("false && y", False),
+            TestCase("true || y", True),
+            TestCase("false and y", False),
+            TestCase("true or y", True),
+            TestCase("true && y", "identifier not found: y"),
+            TestCase("false || y", "identifier not found: y"),
+            TestCase("true && false", False),
+            TestCase("false or true", True),
+            TestCase(calls + "false && f(1); true || f(2); f(3) && f(4); false or f(5); n", 345),
+            TestCase("let arr = [1, 2]; let i = 2; i < len(arr) && arr[i] == 2", False),
+            TestCase("let arr = [1, 2]; let i = 1; i < len(arr) && arr[i] == 2", True),
+            TestCase("true && 1 + 1 == 2 || y", True),
+        ]
 
-    def nullObject(self, evaluated : object.Object):
-        self.assertEqual(evaluated, object.NULL, "object is not NULL")
+        for elem in tests:
+            evaluated = self.eval(elem.input)
+            if isinstance(elem.expected, bool):
+                self.typeObject(evaluated, elem.expected, object.Boolean)
+            elif isinstance(elem.expected, int):
+                self.typeObject(evaluated, elem.expected, object.Integer)
+            else:
+                self.checkInstanceOf(evaluated, object.Error)
+                self.assertEqual(evaluated.message, elem.expected)
 
-    def checkInstanceOf(self, stt, className):    
-        self.assertTrue(isinstance(stt, className),
-                "stt not an instance of {}. Got {}".format(className.__name__, stt.__class__.__name__))
-    def checkValue(self, got : any, wanted : any):
-        self.assertEqual(got, wanted,
-                "object has wrong value. got={}, want={}".format(got, wanted))
+    def testClassInstances(self):
+        @dataclass
+        class TestCase:
+            input       : str
+            expected    : int
+
+        counter = "let C = class { let n = 0; let inc = fn() { n = n + 1; n }; let get = fn() { n }; }; "
+        tests = [
+            TestCase(counter + "let a = C(); let b = C(); a.inc(); a.inc(); b.inc(); a.get() * 10 + b.get();", 21),
+            TestCase(counter + "let a = C(); let a.n = 5; let b = C(); a.inc() * 10 + b.get();", 60),
+            TestCase(counter + "let a = C(); a.inc(); let b = C(); b.n;", 0),
+            TestCase("let C = class { let xs = []; let add = fn(x) { push(xs, x); len(xs) }; }; let a = C(); let b = C(); a.add(1); a.add(2); b.add(3);", 1),
+            TestCase("let C = class { let xs = [[]]; let add = fn(x) { push(xs[0], x); len(xs[0]) }; }; let a = C(); a.add(1); a.add(2); let b = C(); b.add(3);", 1),
+            TestCase("let C = class { let fs = [fn() { n }]; let n = 1; }; let a = C(); let a.n = 7; let f = a.fs; f[0]();", 7),
+            TestCase("let A = class { let x = 1; let y = 2; let f = fn() { y }; }; let B = class { let y = 3; let f = fn() { y * 2 }; }; let g = fn(o) { o.y * 10 + o.f() }; g(A()) * 100 + g(B()) + g(A());", 2258),
+            TestCase("let C = class { let n = 1; let get = fn() { n }; let twice = fn() { get() * 2 }; }; let a = C(); let a.n = 4; a.twice();", 8),
+            TestCase(counter + "let a = C(); let f = a.inc; let b = C(); f(); f(); a.get() * 10 + b.get();", 20),
+            TestCase("let D = class { let C = class { let n = 0; let inc = fn() { n = n + 1; n }; }; let c = C(); }; let d = D(); let e = D(); let c = d.c; c.inc(); let x = e.c; x.inc(); x.inc() * 10 + c.inc();", 22),
+        ]
+
+        for elem in tests:
+            self.typeObject(self.eval(elem.input), elem.expected, object.Integer)
+
+    def testTailCalls(self):
+        @dataclass
+        class TestCase:
+            input       : str
+            expected    : int
+
+        tests = [
+            TestCase("let sum = fn(n, acc) { if (n == 0) { return acc; } return sum(n - 1, acc + n); }; sum(100, 0);", 5050),
+            TestCase("let even = fn(n) { if (n == 0) { return 1; } return odd(n - 1); }; let odd = fn(n) { if (n == 0) { return 0; } return even(n - 1); }; even(51);", 0),
+            TestCase("let make = fn(y) { fn() { y } }; let f = fn(g) { return g(); }; f(make(5));", 5),
+            TestCase("let f = fn() { return len([1, 2]); }; f();", 2),
+            TestCase("return fn(x) { x + 1 }(1);", 2),
+        ]
+
+        for elem in tests:
+            evaluated = self.eval(elem.input)
+            self.typeObject(evaluated, elem.expected, object.Integer)
+
+    # calls in tail position don't use the python stack
+    def testDeepTailRecursion(self):
+        @dataclass
+        class TestCase:
+            input       : str
+            expected    : int
+
+        tests = [
+            TestCase("let count = fn(n, acc) { if (n == 0) { return acc; } return count(n - 1, acc + 1); }; count(3000, 0);", 3000),
+            TestCase("let even = fn(n) { if (n == 0) { return 1; } return odd(n - 1); }; let odd = fn(n) { if (n == 0) { return 0; } return even(n - 1); }; even(3001);", 0),
+            TestCase("let count = fn(n) { while (true) { if (n == 0) { return 7; } return count(n - 1); } }; count(3000);", 7),
+        ]
+
+        for elem in tests:
+            evaluated = self.eval(elem.input)
+            self.typeObject(evaluated, elem.expected, object.Integer)
+
+    # a name bound to the value of a statement (None) is bound all the same
+    def testStatementValueBindings(self):
+        @dataclass
+        class TestCase:
+            input       : str
+            expected    : int
+
+        tests = [
+            TestCase("let f = fn() { let a = 1; }; let r = f(); r = 5; r;", 5),
+            TestCase("let f = fn() { let a = 1; }; let r = f(); r = 5; printl(r); r;", 5),
+            TestCase("let f = fn() { let a = 1; }; let g = fn() { let r = f(); r = 5; r }; g();", 5),
+            TestCase("let f = fn() { let a = 1; }; let r = f(); let h = fn() { r = 6; r }; h();", 6),
+            TestCase("let f = fn() { let a = 1; }; let r = 2; let g = fn() { let r = f(); r = 7; }; g(); r;", 2),
+        ]
+
+        for elem in tests:
+            with contextlib.redirect_stdout(io.StringIO()):
+                evaluated = self.eval(elem.input)
+            self.typeObject(evaluated, elem.expected, object.Integer)
+
+
+# class instances share the methods of the class until they read them
+class TestInstances(unittest.TestCase):
+    def testMethodsBoundWhenRead(self):
+        program = parser.Parser(lexer.Lexer("class { let n = 1; let get = fn() { n }; }")).parseProgram()
+        cls = evaluator.Eval(program, object.Environment())
+        slot = cls.env.names["get"]
+        a, b = cls.instance(), cls.instance()
+        self.assertIs(a.env.values[slot], cls.env.values[slot])
+
+        get, _ = a.env.get("get")
+        self.assertIs(get.env, a.env)
+        self.assertIs(a.env.values[slot], get)
+        self.assertIs(a.env.get("get")[0], get)
+        self.assertIs(b.env.values[slot], cls.env.values[slot])
+
+        # the calls of the methods of every instance count for the jit
+        evaluator.applyFunction(get, [])
+        evaluator.applyFunction(b.env.get("get")[0], [])
+        self.assertEqual(get.body.calls, 2)
+
+# handlers of the node classes in the dispatch table of Eval
+class TestDispatch(unittest.TestCase):
+    def tearDown(self):
+        evaluator.register(ast.IntegerLiteral, evaluator.evalIntegerLiteral)
+        evaluator.evaluators.pop(Custom, None)
+
+    def testRegister(self):
+        evaluator.register(Custom, lambda node, env: object.String("custom"))
+        self.assertEqual(evaluator.Eval(Custom(None), object.Environment()).value, "custom")
+
+    def testSubclassUsesBaseHandler(self):
+        node = Literal(None, 3)
+        self.assertEqual(evaluator.Eval(node, object.Environment()).value, 3)
+
+        # the cached handler follows a new registration of the base class
+        evaluator.register(ast.IntegerLiteral, lambda node, env: object.Integer(node.value * 2))
+        self.assertEqual(evaluator.Eval(node, object.Environment()).value, 6)
+
+    def testUnknownNode(self):
+        self.assertIsNone(evaluator.Eval(ast.Expression(), object.Environment()))
+
+class Custom(ast.Expression):
+    def __init__(self, token):
+        self.token = token
+
+class Literal(ast.IntegerLiteral):
+    pass
+
+# specialized operations installed on infix and index nodes
+class TestQuickening(unittest.TestCase):
+    def testQuickenAndDeoptimize(self):
+        program = parser.Parser(lexer.Lexer("let f = fn(a, b) { a < b }; f")).parseProgram()
+        env = object.Environment()
+        f = evaluator.Eval(program, env)
+        node = f.body.statements[0].expression
+
+        for _ in range(evaluator.QUICKEN_THRESHOLD):
+            self.assertIs(evaluator.applyFunction(f, [object.Integer(1), object.Integer(2)]), object.TRUE)
+        self.assertIsNotNone(node.quick)
+        self.assertIs(evaluator.applyFunction(f, [object.Integer(3), object.Integer(2)]), object.FALSE)
+
+        # other operand classes: generic operation
+        with self.assertRaises(evaluator.Abort) as abort:
+            evaluator.applyFunction(f, [object.String("a"), object.String("b")])
+        self.assertIsNone(node.quick)
+        self.assertEqual(abort.exception.value.message, "unknown operator: STRING < STRING")
+
+    def testQuickenedLoop(self):
+        input = """
+            let _array = [1, 2, 3, 4, 5, 6, 7, 8, 9, 10];
+            let h = {"a": 1};
+            let sum = 0;
+            for (let i = 0; i < len(_array); i = i + 1) {
+                sum = sum + _array[i] * h["a"];
+            }
+            sum + _array[20]
+        """
+        program = parser.Parser(lexer.Lexer(input)).parseProgram()
+        evaluated = evaluator.Eval(program, object.Environment())
+        self.assertEqual(evaluated.message, "type mismatch: INTEGER + NULL")
+
+        loop = program.statements[3].expression
+        self.assertIsNotNone(loop.condition.expression.quick)
+        self.assertIsNotNone(loop.block.statements[0].value.right.left.quick)
+
+class TestMemberCache(unittest.TestCase):
+    def testCachedShape(self):
+        input = """
+            let A = class { let x = 1; let y = 2; let get = fn() { y }; };
+            let B = class { let y = 3; let get = fn() { y }; };
+            let read = fn(o) { o.y + o.get() };
+            read(A()) + read(A());
+        """
+        program = parser.Parser(lexer.Lexer(input)).parseProgram()
+        env = object.Environment()
+        self.assertEqual(evaluator.Eval(program, env).value, 8)
+
+        field = program.statements[2].value.body.statements[0].expression.left
+        method = program.statements[2].value.body.statements[0].expression.right
+        a = evaluator.Eval(parser.Parser(lexer.Lexer("A()")).parseProgram(), env)
+        self.assertIs(field.member.shape, a.env.names)
+        self.assertIs(method.member.shape, a.env.names)
+        self.assertEqual(field.member.slot, 1)
+
+        # instances of another class: the site follows the new shape
+        read, _ = env.get("read")
+        self.assertEqual(evaluator.applyFunction(read, [evaluator.Eval(parser.Parser(lexer.Lexer("B()")).parseProgram(), env)]).value, 6)
+        self.assertEqual(field.member.slot, 0)
+
+    def testBuiltinMethod(self):
+        # not a member: looked up in the instance environment
+        input = "let A = class { let x = [1]; }; let a = A(); a.len(a.x)"
+        self.assertEqual(evaluator.Eval(parser.Parser(lexer.Lexer(input)).parseProgram(), object.Environment()).value, 1)
+
+# small integers and literals evaluate to shared objects
+class TestInterning(unittest.TestCase):
+    def eval(self, input : str) -> object.Object:
+        return evaluator.Eval(parser.Parser(lexer.Lexer(input)).parseProgram(), object.Environment())
+
+    def testSmallIntegers(self):
+        self.assertIs(self.eval("1 + 2"), object.integer(3))
+        self.assertIs(self.eval("len([1, 2])"), object.integer(2))
+        self.assertIs(self.eval("-5"), object.integer(-5))
+        self.assertIsNot(self.eval("1000 + 1"), self.eval("1000 + 1"))
+        self.assertIsNot(object.integer(1.0), object.integer(1))
+
+    def testIntBuiltinKeepsCacheIntact(self):
+        self.assertIs(self.eval('int("7")'), object.integer(7))
+        self.assertEqual(self.eval('int("2.5")').value, 2.5)
+        self.assertEqual(self.eval('let a = int("7"); let b = int("8"); a + 0').value, 7)
+        self.assertEqual(object.integer(7).value, 7)
+
+    def testLiteralConstants(self):
+        program = parser.Parser(lexer.Lexer('"a"; 1000')).parseProgram()
+        string = program.statements[0].expression
+        number = program.statements[1].expression
+        env = object.Environment()
+        self.assertIs(evaluator.Eval(string, env), evaluator.Eval(string, env))
+        self.assertIs(evaluator.Eval(number, env), evaluator.Eval(number, env))
+
+    def testCacheRange(self):
+        low, high = object.SMALL_INT_MIN, object.SMALL_INT_MAX
+        try:
+            object.cacheSmallIntegers(0, 1000)
+            self.assertIs(self.eval("999 + 1"), object.integer(1000))
+            self.assertIsNot(self.eval("0 - 1"), self.eval("0 - 1"))
+        finally:
+            object.cacheSmallIntegers(low, high)
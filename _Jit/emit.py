@@ -0,0 +1,158 @@
+from typing import Callable, List, Tuple
+import _Ast.ast as ast
+import _Object.object as object
+import _Evaluator.evaluator as evaluator
+import _Resolver.resolver as resolver
+import _Token.token as token
+import _Jit.jit as jit
+from _Optimizer.nodes import children
+
+# Emitter: the whole program compiled ahead of time to the source of a
+# python module, with the translation of the jit (see jit.py). The module
+# runs the program without lexing, parsing nor evaluating a tree: it only
+# imports the objects, builtins and operations of Eval, so it needs the
+# YAMI directory in the python path.
+#
+#   def f1(env, p0): ...      one python function per function literal
+#   def program(env): ...     the statements of the program
+#   k0 = integer(1)           the constants they use
+#
+# A function literal evaluates to an object.Function whose body holds its
+# python function already compiled: applyFunction runs it as it runs the
+# jit, and classes bind methods to their instances as usual. The program,
+# and the functions defining functions, have their scopes in environments
+# (the ones the functions created in them keep), the other functions in
+# python locals.
+class Emitter:
+    def __init__(self):
+        self.constants = {}
+        self.definitions = []
+        self.functions = 0
+
+    # constants of the parameters and body of node, whose python function
+    # is defined in the module
+    def function(self, node : ast.FunctionLiteral) -> Tuple[str, str]:
+        self.functions += 1
+        name = "f{}".format(self.functions)
+        source = None
+        if not definesFunctions(node.body):
+            source = self.attempt(node.parameters, node.body, name)
+        if source is None:
+            source = jit.Translator(node.parameters, node.body, True, self.function, self.constants).translate(name)
+        self.definitions.append(source)
+        parameters = self.constant(node.parameters)
+        # the body refers to its function by name, until the module defines it
+        return parameters, self.constant(CompiledBody(node.body.string(), name))
+
+    # source of the function in python locals, None if it can't be
+    # translated so (nothing it added is kept)
+    def attempt(self, parameters : List[ast.Identifier], body : ast.BlockStatement, name : str) -> str:
+        constants, definitions, functions = dict(self.constants), len(self.definitions), self.functions
+        try:
+            return jit.Translator(parameters, body, False, self.function, self.constants).translate(name)
+        except jit.Unsupported:
+            self.constants.clear()
+            self.constants.update(constants)
+            del self.definitions[definitions:]
+            self.functions = functions
+            return None
+
+    def constant(self, value) -> str:
+        name = "k{}".format(len(self.constants))
+        self.constants[name] = value
+        return name
+
+    def emit(self, program : ast.Program, path : str) -> str:
+        main = jit.Translator([], program, True, self.function, self.constants).translate("program")
+        lines = [
+            "# {} compiled to python by monkey.py --emit-python".format(path),
+            "# (needs the YAMI directory in the python path)",
+            "from _Ast.ast import InfixExpression, IndexExpression, CompoundAssignStatement",
+            "from _Jit.jit import runtime",
+            "from _Jit.emit import CompiledBody, parameters, start",
+            "globals().update(runtime())",
+            "",
+        ]
+        for definition in self.definitions + [main]:
+            lines += [definition, ""]
+        for name, value in self.constants.items():
+            lines.append("{} = {}".format(name, literal(value)))
+        lines += ["", "if __name__ == \"__main__\":", "    start(program)", ""]
+        return "\n".join(lines)
+
+# body of a function compiled ahead of time: the python function of its
+# statements, and their source to print the function
+class CompiledBody(ast.BlockStatement):
+    __slots__ = ("source",)
+    def __init__(self, source : str, compiled : Callable):
+        super().__init__(None, [])
+        self.source = source
+        self.jit = compiled
+
+    def string(self) -> str:
+        return self.source
+
+# parameters of a function of the module
+def parameters(names : List[str]) -> List[ast.Identifier]:
+    return [ast.Identifier(token.Token(token.IDENT, name), name) for name in names]
+
+# python source of a constant of the module
+def literal(value) -> str:
+    if value.__class__ is object.Integer:
+        return "integer({!r})".format(value.value)
+    if value.__class__ is object.String:
+        return "String({!r})".format(value.value)
+    if value.__class__ is object.MemberCache:
+        return "MemberCache({!r})".format(value.name)
+    if value.__class__ is CompiledBody:
+        return "CompiledBody({!r}, {})".format(value.source, value.jit)
+    # the body of a class, only printed
+    if value.__class__ is ast.BlockStatement:
+        return "CompiledBody({!r}, None)".format(value.string())
+    if value.__class__ is list:
+        return "parameters({!r})".format([param.value for param in value])
+    # the node of an operation, for its type feedback
+    if value.__class__ is ast.InfixExpression:
+        return "InfixExpression(None, None, {!r})".format(value.operator)
+    if value.__class__ is ast.CompoundAssignStatement:
+        return "CompoundAssignStatement(None, None, {!r})".format(value.operator)
+    if value.__class__ is ast.IndexExpression:
+        return "IndexExpression(None)"
+    raise ValueError("no literal for {}".format(value.__class__.__name__))
+
+# whether body creates functions that keep its scopes (not the methods of
+# a class, which keep the environment of the class)
+def definesFunctions(body : ast.BlockStatement) -> bool:
+    work = list(body.statements)
+    while work:
+        node = work.pop()
+        if node is None or node.__class__ is ast.Classliteral:
+            continue
+        if node.__class__ is ast.FunctionLiteral:
+            return True
+        work += children(node)
+    return False
+
+# source of the python module running program (read from path)
+def emitPython(program : ast.Program, path : str = "program") -> str:
+    # the resolver marks the break and continue outside of loops
+    resolver.resolve(program, object.Environment())
+    return Emitter().emit(program, path)
+
+# value of the program whose python function is program, as Eval gives it
+def run(program : Callable) -> object.Object:
+    try:
+        result = program(object.Environment())
+        if isinstance(result, object.TailCall):
+            result = evaluator.applyFunction(result.fn, result.args)
+    except evaluator.Abort as abort:
+        return abort.value
+    return result
+
+# run program, printing its value as the file backend does
+def start(program : Callable):
+    evaluated = run(program)
+    if evaluated is not None:
+        res = evaluated.inspect()
+        if res != "null":
+            print(res)
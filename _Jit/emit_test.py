@@ -0,0 +1,79 @@
+import glob
+import os
+import subprocess
+import sys
+import tempfile
+import unittest
+import _Lexer.lexer as lexer
+import _Parser.parser as parser
+import _Object.object as object
+import _Evaluator.evaluator as evaluator
+import _Jit.emit as emit
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+def parse(input : str):
+    l = lexer.Lexer(input)
+    p = parser.Parser(l)
+    return p.parseProgram()
+
+# namespace of the python module emitted for input
+def load(input : str):
+    namespace = {"__name__": "emitted"}
+    exec(compile(emit.emitPython(parse(input)), "<emitted>", "exec"), namespace)
+    return namespace
+
+class TestEmit(unittest.TestCase):
+    def testFunctions(self):
+        input = """
+            let add = fn(x, y) { x + y };
+            let adder = fn(x) { let n = x; fn(y) { add(n, y) } };
+            adder(1)
+        """
+        result = emit.run(load(input)["program"])
+        self.assertEqual(result.inspect(), evaluator.Eval(parse(input), object.Environment()).inspect())
+        self.assertTrue(callable(result.body.jit))
+        self.assertEqual(evaluator.applyFunction(result, [object.integer(2)]).value, 3)
+
+        # adder keeps its scope in an environment, the others in python locals
+        source = emit.emitPython(parse(input))
+        functions = {definition.split("(")[0]: definition for definition in source.split("\ndef ")[1:]}
+        self.assertEqual({name for name, definition in functions.items() if "Environment(env)" in definition}, {"f2"})
+
+    def testReturns(self):
+        source = emit.emitPython(parse("let f = fn(x) { return x; }; let g = fn(x) { if (x) { return 1; } 2 }; f(g(true))"))
+        # no return after the one ending a function
+        self.assertNotIn("return None", source)
+        self.assertEqual(emit.run(load("let f = fn() { let a = 1; }; f()")["program"]), None)
+
+    def testPrograms(self):
+        for path in sorted(glob.glob(os.path.join(ROOT, "_Test", "*.mon"))):
+            with open(path, encoding="utf-8") as f:
+                source = f.read()
+            run = dict(cwd=ROOT, input="d\ns\nq\n", capture_output=True, text=True, timeout=60,
+                       env=dict(os.environ, PYTHONPATH=ROOT))
+            expected = subprocess.run([sys.executable, "monkey.py", "--no-cache", os.path.relpath(path, ROOT)], **run)
+            with tempfile.NamedTemporaryFile("w", suffix=".py", delete=False) as module:
+                module.write(emit.emitPython(parse(source), path))
+            try:
+                got = subprocess.run([sys.executable, module.name], **run)
+            finally:
+                os.unlink(module.name)
+            self.assertEqual(got.stdout, expected.stdout, path)
+            self.assertEqual(got.stderr, "", path)
+
+    def testErrors(self):
+        with tempfile.NamedTemporaryFile("w", suffix=".mon", dir=ROOT, delete=False) as script:
+            script.write("let = 1;")
+        try:
+            got = subprocess.run([sys.executable, "monkey.py", "--no-cache", "--emit-python", os.path.basename(script.name)],
+                                 cwd=ROOT, capture_output=True, text=True, timeout=60)
+        finally:
+            os.unlink(script.name)
+        # parser errors give no module
+        self.assertEqual(got.returncode, 1)
+        self.assertEqual(got.stdout, "")
+        self.assertNotEqual(got.stderr, "")
+
+if __name__ == "__main__":
+    unittest.main()
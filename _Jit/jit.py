@@ -0,0 +1,730 @@
+from typing import Callable, Dict, List, Set, Tuple
+import _Ast.ast as ast
+import _Object.object as object
+import _Evaluator.builtins as builtins
+import _Evaluator.evaluator as evaluator
+from _Evaluator.utils import newError
+from _Resolver.resolver import GLOBAL, FUNCTION, BLOCK, LOOP, CLASS, letNames
+
+# Jit: the body of a function Eval calls often (see evaluator.JIT_THRESHOLD)
+# is translated, once, to the source of a python function, compiled with
+# compile(), and run instead of Eval by the next calls of the function:
+#
+#   compiled(env, *args) -> object
+#
+# where env is the environment the function was created in. The function
+# still computes on the objects of Eval, with the same operations: a binding
+# of the body is a python local, integer operators are inlined for Integer
+# operands, everything else calls the functions of Eval, so the results
+# (floats of /, NULL, the values of statements, exit()) and the error
+# messages don't change. Errors are raised as evaluator.Abort, a call in a
+# return is given back to applyFunction as a TailCall.
+#
+# A body defining functions, or reading a name in a loop before its let, is
+# left to Eval.
+#
+# The same translation compiles whole programs ahead of time (see emit.py):
+# there the scopes of a program or function that defines functions are
+# boxed, i.e. they are environments, as in Eval, which the functions
+# created in them keep.
+
+# a construct the translation doesn't handle
+class Unsupported(Exception):
+    pass
+
+# exit() gave the value of a statement in an if or loop used as a value:
+# the blocks up to it stop, and it has that value
+class Exited(Exception):
+    pass
+
+# scope of the body: the python locals of the names bound so far, or the
+# python variable of its environment if it is boxed
+class Scope:
+    def __init__(self, kind : str, names : Set[str] = None, env : str = None):
+        self.kind = kind
+        self.locals = {}
+        # names bound by lets of a loop scope, which keep the value of the
+        # previous iteration before their let
+        self.names = names if names is not None else set()
+        self.env = env
+
+# loop being translated: the local of its value, if it's used, and the
+# update a continue runs, in the scopes up to depth
+class Loop:
+    def __init__(self, result : str, update : ast.Statement, depth : int):
+        self.result = result
+        self.update = update
+        self.depth = depth
+
+# operators with an inlined version for two Integer operands
+ARITHMETIC = {"+", "-", "*", "/", "%"}
+COMPARISON = {"<", ">", "<=", ">=", "==", "!="}
+
+class Translator:
+    # functions gives the constants of the parameters and body of a function
+    # literal (see emit.py), constants is shared by the translators of a module
+    def __init__(self, parameters : List[ast.Identifier], body : ast.Node, boxed : bool = False,
+                 functions : Callable = None, constants : Dict = None):
+        self.parameters = parameters
+        self.body = body
+        self.boxed = boxed
+        self.functions = functions
+        self.lines = []
+        self.depth = 1
+        self.constants = {} if constants is None else constants
+        self.temporaries = 0
+        self.bindings = 0
+        self.scopes = []
+        self.loops = []
+        # what a statement whose value is exit() runs
+        self.exits = ["return EXIT"]
+
+    def emit(self, line : str):
+        self.lines.append("    " * self.depth + line)
+
+    def temporary(self) -> str:
+        self.temporaries += 1
+        return "t{}".format(self.temporaries)
+
+    def binding(self) -> str:
+        self.bindings += 1
+        return "v{}".format(self.bindings)
+
+    def constant(self, value) -> str:
+        name = "k{}".format(len(self.constants))
+        self.constants[name] = value
+        return name
+
+    # source of the python function
+    def translate(self, name : str = "compiled") -> str:
+        params = ["p{}".format(idx) for idx in range(len(self.parameters))]
+        if isinstance(self.body, ast.Program):
+            scope = Scope(GLOBAL, env="env")
+        elif not self.boxed:
+            scope = Scope(FUNCTION)
+            for param, local in zip(self.parameters, params):
+                scope.locals[param.value] = local
+        elif params or letNames(self.body.statements):
+            scope = Scope(FUNCTION, env=self.binding())
+            self.emit("{} = Environment(env)".format(scope.env))
+            for param, local in zip(self.parameters, params):
+                self.emit("{}.set({!r}, {}, True)".format(scope.env, param.value, local))
+        else:
+            scope = Scope(FUNCTION, env="env")
+        self.scopes.append(scope)
+        self.statements(self.body.statements, "return")
+        # statements ending with a return need no other
+        if not self.lines or not self.lines[-1].startswith("    return "):
+            self.emit("return None")
+        return "def {}(env{}):\n".format(name, "".join(", " + p for p in params)) + "\n".join(self.lines)
+
+    # open a python block: lines emitted until close are indented
+    def open(self, line : str):
+        self.emit(line)
+        self.depth += 1
+        return len(self.lines)
+
+    def close(self, start : int):
+        if len(self.lines) == start:
+            self.emit("pass")
+        self.depth -= 1
+
+    # give value (a python expression) to the destination of a statement:
+    # None to drop it, "return" for the value of the function, else a local
+    def give(self, destination : str, value : str):
+        if destination == "return":
+            self.emit("return " + value)
+        elif destination is not None:
+            self.emit("{} = {}".format(destination, value))
+
+    def statements(self, statements : List[ast.Statement], destination : str):
+        for statement in statements[:-1]:
+            self.statement(statement, None)
+        if statements:
+            self.statement(statements[-1], destination)
+        else:
+            self.give(destination, "None")
+
+    def statement(self, node : ast.Statement, destination : str, exits : bool = True):
+        if node.__class__ is ast.ExpressionStatement:
+            expression = node.expression
+            if expression.__class__ is ast.IfExpression:
+                return self.ifStatement(expression, destination)
+            if expression.__class__ is ast.WhileExpression:
+                return self.whileStatement(expression, destination)
+            if expression.__class__ is ast.ForExpression:
+                return self.forStatement(expression, destination)
+            value = self.expression(expression)
+            # exit() stops the blocks up to the function
+            if exits and destination != "return" and (expression.__class__ in (ast.CallExpression, ast.Identifier, ast.IndexExpression)
+                                                      or isMember(expression)):
+                start = self.open("if {} is EXIT:".format(value))
+                self.emit(self.exits[-1])
+                self.close(start)
+            return self.give(destination, value)
+
+        if node.__class__ is ast.LetStatement:
+            value = self.expression(node.value)
+            scope = self.scopes[-1]
+            if node.instance is not None:
+                instance = self.read(node.name.value, len(self.scopes), soft=True)
+                self.emit("setMember({}, {!r}, {!r}, {})".format(instance, node.name.value, node.instance.value, value))
+            elif scope.env is not None:
+                self.emit("{}.set({!r}, {}, True)".format(scope.env, node.name.value, value))
+            else:
+                local = scope.locals.get(node.name.value)
+                if local is None:
+                    local = scope.locals[node.name.value] = self.binding()
+                self.emit("{} = {}".format(local, value))
+        elif node.__class__ is ast.AssignStatementClass:
+            # not evaluated by Eval either
+            pass
+        elif node.__class__ is ast.AssignStatement:
+            self.assign(node.name.value, self.expression(node.value), len(self.scopes))
+        elif node.__class__ is ast.CompoundAssignStatement:
+            self.compoundAssign(node)
+        elif node.__class__ is ast.ReturnStatement:
+            return self.returnStatement(node)
+        elif node.__class__ in (ast.BreakStatement, ast.ContinueStatement):
+            return self.jump(node)
+        else:
+            raise Unsupported(node.__class__.__name__)
+        self.give(destination, "None")
+
+    def returnStatement(self, node : ast.ReturnStatement):
+        if node.value is None:
+            self.emit("return " + self.constant(object.integer(0)))
+            return
+        if node.value.__class__ is not ast.CallExpression:
+            self.emit("return " + self.expression(node.value))
+            return
+        # return f(...): a function is called by applyFunction, without nesting
+        function = self.expression(node.value.function)
+        start = self.open("if isinstance({}, Class):".format(function))
+        self.emit("return {}.instance()".format(function))
+        self.close(start)
+        arguments = [self.expression(arg) for arg in node.value.arguments]
+        start = self.open("if isinstance({}, Function):".format(function))
+        self.emit("return TailCall({}, [{}])".format(function, ", ".join(arguments)))
+        self.close(start)
+        self.emit("return applyFunction({}, [{}])".format(function, ", ".join(arguments)))
+
+    def jump(self, node : ast.Statement):
+        if not self.loops:
+            if node.inLoop is not False:
+                raise Unsupported("break or continue outside of a loop")
+            self.emit("raise Abort(newError({!r}))".format(
+                "Can't use {} outside a loop".format("break" if node.__class__ is ast.BreakStatement else "continue")))
+            return
+        loop = self.loops[-1]
+        if loop.result is not None:
+            self.emit("{} = NULL".format(loop.result))
+        if node.__class__ is ast.BreakStatement:
+            self.emit("break")
+            return
+        if loop.update is not None:
+            scopes, self.scopes = self.scopes, self.scopes[:loop.depth]
+            self.statement(loop.update, None, exits=False)
+            self.scopes = scopes
+        self.emit("continue")
+
+    def ifStatement(self, node : ast.IfExpression, destination : str):
+        condition = self.condition(node.condition)
+        start = self.open("if {}:".format(condition))
+        self.block(BLOCK, node.consequence.statements, destination)
+        self.close(start)
+        if node.alternative is not None:
+            start = self.open("else:")
+            self.block(BLOCK, node.alternative.statements, destination)
+            self.close(start)
+        elif destination is not None:
+            start = self.open("else:")
+            self.give(destination, "NULL")
+            self.close(start)
+
+    # scope of a block binding names: a new environment, made here, if the
+    # enclosing scope is boxed
+    def scope(self, kind : str, names : Set[str]) -> Scope:
+        env = self.scopes[-1].env
+        if env is not None and names:
+            outer, env = env, self.binding()
+            self.emit("{} = Environment({})".format(env, outer))
+        return Scope(kind, names, env)
+
+    # statements run in a new scope
+    def block(self, kind : str, statements : List[ast.Statement], destination : str):
+        self.scopes.append(self.scope(kind, letNames(statements)))
+        self.statements(statements, destination)
+        self.scopes.pop()
+
+    def whileStatement(self, node : ast.WhileExpression, destination : str):
+        result = None if destination is None else self.temporary()
+        if result is not None:
+            self.emit("{} = NULL".format(result))
+        # the same scope for all the iterations
+        scope = self.scope(LOOP, letNames(node.block.statements))
+        start = self.open("while True:")
+        # the condition is evaluated in the enclosing scope
+        condition = self.condition(node.condition)
+        inner = self.open("if not {}:".format(condition))
+        self.emit("break")
+        self.close(inner)
+        self.scopes.append(scope)
+        self.loops.append(Loop(result, None, len(self.scopes)))
+        self.statements(node.block.statements, result)
+        self.loops.pop()
+        self.scopes.pop()
+        self.close(start)
+        if result is not None:
+            self.give(destination, result)
+
+    def forStatement(self, node : ast.ForExpression, destination : str):
+        scope = self.scope(LOOP, letNames(node.block.statements + [node.initial]))
+        self.scopes.append(scope)
+        if node.initial is not None:
+            self.statement(node.initial, None, exits=False)
+        result = None if destination is None else self.temporary()
+        if result is not None:
+            self.emit("{} = NULL".format(result))
+        start = self.open("while True:")
+        if node.condition is not None:
+            if node.condition.__class__ is not ast.ExpressionStatement:
+                raise Unsupported("condition of a for")
+            condition = self.condition(node.condition.expression)
+            inner = self.open("if not {}:".format(condition))
+            self.emit("break")
+            self.close(inner)
+        # the body runs in the scope of the loop
+        self.loops.append(Loop(result, node.update, len(self.scopes)))
+        self.statements(node.block.statements, result)
+        self.loops.pop()
+        if node.update is not None:
+            self.statement(node.update, None, exits=False)
+        self.close(start)
+        self.scopes.pop()
+        if result is not None:
+            self.give(destination, result)
+
+    # python expression of the binding of name, in the scopes up to depth;
+    # if soft, None when it is not bound (and builtins are not looked up)
+    def read(self, name : str, depth : int, soft : bool = False) -> str:
+        for idx in range(depth - 1, -1, -1):
+            scope = self.scopes[idx]
+            if scope.env is not None:
+                return self.lookup(scope.env, name, soft)
+            local = scope.locals.get(name)
+            if local is not None:
+                return local
+            if scope.kind == LOOP and name in scope.names:
+                raise Unsupported("{} read in a loop before its let".format(name))
+        return self.lookup("env", name, soft)
+
+    def lookup(self, env : str, name : str, soft : bool) -> str:
+        value = self.temporary()
+        if soft:
+            self.emit("{} = {}.get({!r})[0]".format(value, env, name))
+        else:
+            self.emit("{} = lookup({}, {!r})".format(value, env, name))
+        return value
+
+    # assign value to the binding of name, in the scopes up to depth
+    def assign(self, name : str, value : str, depth : int):
+        for idx in range(depth - 1, -1, -1):
+            scope = self.scopes[idx]
+            if scope.env is not None:
+                self.emit("assign({}, {!r}, {})".format(scope.env, name, value))
+                return
+            local = scope.locals.get(name)
+            if local is not None:
+                self.emit("{} = {}".format(local, value))
+                return
+            if scope.kind == LOOP and name in scope.names:
+                raise Unsupported("{} assigned in a loop before its let".format(name))
+        self.emit("assign(env, {!r}, {})".format(name, value))
+
+    def compoundAssign(self, node : ast.CompoundAssignStatement):
+        value = self.expression(node.value)
+        target = node.target
+        site = self.constant(node)
+        if target.__class__ is ast.Identifier:
+            self.compoundName(target.value, node.operator, site, value, len(self.scopes))
+            return
+        if isMember(target) and target.left.__class__ is ast.Identifier and target.right.__class__ is ast.Identifier:
+            instance = self.read(target.left.value, len(self.scopes), soft=True)
+            cache = self.constant(object.MemberCache(target.right.value))
+            self.emit("update({}, memberCell({}, {}, {!r}), {})".format(site, cache, instance, target.left.value, value))
+            return
+        if target.__class__ is not ast.IndexExpression:
+            raise Unsupported("compound assignment of " + target.string())
+        left = self.expression(target.left)
+        index = self.expression(target.index)
+        self.emit("update({}, indexCell({}, {}), {})".format(site, left, index, value))
+
+    # update the binding of name with value, in the scopes up to depth
+    def compoundName(self, name : str, operator : str, site : str, value : str, depth : int):
+        for idx in range(depth - 1, -1, -1):
+            scope = self.scopes[idx]
+            if scope.env is not None:
+                self.emit("update({}, cell({}, {!r}), {})".format(site, scope.env, name, value))
+                return
+            local = scope.locals.get(name)
+            if local is not None:
+                self.infix(operator, site, local, value, local)
+                return
+            if scope.kind == LOOP and name in scope.names:
+                raise Unsupported("{} assigned in a loop before its let".format(name))
+        self.emit("update({}, cell(env, {!r}), {})".format(site, name, value))
+
+    # python boolean telling whether the value of node is truthy
+    def condition(self, node : ast.Expression) -> str:
+        if node.__class__ is ast.InfixExpression and node.operator in COMPARISON:
+            right = self.expression(node.right)
+            left = self.expression(node.left)
+            result = self.temporary()
+            test = self.integers(left, right)
+            if test is None:
+                self.emit("{} = truthy(infix({}, {}, {}))".format(result, self.constant(node), left, right))
+                return result
+            start = self.open("if {}:".format(test))
+            self.emit("{} = {}.value {} {}.value".format(result, left, node.operator, right))
+            self.close(start)
+            start = self.open("else:")
+            self.emit("{} = truthy(infix({}, {}, {}))".format(result, self.constant(node), left, right))
+            self.close(start)
+            return result
+        if node.__class__ is ast.Boolean:
+            return "True" if node.value else "False"
+        value = self.expression(node)
+        return "({0} is not FALSE and {0} is not NULL)".format(value)
+
+    # python test of two Integer operands (none for the Integer constants),
+    # None if one of them is a constant of another class
+    def integers(self, left : str, right : str) -> str:
+        tests = []
+        for operand in (left, right):
+            if operand in ("TRUE", "FALSE"):
+                return None
+            if operand in self.constants:
+                if self.constants[operand].__class__ is not object.Integer:
+                    return None
+            else:
+                tests.append("{}.__class__ is Integer".format(operand))
+        return " and ".join(tests) if tests else "True"
+
+    # python expression of the value of node, the statements computing it
+    # are emitted in the order Eval evaluates
+    def expression(self, node : ast.Expression) -> str:
+        if node.__class__ is ast.IntegerLiteral:
+            return self.constant(evaluator.evalIntegerLiteral(node, None))
+        if node.__class__ is ast.StringLiteral:
+            return self.constant(evaluator.evalStringLiteral(node, None))
+        if node.__class__ is ast.Boolean:
+            return "TRUE" if node.value else "FALSE"
+        if node.__class__ is ast.Identifier:
+            return self.read(node.value, len(self.scopes))
+        if node.__class__ is ast.PrefixExpression:
+            return self.prefix(node)
+        if node.__class__ is ast.InfixExpression:
+            if node.operator == ".":
+                return self.member(node)
+            if node.operator in evaluator.shortCircuit:
+                return self.logical(node)
+            right = self.expression(node.right)
+            left = self.expression(node.left)
+            result = self.temporary()
+            self.infix(node.operator, self.constant(node), left, right, result)
+            return result
+        if node.__class__ is ast.CallExpression:
+            return self.call(node)
+        if node.__class__ is ast.IndexExpression:
+            left = self.expression(node.left)
+            index = self.expression(node.index)
+            result = self.temporary()
+            start = self.open("if {0}.__class__ is Array and {1}.__class__ is Integer and 0 <= {1}.value < len({0}.elements):".format(left, index))
+            self.emit("{} = {}.elements[{}.value]".format(result, left, index))
+            self.close(start)
+            start = self.open("else:")
+            self.emit("{} = index({}, {}, {})".format(result, self.constant(node), left, index))
+            self.close(start)
+            return result
+        if node.__class__ is ast.ArrayLiteral:
+            elements = [self.expression(elem) for elem in node.elements]
+            result = self.temporary()
+            self.emit("{} = Array([{}])".format(result, ", ".join(elements)))
+            return result
+        if node.__class__ is ast.HashLiteral:
+            return self.hashLiteral(node)
+        if node.__class__ in (ast.IfExpression, ast.WhileExpression, ast.ForExpression):
+            return self.value(node)
+        if node.__class__ is ast.FunctionLiteral:
+            return self.functionLiteral(node)
+        if node.__class__ is ast.Classliteral:
+            return self.classLiteral(node)
+        raise Unsupported(node.__class__.__name__)
+
+    # an if or loop used as a value: exit() stops it, with that value
+    def value(self, node : ast.Expression) -> str:
+        result = self.temporary()
+        self.exits.append("raise Exited")
+        start = self.open("try:")
+        self.statement(ast.ExpressionStatement(node.token, node), result)
+        self.close(start)
+        self.exits.pop()
+        start = self.open("except Exited:")
+        self.emit("{} = EXIT".format(result))
+        self.close(start)
+        return result
+
+    # each key, checked, then its value
+    def hashLiteral(self, node : ast.HashLiteral) -> str:
+        pairs = self.temporary()
+        self.emit("{} = {{}}".format(pairs))
+        for keyNode, valueNode in node.pairs.items():
+            key = self.expression(keyNode)
+            hashed = self.temporary()
+            self.emit("{} = hashKey({})".format(hashed, key))
+            value = self.expression(valueNode)
+            self.emit("{}[{}] = HashPair({}, {})".format(pairs, hashed, key, value))
+        result = self.temporary()
+        self.emit("{} = Hash({})".format(result, pairs))
+        return result
+
+    def functionLiteral(self, node : ast.FunctionLiteral) -> str:
+        env = self.scopes[-1].env
+        if self.functions is None or env is None:
+            raise Unsupported("function literal")
+        parameters, body = self.functions(node)
+        result = self.temporary()
+        self.emit("{} = Function({}, {}, {})".format(result, parameters, body, env))
+        return result
+
+    # the lets of the class body, run in a new environment without outer
+    # scopes: a let whose value fails leaves the field unbound
+    def classLiteral(self, node : ast.Classliteral) -> str:
+        env = self.binding()
+        result = self.temporary()
+        self.emit("{} = Environment(None)".format(env))
+        self.emit("{} = Class({}, {})".format(result, self.constant(node.body), env))
+        self.scopes.append(Scope(CLASS, letNames(node.body.statements), env))
+        for statement in node.body.statements:
+            if statement.__class__ is not ast.LetStatement:
+                self.emit("raise Abort(newError({!r}))".format("in class declaration there must be only Let statements"))
+                break
+            start = self.open("try:")
+            self.statement(statement, None)
+            self.close(start)
+            start = self.open("except Abort:")
+            self.emit("pass")
+            self.close(start)
+        self.scopes.pop()
+        return result
+
+    # obj.name and obj.name(...), obj being an instance bound in the scope
+    def member(self, node : ast.InfixExpression) -> str:
+        right = node.right
+        if node.left.__class__ is not ast.Identifier or right.__class__ not in (ast.Identifier, ast.CallExpression):
+            self.emit("raise Abort(newError({!r}))".format("Can't find a way to execute DOT operator"))
+            return "NULL"
+        instance = self.temporary()
+        self.emit("{} = instance({}, {!r})".format(instance, self.read(node.left.value, len(self.scopes), soft=True), node.left.value))
+        result = self.temporary()
+        if right.__class__ is ast.Identifier:
+            self.emit("{} = {}.get({}.env)".format(result, self.constant(object.MemberCache(right.value)), instance))
+            return result
+        if right.function.__class__ is not ast.Identifier:
+            raise Unsupported("method " + right.function.string())
+        function = self.temporary()
+        self.emit("{} = method({}, {})".format(function, self.constant(object.MemberCache(right.function.value)), instance))
+        start = self.open("if isinstance({}, Class):".format(function))
+        self.emit("{} = ClassInstance({}.env)".format(result, function))
+        self.close(start)
+        start = self.open("else:")
+        arguments = [self.expression(arg) for arg in right.arguments]
+        self.emit("{} = applyFunction({}, [{}])".format(result, function, ", ".join(arguments)))
+        self.close(start)
+        return result
+
+    # store in result the value of left operator right: inlined for integers
+    def infix(self, operator : str, site : str, left : str, right : str, result : str):
+        test = self.integers(left, right)
+        if test is not None and (operator in ARITHMETIC or operator in COMPARISON):
+            start = self.open("if {}:".format(test))
+            if operator in ARITHMETIC:
+                self.emit("{} = integer({}.value {} {}.value)".format(result, left, operator, right))
+            else:
+                self.emit("{} = TRUE if {}.value {} {}.value else FALSE".format(result, left, operator, right))
+            self.close(start)
+            start = self.open("else:")
+            self.emit("{} = infix({}, {}, {})".format(result, site, left, right))
+            self.close(start)
+            return
+        self.emit("{} = infix({}, {}, {})".format(result, site, left, right))
+
+    def prefix(self, node : ast.PrefixExpression) -> str:
+        right = self.expression(node.right)
+        result = self.temporary()
+        if node.operator == "!":
+            self.emit("{0} = TRUE if {1} is FALSE or {1} is NULL else FALSE".format(result, right))
+        elif node.operator == "-":
+            self.emit("{0} = integer(-{1}.value) if isinstance({1}, Integer) else prefix('-', {1})".format(result, right))
+        else:
+            self.emit("{} = prefix({!r}, {})".format(result, node.operator, right))
+        return result
+
+    # left to right, the right operand only if the left one doesn't decide
+    def logical(self, node : ast.InfixExpression) -> str:
+        result = self.temporary()
+        self.emit("{} = {}".format(result, self.expression(node.left)))
+        decider = "TRUE" if evaluator.shortCircuit[node.operator] is object.TRUE else "FALSE"
+        start = self.open("if {} is not {}:".format(result, decider))
+        right = self.expression(node.right)
+        self.emit("{0} = infix({1}, {0}, {2})".format(result, self.constant(node), right))
+        self.close(start)
+        return result
+
+    def call(self, node : ast.CallExpression) -> str:
+        function = self.expression(node.function)
+        result = self.temporary()
+        # a class gives an instance, its arguments are not evaluated
+        start = self.open("if isinstance({}, Class):".format(function))
+        self.emit("{} = {}.instance()".format(result, function))
+        self.close(start)
+        start = self.open("else:")
+        arguments = [self.expression(arg) for arg in node.arguments]
+        self.emit("{} = applyFunction({}, [{}])".format(result, function, ", ".join(arguments)))
+        self.close(start)
+        return result
+
+def isMember(node : ast.Node) -> bool:
+    return node.__class__ is ast.InfixExpression and node.operator == "."
+
+# python function of the statements of body, None if it can't be translated
+def translate(parameters : List[ast.Identifier], body : ast.BlockStatement) -> Callable:
+    translator = Translator(parameters, body)
+    try:
+        source = translator.translate()
+    except Unsupported:
+        return None
+    namespace = dict(runtime())
+    namespace.update(translator.constants)
+    exec(compile(source, "<jit>", "exec"), namespace)
+    return namespace["compiled"]
+
+# compile the body of fn for its next calls: body.jit is the python
+# function, or False if the body is left to Eval
+def compileFunction(fn : object.Function) -> Callable:
+    body = fn.body
+    if body.jit is None:
+        body.jit = translate(fn.parameters, body) or False
+    return body.jit
+
+def lookup(env : object.Environment, name : str) -> object.Object:
+    value, ok = env.get(name)
+    if ok:
+        return value
+    if name in builtins.builtins:
+        return builtins.builtins[name]
+    raise evaluator.Abort(newError("identifier not found: " + name))
+
+def assign(env : object.Environment, name : str, value : object.Object):
+    _, ok = env.get(name)
+    if not ok:
+        raise evaluator.Abort(newError("Can't assign value before declaration"))
+    env.set(name, value, False)
+
+# cell of the binding of name, for a compound assignment
+def cell(env : object.Environment, name : str):
+    scope, slot = env.find(name)
+    if scope is None:
+        return newError("Can't assign value before declaration")
+    return scope.values, slot
+
+def infix(node : ast.InfixExpression, left : object.Object, right : object.Object) -> object.Object:
+    return evaluator.check(evaluator.applyInfix(node, left, right))
+
+def index(node : ast.IndexExpression, left : object.Object, index : object.Object) -> object.Object:
+    return evaluator.check(evaluator.applyIndex(node, left, index))
+
+def prefix(operator : str, right : object.Object) -> object.Object:
+    return evaluator.check(evaluator.evalPrefixExpression(operator, right))
+
+def update(node : ast.CompoundAssignStatement, cell, value : object.Object):
+    evaluator.check(cell)
+    evaluator.check(evaluator.updateCell(node, cell, value))
+
+def truthy(value : object.Object) -> bool:
+    return value is not object.FALSE and value is not object.NULL
+
+def hashKey(key : object.Object) -> int:
+    if not isinstance(key, object.Hashable):
+        raise evaluator.Abort(newError("unusable as hash key: {}".format(key.type())))
+    return key.hashKey()
+
+# instance obj of obj.name, named name
+def instance(value : object.Object, name : str) -> object.ClassInstance:
+    if not isinstance(value, object.ClassInstance):
+        raise evaluator.Abort(newError("{} does not exist in current scope", name))
+    return value
+
+# function of obj.name(...): the member, else name in the instance
+def method(cache : object.MemberCache, instance : object.ClassInstance) -> object.Object:
+    function = cache.get(instance.env)
+    if function is None:
+        function = lookup(instance.env, cache.name)
+    return function
+
+# let obj.name = value
+def setMember(instance : object.Object, objectName : str, name : str, value : object.Object):
+    if not isinstance(instance, object.ClassInstance):
+        raise evaluator.Abort(newError("Can't find object {}", objectName))
+    _, exist = instance.env.get(name)
+    if not exist:
+        raise evaluator.Abort(newError("Can't find instance {}", name))
+    instance.env.set(name, value, True)
+
+# cell of obj.name, for a compound assignment
+def memberCell(cache : object.MemberCache, instance : object.Object, objectName : str) -> Tuple[List[object.Object], int]:
+    if not isinstance(instance, object.ClassInstance):
+        return newError("Can't find object {}", objectName)
+    if cache.get(instance.env) is None:
+        return newError("Can't find instance {}", cache.name)
+    return instance.env.values, cache.slot
+
+# names the translated functions use
+def runtime() -> Dict[str, object.Object]:
+    return {
+        "Integer"       : object.Integer,
+        "String"        : object.String,
+        "Array"         : object.Array,
+        "Hash"          : object.Hash,
+        "HashPair"      : object.HashPair,
+        "Class"         : object.Class,
+        "ClassInstance" : object.ClassInstance,
+        "Function"      : object.Function,
+        "Environment"   : object.Environment,
+        "MemberCache"   : object.MemberCache,
+        "Abort"         : evaluator.Abort,
+        "Exited"        : Exited,
+        "newError"      : newError,
+        "TailCall"      : object.TailCall,
+        "TRUE"          : object.TRUE,
+        "FALSE"         : object.FALSE,
+        "NULL"          : object.NULL,
+        "EXIT"          : object.EXIT,
+        "integer"       : object.integer,
+        "applyFunction" : evaluator.applyFunction,
+        "indexCell"     : evaluator.indexCell,
+        "lookup"        : lookup,
+        "cell"          : cell,
+        "assign"        : assign,
+        "infix"         : infix,
+        "index"         : index,
+        "prefix"        : prefix,
+        "update"        : update,
+        "truthy"        : truthy,
+        "hashKey"       : hashKey,
+        "instance"      : instance,
+        "method"        : method,
+        "setMember"     : setMember,
+        "memberCell"    : memberCell,
+    }
@@ -0,0 +1,91 @@
+import unittest
+import _Lexer.lexer as lexer
+import _Parser.parser as parser
+import _Object.object as object
+import _Resolver.resolver as resolver
+import _Evaluator.evaluator as evaluator
+import _Jit.jit as jit
+
+def parse(input : str):
+    l = lexer.Lexer(input)
+    p = parser.Parser(l)
+    return p.parseProgram()
+
+class TestJit(unittest.TestCase):
+    def setUp(self):
+        self.threshold = evaluator.JIT_THRESHOLD
+        evaluator.JIT_THRESHOLD = 3
+
+    def tearDown(self):
+        evaluator.JIT_THRESHOLD = self.threshold
+
+    def run_program(self, input : str):
+        program = parse(input)
+        env = object.Environment()
+        resolver.resolve(program, env)
+        return evaluator.Eval(program, env), env
+
+    def testTranslate(self):
+        tests = [
+            ("fn(x) { x + 1 }", True),
+            ("fn(a) { let s = 0; for (let i = 0; i < len(a); i++) { s += a[i]; } s }", True),
+            ("fn(n) { while (n > 0) { if (n == 3) { break; } n -= 1; } n }", True),
+            ("fn(x) { fn(y) { x + y } }", False),
+            ("fn(o) { o.f() + o.x }", True),
+            ("fn(x) { {\"a\": x} }", True),
+            ("fn(x) { let y = if (x) { 1 } else { 2 }; y }", True),
+            ("fn(x) { let c = class { let f = fn() { x } }; c }", False),
+            ("fn() { while (true) { i = 1; let i = 0; } }", False),
+        ]
+        for input, compiled in tests:
+            function = parse(input).statements[0].expression
+            self.assertEqual(jit.translate(function.parameters, function.body) is not None, compiled, input)
+
+    def testHotFunctions(self):
+        result, env = self.run_program("""
+            let add = fn(x, y) { x + y };
+            let node = fn(x) { fn() { x } };
+            let s = 0;
+            for (let i = 0; i < 5; i++) { s = add(s, i); node(i); }
+            s
+        """)
+        self.assertEqual(result.value, 10)
+        add, _ = env.get("add")
+        node, _ = env.get("node")
+        self.assertTrue(callable(add.body.jit))
+        self.assertIs(node.body.jit, False)
+
+    def testValues(self):
+        tests = [
+            ("let f = fn(x) { x / 2 }; f(1); f(1); f(1)", 0.5),
+            ("let f = fn(x) { if (x > 1) { x } }; f(1); f(1); f(1)", object.NULL),
+            ("let f = fn(x) { for (let i = 0; i < x; i++) { i * 2 } }; f(3); f(3); f(3)", 4),
+            ("let f = fn(x) { while (x > 0) { x -= 1; if (x == 1) { continue; } x } }; f(3); f(3); f(3)", 0),
+            ("let f = fn(n, acc) { if (n == 0) { return acc; } return f(n - 1, acc + n); }; f(5000, 0); f(5000, 0); f(5000, 0)", 12502500),
+            ("let a = [1, 2]; let f = fn(i) { a[i] += 1; a[i] }; f(0); f(0); f(1)", 3),
+            ("let c = class { let n = 1; let get = fn() { n } }; let o = c(); let f = fn() { o.n += 1; o.get() }; f(); f(); f()", 4),
+            ("let f = fn(x) { let h = {\"a\": x}; h[\"a\"] }; f(1); f(1); f(7)", 7),
+            ("let f = fn(x) { let y = if (x > 1) { exit(); 5 } else { 2 }; y }; f(1); f(1); f(3)", object.EXIT),
+        ]
+        for input, expected in tests:
+            result, _ = self.run_program(input)
+            if isinstance(expected, object.Object):
+                self.assertIs(result, expected, input)
+            else:
+                self.assertEqual(result.value, expected, input)
+
+    def testErrors(self):
+        tests = [
+            ("let f = fn(x) { x + true }; f(1); f(1); f(1)", "type mismatch: INTEGER + BOOLEAN"),
+            ("let f = fn(x) { -x }; f(1); f(1); f(\"a\")", "unknown operator: -STRING"),
+            ("let f = fn(x) { y }; f(1); f(1); f(1)", "identifier not found: y"),
+            ("let f = fn(x) { y = x; }; f(1); f(1); f(1)", "Can't assign value before declaration"),
+            ("let f = fn(x) { x(\"a\"); }; f(len); f(len); f(1)", "not a function: INTEGER"),
+        ]
+        for input, expected in tests:
+            result, _ = self.run_program(input)
+            self.assertIsInstance(result, object.Error, input)
+            self.assertEqual(result.message, expected, input)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -53,7 +53,10 @@ class Lexer():
             tok = token.newToken(token.SEMICOLON, self.ch)
 
         elif self.ch ==  "+":
-            tok = token.newToken(token.PLUS, self.ch)
+            if self.peekChar() in ["=", "+"]:
+                tok = self.readPair(token.PLUS_ASSIGN if self.peekChar() == "=" else token.INCREMENT)
+            else:
+                tok = token.newToken(token.PLUS, self.ch)
 
         if self.ch == "-":
             tok = token.newToken(token.MINUS, self.ch)
@@ -67,10 +70,16 @@ class Lexer():
                 tok = token.newToken(token.BANG, self.ch)
 
         if self.ch == "/":
-            tok = token.newToken(token.SLASH, self.ch)
+            if self.peekChar() == "=":
+                tok = self.readPair(token.SLASH_ASSIGN)
+            else:
+                tok = token.newToken(token.SLASH, self.ch)
 
         if self.ch == "*":
-            tok = token.newToken(token.ASTERISK, self.ch) 
+            if self.peekChar() == "=":
+                tok = self.readPair(token.ASTERISK_ASSIGN)
+            else:
+                tok = token.newToken(token.ASTERISK, self.ch) 
 
         if self.ch == ".":
             tok = token.newToken(token.DOT, self.ch) 
@@ -92,7 +101,10 @@ class Lexer():
                 tok = token.newToken(token.GT, self.ch)
 
         if self.ch == "-":
-            tok = token.newToken(token.MINUS, self.ch)
+            if self.peekChar() in ["=", "-"]:
+                tok = self.readPair(token.MINUS_ASSIGN if self.peekChar() == "=" else token.DECREMENT)
+            else:
+                tok = token.newToken(token.MINUS, self.ch)
 
         elif self.ch ==  "(":
             tok = token.newToken(token.LPAREN, self.ch)
@@ -122,7 +134,10 @@ class Lexer():
             tok = token.newToken(token.COLON, self.ch)
 
         elif self.ch == "%":
-            tok = token.newToken(token.MODULUS, self.ch)
+            if self.peekChar() == "=":
+                tok = self.readPair(token.MODULUS_ASSIGN)
+            else:
+                tok = token.newToken(token.MODULUS, self.ch)
         
         elif self.ch == "&" and self.peekChar() == "&":
             ch = self.ch
@@ -150,6 +165,12 @@ class Lexer():
         self.readChar()
         return tok
 
+    # token of two characters: the current one and the next one
+    def readPair(self, tokenType : str) -> token.Token:
+        ch = self.ch
+        self.readChar()
+        return token.newToken(tokenType, ch + self.ch)
+
     def isLetter(self, ch : str) -> bool:
         return isalpha(ch) or ch == '_'
     
@@ -43,6 +43,8 @@ class TestToken(unittest.TestCase):
             }
             class
             classname.method
+            a += 1 -= 2 *= 3 /= 4 %= 5;
+            a++ --a - -1
         """
 
         expected = [
@@ -178,6 +180,25 @@ class TestToken(unittest.TestCase):
             newToken(IDENT,        "classname"),
             newToken(DOT,          "."),
             newToken(IDENT,        "method"),
+            newToken(IDENT,        "a"),
+            newToken(PLUS_ASSIGN,  "+="),
+            newToken(INT,          "1"),
+            newToken(MINUS_ASSIGN, "-="),
+            newToken(INT,          "2"),
+            newToken(ASTERISK_ASSIGN, "*="),
+            newToken(INT,          "3"),
+            newToken(SLASH_ASSIGN, "/="),
+            newToken(INT,          "4"),
+            newToken(MODULUS_ASSIGN, "%="),
+            newToken(INT,          "5"),
+            newToken(SEMICOLON,    ";"),
+            newToken(IDENT,        "a"),
+            newToken(INCREMENT,    "++"),
+            newToken(DECREMENT,    "--"),
+            newToken(IDENT,        "a"),
+            newToken(MINUS,        "-"),
+            newToken(MINUS,        "-"),
+            newToken(INT,          "1"),
             newToken(EOF,          "")
         ]
 
@@ -2,6 +2,7 @@ INTEGER_OBJ         = "INTEGER"
 BOOLEAN_OBJ         = "BOOLEAN"
 NULL_OBJ            = "NULL"
 RETURN_VALUE_OBJ    = "RETURN_VALUE"
+TAIL_CALL_OBJ       = "TAIL_CALL"
 ERROR_OBJ           = "ERROR"
 FUNCTION_OBJ        = "FUNCTION"
 STRING_OBJ          = "STRING"
@@ -12,4 +13,5 @@ EXIT_OBJ            = "EXIT"
 BREAK_OBJ           = "BREAK"
 CONTINUE_OBJ        = "CONTINUE"
 CLASS_OBJ           = "CLASS"
-CLASS_INSTANCE_OBJ  = "CLASS_INSTANCE"
\ No newline at end of file
+CLASS_INSTANCE_OBJ  = "CLASS_INSTANCE"
+COMPILED_FUNCTION_OBJ = "COMPILED_FUNCTION"
\ No newline at end of file
@@ -2,9 +2,10 @@ from __future__ import annotations
 from _Object.const import * 
 from typing import Callable, Dict, List, Tuple
 import _Ast.ast as ast
-import hashlib
+import copy
 
 class Object:
+    __slots__ = ()
     def type(self) -> str:
         pass
 
@@ -12,10 +13,12 @@ class Object:
         pass
 
 class Hashable:
+    __slots__ = ()
     def hashKey() -> int:
         pass
 
 class Integer(Object, Hashable):
+    __slots__ = ("value",)
     def __init__(self, value : int):
         self.value = value
     
@@ -27,8 +30,30 @@ class Integer(Object, Hashable):
 
     def hashKey(self) -> int:
         return self.value
+
+# Integer objects of the values in [SMALL_INT_MIN, SMALL_INT_MAX], shared by
+# all the results with those values: an Integer is never changed once it's
+# given to a program
+SMALL_INT_MIN = -5
+SMALL_INT_MAX = 256
+smallIntegers = []
+
+# (re)build the cache of small Integer objects for the values in [low, high]
+def cacheSmallIntegers(low : int, high : int):
+    global SMALL_INT_MIN, SMALL_INT_MAX
+    SMALL_INT_MIN, SMALL_INT_MAX = low, high
+    smallIntegers[:] = [Integer(value) for value in range(low, high + 1)]
+
+cacheSmallIntegers(SMALL_INT_MIN, SMALL_INT_MAX)
+
+# Integer object of value: the cached one, if value is a small int
+def integer(value) -> Integer:
+    if value.__class__ is int and SMALL_INT_MIN <= value <= SMALL_INT_MAX:
+        return smallIntegers[value - SMALL_INT_MIN]
+    return Integer(value)
     
 class Boolean(Object, Hashable):
+    __slots__ = ("value",)
     def __init__(self, value : bool):
         self.value = value
     
@@ -43,6 +68,7 @@ class Boolean(Object, Hashable):
         return value
     
 class Null(Object):
+    __slots__ = ()
     def type(self) -> str:
         return NULL_OBJ
     
@@ -50,6 +76,7 @@ class Null(Object):
         return "null"
 
 class ReturnValue(Object):
+    __slots__ = ("value",)
     def __init__(self, value : Object):
         self.value = value
 
@@ -59,7 +86,22 @@ class ReturnValue(Object):
     def inspect(self) -> str:
         return self.value.inspect
 
+# call in tail position, returned (wrapped in a ReturnValue) to the function
+# being left so that it can run the call in place of a nested one
+class TailCall(Object):
+    __slots__ = ("fn", "args")
+    def __init__(self, fn : Function, args : List[Object]):
+        self.fn = fn
+        self.args = args
+
+    def type(self) -> str:
+        return TAIL_CALL_OBJ
+
+    def inspect(self) -> str:
+        return TAIL_CALL_OBJ
+
 class Error(Object):
+    __slots__ = ("message",)
     def __init__(self, message : str):
         self.message = message
     
@@ -69,10 +111,23 @@ class Error(Object):
     def inspect(self) -> str:
         return "ERROR: " + self.message
 
+# function value: the body runs in a new scope of env, the environment
+# where the function was created
 class Function(Object):
-    def __init__(self, parameters : List[ast.Identifier], body : ast.BlockStatement):
+    __slots__ = ("parameters", "body", "env")
+    def __init__(self, parameters : List[ast.Identifier], body : ast.BlockStatement, env : Environment = None):
         self.parameters = parameters
         self.body = body
+        self.env = env
+
+    # same function, created in env instead
+    def bind(self, env : Environment) -> Function:
+        return Function(self.parameters, self.body, env)
+
+    # copied along with the environment it was created in (the methods of
+    # a class instance), else it still refers to the same environment
+    def __deepcopy__(self, memo : Dict) -> Function:
+        return self.bind(memo.get(id(self.env), self.env))
     
     def type(self) -> Object:
         return FUNCTION_OBJ
@@ -84,34 +139,167 @@ class Function(Object):
 
         return "fn(" + ", ".join(params) + ") {\n" + self.body.string() + "\n}"
 
+# function lowered to bytecode by the compiler (constant pool entry), with
+# the pool its instructions index: functions compiled apart (the lines of
+# the REPL) keep their own
+class CompiledFunction(Object):
+    __slots__ = ("instructions", "parameters", "body", "constants")
+    def __init__(self, instructions : List[int], parameters : List[ast.Identifier] = None,
+                 body : ast.BlockStatement = None, constants : List = None):
+        self.instructions = instructions
+        self.parameters = parameters
+        self.body = body
+        self.constants = constants
+
+    def type(self) -> str:
+        return COMPILED_FUNCTION_OBJ
+
+    def inspect(self) -> str:
+        return "compiled function"
+
+# function value created by the vm out of a CompiledFunction
+class Closure(Function):
+    __slots__ = ("fn",)
+    def __init__(self, fn : CompiledFunction, env : Environment = None):
+        super().__init__(fn.parameters, fn.body, env)
+        self.fn = fn
+
+    def bind(self, env : Environment) -> Closure:
+        return Closure(self.fn, env)
+
+# marker of a slot whose name is not bound yet: None is a value (the one of
+# a statement, like a let ending a function), which names can be bound to
+class Unbound:
+    __slots__ = ()
+    # copies are the marker itself
+    def __reduce__(self):
+        return "UNBOUND"
+
+UNBOUND = Unbound()
+
+# Scope of name bindings. Values live in a list, names map to their slot:
+# a program annotated by the resolver reads and writes slots directly,
+# while lookups by name still work for any program. Scopes built from the
+# same block share its layout (name -> slot), copied only if a name the
+# resolver did not see is added. A slot holding UNBOUND is not bound yet.
+# The environment of a class instance starts with the functions of the
+# class environment (its template), each bound to the instance the first
+# time it is read.
 class Environment:
-    def __init__(self, outer : Environment = None, inLoop : bool = False):
-        self.store = {}
+    __slots__ = ("outer", "inLoop", "names", "values", "shared", "template")
+    def __init__(self, outer : Environment = None, inLoop : bool = False, layout : Dict[str, int] = None):
         self.outer = outer
         self.inLoop = inLoop
+        self.template = None
+        if layout is None:
+            self.names = {}
+            self.values = []
+            self.shared = False
+        else:
+            self.names = layout
+            self.values = [UNBOUND] * len(layout)
+            self.shared = True
     
     def get(self, name : str) -> Tuple[Object, bool]:
-        if name in self.store:
-            return self.store[name], True
-        elif self.outer is not None:
-            return self.outer.get(name)
-        else:
-            return None, False
+        env = self
+        while env is not None:
+            slot = env.names.get(name)
+            if slot is not None:
+                value = env.values[slot]
+                if value is not UNBOUND:
+                    if env.template is not None:
+                        value = env.member(slot)
+                    return value, True
+            env = env.outer
+        return None, False
+
+    # value in slot, a function of the template bound to this environment
+    def member(self, slot : int) -> Object:
+        value = self.values[slot]
+        if isinstance(value, Function) and value.env is self.template:
+            value = self.values[slot] = value.bind(self)
+        return value
+
+    # the template is shared by the copies, its functions are bound to
+    # them when they are read
+    def __deepcopy__(self, memo : Dict) -> Environment:
+        env = memo[id(self)] = Environment.__new__(Environment)
+        env.outer = copy.deepcopy(self.outer, memo)
+        env.inLoop = self.inLoop
+        env.names = self.names if self.shared else dict(self.names)
+        env.shared = self.shared
+        env.template = self.template
+        env.values = copy.deepcopy(self.values, memo)
+        return env
     
     def set(self, name : str, value : Object, inCurrentSope : bool):
-        if self.get(name)[1] and not inCurrentSope:
-            if name in self.store:
-                self.store[name] = value
-                return
-            else:
-                self.outer.set(name, value, inCurrentSope)
-        else:
-            self.store[name] = value
+        if not inCurrentSope:
+            env = self
+            while env is not None:
+                slot = env.names.get(name)
+                if slot is not None and env.values[slot] is not UNBOUND:
+                    env.values[slot] = value
+                    return
+                env = env.outer
+        self.values[self.declare(name)] = value
+
+    # scope and slot name is bound in, (None, None) if it is not bound
+    def find(self, name : str) -> Tuple[Environment, int]:
+        env = self
+        while env is not None:
+            slot = env.names.get(name)
+            if slot is not None and env.values[slot] is not UNBOUND:
+                return env, slot
+            env = env.outer
+        return None, None
+
+    # slot of name in this scope, added (unbound) if missing
+    def declare(self, name : str) -> int:
+        slot = self.names.get(name)
+        if slot is None:
+            if self.shared:
+                self.names = dict(self.names)
+                self.shared = False
+            slot = len(self.values)
+            self.names[name] = slot
+            self.values.append(UNBOUND)
+        return slot
 
     def reset(self, name : str):
-        self.store.pop(name)
+        self.values[self.names[name]] = UNBOUND
+
+# inline cache of a member access site (obj.name): the shape of the
+# instances seen last, i.e. the layout their environments share with the
+# class they come from, and the slot of name in it. Instances of the same
+# class are then read with an identity check and an indexed load
+class MemberCache:
+    __slots__ = ("name", "shape", "slot")
+    def __init__(self, name : str):
+        self.name = name
+        self.shape = None
+        self.slot = None
+
+    # value of the member in env (the environment of an instance), None if
+    # it is missing or not bound yet
+    def get(self, env : Environment) -> Object:
+        names = env.names
+        if names is not self.shape:
+            slot = names.get(self.name)
+            if slot is None:
+                return None
+            # slots are never moved, only added, so a layout that grows
+            # keeps its slot
+            self.shape = names
+            self.slot = slot
+        value = env.values[self.slot]
+        if value is UNBOUND:
+            return None
+        if env.template is not None:
+            return env.member(self.slot)
+        return value
 
 class String(Object, Hashable):
+    __slots__ = ("value",)
     def __init__(self, value : str):
         self.value = value
     
@@ -121,11 +309,14 @@ class String(Object, Hashable):
     def inspect(self) -> str:
         return self.value
     
-    def hashKey(self) -> int:
-        return int.from_bytes(hashlib.sha256(self.value.encode("ASCII")).digest()[:8], "little")
+    # the python str itself: it never equals the key of an integer or a
+    # boolean, and python computes its hash once
+    def hashKey(self) -> str:
+        return self.value
         
 
 class Builtin(Object):
+    __slots__ = ("fn",)
     def __init__(self, fn : Callable):
         self.fn = fn
 
@@ -136,6 +327,7 @@ class Builtin(Object):
         return "builtin function"
 
 class Array(Object):
+    __slots__ = ("elements",)
     def __init__(self, elements : List[Object] = None):
         self.elements = elements
     
@@ -150,11 +342,13 @@ class Array(Object):
         return "[" + ", ".join(elements) + "]"
 
 class HashPair:
+    __slots__ = ("key", "value")
     def __init__(self, key : Object, value : Object = None):
         self.key = key
         self.value = value
 
 class Hash(Object):
+    __slots__ = ("pairs",)
     def __init__(self, pairs : Dict = None):
         self.pairs = pairs
 
@@ -170,6 +364,7 @@ class Hash(Object):
         return "{" + ", ".join(pairs) + "}"
 
 class Exit(Object):
+    __slots__ = ()
     def type(self) -> str:
         return EXIT_OBJ
 
@@ -177,6 +372,7 @@ class Exit(Object):
         return "program exited"
 
 class Break(Object):
+    __slots__ = ()
     def type(self) -> str:
         return BREAK_OBJ
 
@@ -184,6 +380,7 @@ class Break(Object):
         return BREAK_OBJ
 
 class Continue(Object):
+    __slots__ = ()
     def type(self) -> str:
         return CONTINUE_OBJ
 
@@ -191,14 +388,38 @@ class Continue(Object):
         return CONTINUE_OBJ
 
 class Class(Object):
+    __slots__ = ("env", "body")
     def __init__(self, body : ast.BlockStatement = None, env : Environment = None):
         self.env = env
         self.body = body # used just to print it
+
+    # new instance, with an environment of its own holding the current
+    # values of the class environment. Instead of deep copying the whole
+    # class, the methods are shared with the class until they are read
+    # (see Environment.member), arrays, hashes and other mutable values are
+    # copied (as a deep copy would do) and immutable values are shared
+    def instance(self) -> ClassInstance:
+        classEnv = self.env
+        env = Environment(None, classEnv.inLoop, classEnv.names)
+        classEnv.shared = True
+        env.template = classEnv
+        values = env.values = classEnv.values[:]
+        memo = None
+        for slot, value in enumerate(values):
+            if value is None or value is UNBOUND or value.__class__ in IMMUTABLE_CLASSES:
+                continue
+            if isinstance(value, Function) and value.env is classEnv:
+                continue
+            if memo is None:
+                memo = {id(classEnv): env}
+            values[slot] = copy.deepcopy(value, memo)
+        return ClassInstance(env)
     
     def type(self) -> Object:
         return CLASS_OBJ
 
 class ClassInstance(Object):
+    __slots__ = ("env",)
     def __init__(self, env : Environment):
         self.env = env
 
@@ -208,6 +429,9 @@ class ClassInstance(Object):
     def inspect(self) -> str:
         return CLASS_INSTANCE_OBJ
 
+# values shared by a class and its instances
+IMMUTABLE_CLASSES = frozenset([Integer, Boolean, String, Null, Builtin])
+
 TRUE     = Boolean(True)
 FALSE    = Boolean(False)
 EXIT     = Exit()
@@ -0,0 +1,206 @@
+from typing import List
+import _Ast.ast as ast
+import _Object.object as object
+import _Token.token as token
+import _Evaluator.evaluator as evaluator
+from _Optimizer.nodes import countNodes
+
+# Folder: constant folding and dead code elimination on the AST.
+#  - prefix and infix expressions over literals are replaced by the literal
+#    of their value, computed with the same functions Eval uses (nothing is
+#    folded if the result is an error, which is left to happen at runtime);
+#  - an if with a constant condition keeps only the branch that is taken,
+#    still in its own scope;
+#  - statements after a return, break or continue are removed, and so are
+#    literals and if expressions without effects whose value is unused.
+class Folder:
+    def fold(self, node : ast.Node) -> ast.Node:
+        if node is None:
+            return None
+        folder = folders.get(type(node))
+        if folder is None:
+            return node
+        return folder(self, node)
+
+    def foldProgram(self, program : ast.Program) -> ast.Program:
+        program.statements = self.foldStatements(program.statements)
+        return program
+
+    def foldStatements(self, statements : List[ast.Statement]) -> List[ast.Statement]:
+        result = []
+        for statement in statements:
+            result.append(self.fold(statement))
+            if isinstance(statement, (ast.ReturnStatement, ast.BreakStatement, ast.ContinueStatement)):
+                break
+
+        # the value of a statement is used only if it's the last one
+        return [stmt for idx, stmt in enumerate(result) if idx == len(result) - 1 or not isInert(stmt)]
+
+    def foldBlockStatement(self, node : ast.BlockStatement) -> ast.BlockStatement:
+        node.statements = self.foldStatements(node.statements)
+        return node
+
+    def foldExpressionStatement(self, node : ast.ExpressionStatement) -> ast.Statement:
+        node.expression = self.fold(node.expression)
+        return node
+
+    def foldLetStatement(self, node : ast.LetStatement) -> ast.Statement:
+        node.value = self.fold(node.value)
+        return node
+
+    def foldAssignStatement(self, node : ast.AssignStatement) -> ast.Statement:
+        node.value = self.fold(node.value)
+        return node
+
+    def foldCompoundAssignStatement(self, node : ast.CompoundAssignStatement) -> ast.Statement:
+        node.value = self.fold(node.value)
+        node.target = self.fold(node.target)
+        return node
+
+    def foldReturnStatement(self, node : ast.ReturnStatement) -> ast.Statement:
+        node.value = self.fold(node.value)
+        return node
+
+    def foldPrefixExpression(self, node : ast.PrefixExpression) -> ast.Expression:
+        node.right = self.fold(node.right)
+        right = constant(node.right)
+        if right is None:
+            return node
+        return literal(evaluator.evalPrefixExpression(node.operator, right), node)
+
+    def foldInfixExpression(self, node : ast.InfixExpression) -> ast.Expression:
+        if node.operator == ".":
+            if isinstance(node.right, ast.CallExpression):
+                node.right.arguments = [self.fold(arg) for arg in node.right.arguments]
+            return node
+
+        node.right = self.fold(node.right)
+        node.left = self.fold(node.left)
+        left, right = constant(node.left), constant(node.right)
+        # a constant left operand deciding a logical operator
+        if left is not None and left is evaluator.shortCircuit.get(node.operator):
+            return node.left
+        if left is None or right is None:
+            return node
+        try:
+            value = evaluator.evalInfixExpression(node.operator, left, right)
+        except ArithmeticError:
+            return node
+        return literal(value, node)
+
+    def foldIfExpression(self, node : ast.IfExpression) -> ast.Expression:
+        node.condition = self.fold(node.condition)
+        node.consequence = self.fold(node.consequence)
+        node.alternative = self.fold(node.alternative)
+
+        condition = constant(node.condition)
+        if condition is None:
+            return node
+
+        if evaluator.isTruthy(condition):
+            node.alternative = None
+        elif node.alternative is not None:
+            node.condition = ast.Boolean(token.Token(token.TRUE, "true"), True)
+            node.consequence = node.alternative
+            node.alternative = None
+        else:
+            node.consequence = ast.BlockStatement(node.consequence.token, [])
+        return node
+
+    def foldWhileExpression(self, node : ast.WhileExpression) -> ast.Expression:
+        node.condition = self.fold(node.condition)
+        node.block = self.fold(node.block)
+        return node
+
+    def foldForExpression(self, node : ast.ForExpression) -> ast.Expression:
+        node.initial = self.fold(node.initial)
+        node.condition = self.fold(node.condition)
+        node.update = self.fold(node.update)
+        node.block = self.fold(node.block)
+        return node
+
+    def foldFunctionLiteral(self, node : ast.FunctionLiteral) -> ast.Expression:
+        node.body = self.fold(node.body)
+        return node
+
+    def foldCallExpression(self, node : ast.CallExpression) -> ast.Expression:
+        node.function = self.fold(node.function)
+        node.arguments = [self.fold(arg) for arg in node.arguments]
+        return node
+
+    def foldArrayLiteral(self, node : ast.ArrayLiteral) -> ast.Expression:
+        node.elements = [self.fold(elem) for elem in node.elements]
+        return node
+
+    def foldIndexExpression(self, node : ast.IndexExpression) -> ast.Expression:
+        node.left = self.fold(node.left)
+        node.index = self.fold(node.index)
+        return node
+
+    def foldHashLiteral(self, node : ast.HashLiteral) -> ast.Expression:
+        node.pairs = {self.fold(key): self.fold(value) for key, value in node.pairs.items()}
+        return node
+
+    # a class body must only contain let statements: only their values are folded
+    def foldClassliteral(self, node : ast.Classliteral) -> ast.Expression:
+        for statement in node.body.statements:
+            if isinstance(statement, ast.LetStatement):
+                statement.value = self.fold(statement.value)
+        return node
+
+folders = {
+    ast.BlockStatement      : Folder.foldBlockStatement,
+    ast.ExpressionStatement : Folder.foldExpressionStatement,
+    ast.LetStatement        : Folder.foldLetStatement,
+    ast.AssignStatement     : Folder.foldAssignStatement,
+    ast.CompoundAssignStatement : Folder.foldCompoundAssignStatement,
+    ast.ReturnStatement     : Folder.foldReturnStatement,
+    ast.PrefixExpression    : Folder.foldPrefixExpression,
+    ast.InfixExpression     : Folder.foldInfixExpression,
+    ast.IfExpression        : Folder.foldIfExpression,
+    ast.WhileExpression     : Folder.foldWhileExpression,
+    ast.ForExpression       : Folder.foldForExpression,
+    ast.FunctionLiteral     : Folder.foldFunctionLiteral,
+    ast.CallExpression      : Folder.foldCallExpression,
+    ast.ArrayLiteral        : Folder.foldArrayLiteral,
+    ast.IndexExpression     : Folder.foldIndexExpression,
+    ast.HashLiteral         : Folder.foldHashLiteral,
+    ast.Classliteral        : Folder.foldClassliteral,
+}
+
+# value of a literal node, None if node is not a literal
+def constant(node : ast.Node) -> object.Object:
+    if isinstance(node, ast.IntegerLiteral):
+        return object.Integer(node.value)
+    if isinstance(node, ast.StringLiteral):
+        return object.String(node.value)
+    if isinstance(node, ast.Boolean):
+        return evaluator.nativeBoolToBooleanObject(node.value)
+    return None
+
+# literal node for value, node itself if value can't be written as a literal
+def literal(value : object.Object, node : ast.Node) -> ast.Node:
+    if isinstance(value, object.Integer):
+        return ast.IntegerLiteral(token.Token(token.INT, str(value.value)), value.value)
+    if isinstance(value, object.String):
+        return ast.StringLiteral(token.Token(token.STRING, value.value), value.value)
+    if isinstance(value, object.Boolean):
+        literal = "true" if value.value else "false"
+        return ast.Boolean(token.Token(token.TRUE if value.value else token.FALSE, literal), value.value)
+    return node
+
+# statement that does nothing but produce a value
+def isInert(statement : ast.Statement) -> bool:
+    if not isinstance(statement, ast.ExpressionStatement):
+        return False
+    expression = statement.expression
+    if constant(expression) is not None:
+        return True
+    return (isinstance(expression, ast.IfExpression) and constant(expression.condition) is not None
+            and len(expression.consequence.statements) == 0)
+
+# fold program in place, return the number of nodes removed
+def fold(program : ast.Program) -> int:
+    before = countNodes(program)
+    Folder().foldProgram(program)
+    return before - countNodes(program)
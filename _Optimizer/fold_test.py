@@ -0,0 +1,40 @@
+from dataclasses import dataclass
+import unittest
+import _Lexer.lexer as lexer
+import _Parser.parser as parser
+import _Optimizer.fold as fold
+
+class TestFold(unittest.TestCase):
+    def testFold(self):
+        @dataclass
+        class TestCase:
+            input       : str
+            expected    : str
+            removed     : int
+
+        tests = [
+            TestCase("2 * 3 + 1", "7;", 4),
+            TestCase('"a" + "b"', "ab;", 2),
+            TestCase("-(2 * 5)", "-10;", 3),
+            TestCase("!(1 < 2)", "false;", 3),
+            TestCase("5 / 2", "2.5;", 2),
+            TestCase("x + 2 * 3", "(x + 6);", 2),
+            TestCase("1 / 0", "(1 / 0);", 0),
+            TestCase("1 + true", "(1 + true);", 0),
+            TestCase("if (1 < 2) { 1 } else { 2 }", "iftrue {1;};", 5),
+            TestCase("if (false) { 1 } else { 2 }", "iftrue {2;};", 3),
+            TestCase("if (false) { 1 }", "iffalse {};", 2),
+            TestCase("if (false) { 1 }; 3", "3;", 6),
+            TestCase("1; 2; x", "x;", 4),
+            TestCase("let f = fn() { return 1; 2; let a = 3; }", "let f = fn() {return 1;};", 5),
+            TestCase("while (x) { break; x = 1; }", "whilex {break;};", 3),
+            TestCase("false && f()", "false;", 3),
+            TestCase("true or x", "true;", 2),
+            TestCase("x && false", "(x && false);", 0),
+        ]
+
+        for elem in tests:
+            program = parser.Parser(lexer.Lexer(elem.input)).parseProgram()
+            removed = fold.fold(program)
+            self.assertEqual(program.string(), elem.expected, elem.input)
+            self.assertEqual(removed, elem.removed, elem.input)
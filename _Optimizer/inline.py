@@ -0,0 +1,299 @@
+import copy
+from typing import Dict, List, Set
+import _Ast.ast as ast
+import _Token.token as token
+from _Optimizer.nodes import children, countNodes
+from _Resolver.resolver import GLOBAL, BLOCK, LOOP, FUNCTION, CLASS, letNames
+
+# largest body (in nodes) of a function whose calls are inlined
+MAX_NODES = 32
+# most call sites of the same function that are inlined
+MAX_SITES = 32
+
+# names bound in a scope, wherever their let is
+class Scope:
+    def __init__(self, kind : str, names : Set[str]):
+        self.kind = kind
+        self.names = names
+
+# function whose calls can be inlined: the statements of its body (with the
+# final return turned into the value of the block) and the names they use
+class Candidate:
+    def __init__(self, name : str, scope : Scope, function : ast.FunctionLiteral):
+        self.name = name
+        self.scope = scope
+        self.parameters = [param.value for param in function.parameters]
+        statements = function.body.statements
+        last = statements[-1]
+        if isinstance(last, ast.ReturnStatement):
+            last = ast.ExpressionStatement(last.token, last.value)
+        self.statements = statements[:-1] + [last]
+        # names bound at the top of the body, shadowing the ones outside
+        self.bound = set(self.parameters) | letNames(statements)
+        self.names = identifiers(function.body) - set(self.parameters)
+        self.sites = 0
+
+# Inliner: replaces the calls f(a, b) of small functions bound by
+# let f = fn(x, y) { ... } with the body of the function, evaluated in a
+# new scope after binding the arguments:
+#
+#   if (true) { let x = a; let y = b; ...body... }
+#
+# which has the value of the last statement of the body, as the call.
+# Only calls that can't tell the difference are inlined:
+#  - f is bound by exactly one let, never assigned, and is not recursive;
+#  - the body ends with a return or an expression, and has no other
+#    return, nor break or continue outside of its own loops;
+#  - the call comes after the let and the names used by the body mean the
+#    same at the call as where f is defined: no scope in between binds
+#    them, and the arguments don't use the names bound by the body.
+# Methods of classes are never inlined: their names are bound in the
+# environment of each instance.
+class Inliner:
+    def __init__(self, program : ast.Program, maxNodes : int, maxSites : int, whole : bool):
+        self.maxNodes = maxNodes
+        self.maxSites = maxSites
+        # a program that is not whole shares its global names with the next ones
+        self.whole = whole
+        self.scopes = []
+        self.candidates = {}
+        self.function = "program"
+        self.report = []
+        # names bound more than once or assigned can't be trusted
+        self.lets, self.assigned = {}, set()
+        countBindings(program, self.lets, self.assigned)
+
+    def inline(self, node : ast.Node) -> ast.Node:
+        if node is None:
+            return None
+        inliner = inliners.get(type(node))
+        if inliner is None:
+            return node
+        return inliner(self, node)
+
+    def inlineStatements(self, statements : List[ast.Node]) -> List[ast.Node]:
+        return [self.inline(statement) for statement in statements]
+
+    # inline node in a new scope binding names
+    def inlineScope(self, kind : str, names : Set[str], node : ast.Node) -> ast.Node:
+        scope = Scope(kind, names)
+        self.scopes.append(scope)
+        node = self.inline(node)
+        self.scopes.pop()
+        # the functions bound in scope can't be called anymore
+        self.candidates = {name: c for name, c in self.candidates.items() if c.scope is not scope}
+        return node
+
+    def inlineProgram(self, program : ast.Program) -> ast.Program:
+        self.scopes.append(Scope(GLOBAL, letNames(program.statements)))
+        program.statements = self.inlineStatements(program.statements)
+        self.scopes.pop()
+        return program
+
+    def inlineBlockStatement(self, node : ast.BlockStatement) -> ast.BlockStatement:
+        node.statements = self.inlineStatements(node.statements)
+        return node
+
+    def inlineExpressionStatement(self, node : ast.ExpressionStatement) -> ast.Statement:
+        node.expression = self.inline(node.expression)
+        return node
+
+    def inlineLetStatement(self, node : ast.LetStatement) -> ast.Statement:
+        if not isinstance(node.value, ast.FunctionLiteral) or node.instance is not None:
+            node.value = self.inline(node.value)
+            return node
+
+        outer, self.function = self.function, node.name.value
+        node.value = self.inline(node.value)
+        self.function = outer
+        if self.inlinable(node.name.value, node.value):
+            self.candidates[node.name.value] = Candidate(node.name.value, self.scopes[-1], node.value)
+        return node
+
+    def inlineAssignStatement(self, node : ast.AssignStatement) -> ast.Statement:
+        node.value = self.inline(node.value)
+        return node
+
+    def inlineCompoundAssignStatement(self, node : ast.CompoundAssignStatement) -> ast.Statement:
+        node.value = self.inline(node.value)
+        node.target = self.inline(node.target)
+        return node
+
+    def inlineReturnStatement(self, node : ast.ReturnStatement) -> ast.Statement:
+        node.value = self.inline(node.value)
+        return node
+
+    def inlinePrefixExpression(self, node : ast.PrefixExpression) -> ast.Expression:
+        node.right = self.inline(node.right)
+        return node
+
+    def inlineInfixExpression(self, node : ast.InfixExpression) -> ast.Expression:
+        node.left = self.inline(node.left)
+        if node.operator == ".":
+            # the methods of the instance are not known
+            if isinstance(node.right, ast.CallExpression):
+                node.right.arguments = self.inlineStatements(node.right.arguments)
+            return node
+        node.right = self.inline(node.right)
+        return node
+
+    def inlineIfExpression(self, node : ast.IfExpression) -> ast.Expression:
+        node.condition = self.inline(node.condition)
+        node.consequence = self.inlineScope(BLOCK, letNames(node.consequence.statements), node.consequence)
+        if node.alternative is not None:
+            node.alternative = self.inlineScope(BLOCK, letNames(node.alternative.statements), node.alternative)
+        return node
+
+    def inlineWhileExpression(self, node : ast.WhileExpression) -> ast.Expression:
+        node.condition = self.inline(node.condition)
+        node.block = self.inlineScope(LOOP, letNames(node.block.statements), node.block)
+        return node
+
+    def inlineForExpression(self, node : ast.ForExpression) -> ast.Expression:
+        scope = Scope(LOOP, letNames(node.block.statements + [node.initial]))
+        self.scopes.append(scope)
+        node.initial = self.inline(node.initial)
+        node.condition = self.inline(node.condition)
+        node.update = self.inline(node.update)
+        node.block = self.inline(node.block)
+        self.scopes.pop()
+        self.candidates = {name: c for name, c in self.candidates.items() if c.scope is not scope}
+        return node
+
+    def inlineFunctionLiteral(self, node : ast.FunctionLiteral) -> ast.Expression:
+        names = {param.value for param in node.parameters} | letNames(node.body.statements)
+        node.body = self.inlineScope(FUNCTION, names, node.body)
+        return node
+
+    def inlineCallExpression(self, node : ast.CallExpression) -> ast.Expression:
+        node.function = self.inline(node.function)
+        node.arguments = self.inlineStatements(node.arguments)
+        if not isinstance(node.function, ast.Identifier):
+            return node
+        candidate = self.candidates.get(node.function.value)
+        if candidate is None or not self.fits(candidate, node):
+            return node
+
+        candidate.sites += 1
+        self.report.append("inline: {} in {}".format(candidate.name, self.function))
+        statements = []
+        for name, argument in zip(candidate.parameters, node.arguments):
+            let = ast.LetStatement(token.Token(token.LET, "let"), ast.Identifier(token.Token(token.IDENT, name), name), argument)
+            statements.append(let)
+        statements += copy.deepcopy(candidate.statements)
+        return ast.IfExpression(token.Token(token.IF, "if"), ast.Boolean(token.Token(token.TRUE, "true"), True),
+                                ast.BlockStatement(token.Token(token.LBRACE, "{"), statements))
+
+    def inlineArrayLiteral(self, node : ast.ArrayLiteral) -> ast.Expression:
+        node.elements = self.inlineStatements(node.elements)
+        return node
+
+    def inlineIndexExpression(self, node : ast.IndexExpression) -> ast.Expression:
+        node.left = self.inline(node.left)
+        node.index = self.inline(node.index)
+        return node
+
+    def inlineHashLiteral(self, node : ast.HashLiteral) -> ast.Expression:
+        node.pairs = {self.inline(key): self.inline(value) for key, value in node.pairs.items()}
+        return node
+
+    # whether the calls of function, bound to name here, can be inlined
+    def inlinable(self, name : str, function : ast.FunctionLiteral) -> bool:
+        scope = self.scopes[-1]
+        if scope.kind == LOOP or (scope.kind == GLOBAL and not self.whole):
+            return False
+        if self.lets.get(name) != 1 or name in self.assigned:
+            return False
+        statements = function.body.statements
+        if not statements or countNodes(function.body) > self.maxNodes:
+            return False
+        last = statements[-1]
+        if isinstance(last, ast.ReturnStatement):
+            if last.value is None:
+                return False
+        elif not isinstance(last, ast.ExpressionStatement):
+            return False
+        if any(escapes(statement) for statement in statements[:-1]) or escapes(last.value if isinstance(last, ast.ReturnStatement) else last):
+            return False
+        return name not in identifiers(function.body)
+
+    # whether call can be replaced with the body of candidate
+    def fits(self, candidate : Candidate, call : ast.CallExpression) -> bool:
+        if len(call.arguments) != len(candidate.parameters) or candidate.sites >= self.maxSites:
+            return False
+        depth = next(idx for idx, scope in enumerate(self.scopes) if scope is candidate.scope)
+        for scope in self.scopes[depth + 1:]:
+            if scope.kind == CLASS or scope.names & (candidate.names | {candidate.name}):
+                return False
+        for argument in call.arguments:
+            if identifiers(argument) & candidate.bound:
+                return False
+        return True
+
+inliners = {
+    ast.BlockStatement      : Inliner.inlineBlockStatement,
+    ast.ExpressionStatement : Inliner.inlineExpressionStatement,
+    ast.LetStatement        : Inliner.inlineLetStatement,
+    ast.AssignStatement     : Inliner.inlineAssignStatement,
+    ast.CompoundAssignStatement : Inliner.inlineCompoundAssignStatement,
+    ast.ReturnStatement     : Inliner.inlineReturnStatement,
+    ast.PrefixExpression    : Inliner.inlinePrefixExpression,
+    ast.InfixExpression     : Inliner.inlineInfixExpression,
+    ast.IfExpression        : Inliner.inlineIfExpression,
+    ast.WhileExpression     : Inliner.inlineWhileExpression,
+    ast.ForExpression       : Inliner.inlineForExpression,
+    ast.FunctionLiteral     : Inliner.inlineFunctionLiteral,
+    ast.CallExpression      : Inliner.inlineCallExpression,
+    ast.ArrayLiteral        : Inliner.inlineArrayLiteral,
+    ast.IndexExpression     : Inliner.inlineIndexExpression,
+    ast.HashLiteral         : Inliner.inlineHashLiteral,
+}
+
+# names of the identifiers in the tree rooted in node
+def identifiers(node : ast.Node) -> Set[str]:
+    names = set()
+    work = [node]
+    while work:
+        node = work.pop()
+        if isinstance(node, ast.Identifier):
+            names.add(node.value)
+        elif node is not None:
+            work += children(node)
+    return names
+
+# whether node has a return, or a break or continue outside of its loops
+def escapes(node : ast.Node, inLoop : bool = False) -> bool:
+    if node is None or isinstance(node, ast.FunctionLiteral):
+        return False
+    if isinstance(node, (ast.ReturnStatement, ast.Classliteral)):
+        return True
+    if isinstance(node, (ast.BreakStatement, ast.ContinueStatement)):
+        return not inLoop
+    inLoop = inLoop or isinstance(node, (ast.WhileExpression, ast.ForExpression))
+    return any(escapes(child, inLoop) for child in children(node))
+
+# count the let statements of each name, collect the names assigned
+def countBindings(program : ast.Program, lets : Dict[str, int], assigned : Set[str]):
+    work = [program]
+    while work:
+        node = work.pop()
+        if isinstance(node, ast.LetStatement):
+            if node.instance is None:
+                lets[node.name.value] = lets.get(node.name.value, 0) + 1
+            else:
+                assigned.add(node.instance.value)
+        elif isinstance(node, ast.AssignStatement):
+            assigned.add(node.name.value)
+        elif isinstance(node, ast.CompoundAssignStatement):
+            assigned |= identifiers(node.target)
+        elif isinstance(node, ast.AssignStatementClass):
+            assigned |= identifiers(node.name)
+        if node is not None:
+            work += children(node)
+
+# inline the calls of small functions in program (in place), return the report
+def inline(program : ast.Program, maxNodes : int = None, maxSites : int = None, whole : bool = True) -> List[str]:
+    inliner = Inliner(program, MAX_NODES if maxNodes is None else maxNodes,
+                      MAX_SITES if maxSites is None else maxSites, whole)
+    inliner.inlineProgram(program)
+    return inliner.report
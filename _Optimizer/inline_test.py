@@ -0,0 +1,58 @@
+from dataclasses import dataclass
+import unittest
+import _Lexer.lexer as lexer
+import _Parser.parser as parser
+import _Optimizer.inline as inline
+
+class TestInline(unittest.TestCase):
+    def testInline(self):
+        @dataclass
+        class TestCase:
+            input       : str
+            expected    : str
+            report      : list
+
+        tests = [
+            TestCase("let f = fn(a) { return a + 1; }; f(2)",
+                     "let f = fn(a) {return (a + 1);};iftrue {let a = 2; (a + 1);};", ["inline: f in program"]),
+            TestCase("let f = fn(a) { a }; let g = fn(b) { f(b) * 2 }",
+                     "let f = fn(a) {a;};let g = fn(b) {(iftrue {let a = b; a;} * 2);};", ["inline: f in g"]),
+            # recursive, assigned, bound twice, or called before its let
+            TestCase("let f = fn(n) { f(n - 1) }; f(1)", "let f = fn(n) {f((n - 1));};f(1);", []),
+            TestCase("let f = fn() { 1 }; f = 2; f()", "let f = fn() {1;};f = 2;f();", []),
+            TestCase("let f = fn() { 1 }; let g = fn() { let f = 2; }; f()", "let f = fn() {1;};let g = fn() {let f = 2;};f();", []),
+            TestCase("f(); let f = fn() { 1 };", "f();let f = fn() {1;};", []),
+            # returns and breaks leaving the body
+            TestCase("let f = fn(a) { if (a) { return 1; } 2 }; f(1)", "let f = fn(a) {ifa {return 1;}; 2;};f(1);", []),
+            TestCase("let f = fn() { break; 1 }; f()", "let f = fn() {break; 1;};f();", []),
+            TestCase("let f = fn() { let x = 0; while (true) { break; }; x }; f()",
+                     "let f = fn() {let x = 0; whiletrue {break;}; x;};iftrue {let x = 0; whiletrue {break;}; x;};",
+                     ["inline: f in program"]),
+            # names meaning something else at the call
+            TestCase("let x = 1; let f = fn() { x }; let g = fn() { let x = 2; f() }",
+                     "let x = 1;let f = fn() {x;};let g = fn() {let x = 2; f();};", []),
+            TestCase("let f = fn(a, b) { a - b }; let g = fn(b) { f(1, b) }",
+                     "let f = fn(a, b) {(a - b);};let g = fn(b) {f(1, b);};", []),
+            TestCase("let f = fn(a) { a }; f(1, 2)", "let f = fn(a) {a;};f(1, 2);", []),
+            TestCase("let f = fn() { 1 }; let C = class { let g = fn() { f() }; }",
+                     "let f = fn() {1;};let C = class{let g = fn() {f();};};", []),
+        ]
+
+        for elem in tests:
+            program = parser.Parser(lexer.Lexer(elem.input)).parseProgram()
+            report = inline.inline(program)
+            self.assertEqual(program.string(), elem.expected, elem.input)
+            self.assertEqual(report, elem.report, elem.input)
+
+    def testThresholds(self):
+        input = "let f = fn(a) { let b = a * 2; b + 1 }; f(1) + f(2) + f(3)"
+
+        program = parser.Parser(lexer.Lexer(input)).parseProgram()
+        self.assertEqual(len(inline.inline(program)), 3)
+        program = parser.Parser(lexer.Lexer(input)).parseProgram()
+        self.assertEqual(len(inline.inline(program, maxSites=2)), 2)
+        program = parser.Parser(lexer.Lexer(input)).parseProgram()
+        self.assertEqual(len(inline.inline(program, maxNodes=5)), 0)
+        # global functions of a REPL line may be bound again by the next ones
+        program = parser.Parser(lexer.Lexer(input)).parseProgram()
+        self.assertEqual(len(inline.inline(program, whole=False)), 0)
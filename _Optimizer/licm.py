@@ -0,0 +1,181 @@
+from typing import List, Set
+import _Ast.ast as ast
+import _Token.token as token
+import _Evaluator.builtins as builtins
+import _Evaluator.evaluator as evaluator
+from _Optimizer.nodes import children
+from _Optimizer.inline import identifiers
+from _Resolver.resolver import letNames
+
+# Hoister: loop-invariant code motion. The calls of pure builtins in the
+# condition of a loop whose value can't change while the loop runs, like
+# len(a) in
+#
+#   for (let i = 0; i < len(a); i = i + 1) { print(a[i]); }
+#
+# are evaluated once, before the loop, in a new scope around it:
+#
+#   if (true) { let $0 = len(a); for (let i = 0; i < $0; i = i + 1) { print(a[i]); } }
+#
+# An expression is invariant if it only uses literals, names that the loop
+# neither binds nor assigns, indexes and operators (not members), and the
+# builtins marked PURE in builtins.effects, under names never bound by the
+# program. Nothing is hoisted from a loop that can change a value in place:
+# one calling a function that is not a builtin, or a builtin that MUTATES,
+# or assigning an element or a member.
+#
+# Only the parts of the condition evaluated at every check are hoisted (not
+# the right operand of a logical operator): the condition is checked at
+# least once, so they were evaluated anyway. The body is left alone, since
+# moving its expressions out would evaluate them (and report their errors)
+# even when the loop runs no iteration.
+class Hoister:
+    def __init__(self, program : ast.Program, whole : bool):
+        # names that may not mean the builtin
+        self.bound = boundNames(program)
+        # a program that is not whole may have its builtins bound by the others
+        self.whole = whole
+        self.temporaries = 0
+        self.report = []
+
+    # hoist from the loops under node, the inner ones first
+    def hoist(self, node : ast.Node):
+        if node is None:
+            return
+        for child in children(node):
+            self.hoist(child)
+        if isinstance(node, ast.ExpressionStatement) and isinstance(node.expression, (ast.WhileExpression, ast.ForExpression)):
+            node.expression = self.hoistLoop(node.expression)
+
+    # the loop, or a scope binding the invariants of its condition around it
+    def hoistLoop(self, loop : ast.Expression) -> ast.Expression:
+        if not self.whole or not self.unchanging(loop):
+            return loop
+        if isinstance(loop, ast.ForExpression):
+            if not isinstance(loop.condition, ast.ExpressionStatement):
+                return loop
+            names = letNames(loop.block.statements + [loop.initial])
+        else:
+            names = letNames(loop.block.statements)
+        # names bound or assigned in the loop take new values
+        names |= assignedNames(loop)
+
+        lets = []
+        if isinstance(loop, ast.ForExpression):
+            loop.condition.expression = self.hoistExpression(loop.condition.expression, names, lets)
+        else:
+            loop.condition = self.hoistExpression(loop.condition, names, lets)
+        if not lets:
+            return loop
+        for let in lets:
+            self.report.append("licm: {} out of {}".format(let.value.string(), "for" if isinstance(loop, ast.ForExpression) else "while"))
+        statements = lets + [ast.ExpressionStatement(loop.token, loop)]
+        return ast.IfExpression(token.Token(token.IF, "if"), ast.Boolean(token.Token(token.TRUE, "true"), True),
+                                ast.BlockStatement(token.Token(token.LBRACE, "{"), statements))
+
+    # node with its invariants replaced by temporaries bound by lets, in
+    # the order node evaluates them
+    def hoistExpression(self, node : ast.Expression, names : Set[str], lets : List[ast.Statement]) -> ast.Expression:
+        if self.invariant(node, names) and self.hasCall(node):
+            name = "${}".format(self.temporaries)
+            self.temporaries += 1
+            lets.append(ast.LetStatement(token.Token(token.LET, "let"), ast.Identifier(token.Token(token.IDENT, name), name), node))
+            return ast.Identifier(token.Token(token.IDENT, name), name)
+
+        if isinstance(node, ast.PrefixExpression):
+            node.right = self.hoistExpression(node.right, names, lets)
+        elif isinstance(node, ast.InfixExpression) and node.operator != ".":
+            if node.operator in evaluator.shortCircuit:
+                node.left = self.hoistExpression(node.left, names, lets)
+            else:
+                node.right = self.hoistExpression(node.right, names, lets)
+                node.left = self.hoistExpression(node.left, names, lets)
+        elif isinstance(node, ast.IndexExpression):
+            node.left = self.hoistExpression(node.left, names, lets)
+            node.index = self.hoistExpression(node.index, names, lets)
+        elif isinstance(node, ast.CallExpression) and self.builtin(node.function) is not None:
+            node.arguments = [self.hoistExpression(arg, names, lets) for arg in node.arguments]
+        return node
+
+    # whether node has the same value whenever the loop checks its condition
+    def invariant(self, node : ast.Expression, names : Set[str]) -> bool:
+        if isinstance(node, (ast.IntegerLiteral, ast.StringLiteral, ast.Boolean)):
+            return True
+        if isinstance(node, ast.Identifier):
+            return node.value not in names
+        if isinstance(node, ast.PrefixExpression):
+            return self.invariant(node.right, names)
+        if isinstance(node, ast.InfixExpression):
+            return node.operator != "." and self.invariant(node.left, names) and self.invariant(node.right, names)
+        if isinstance(node, ast.IndexExpression):
+            return self.invariant(node.left, names) and self.invariant(node.index, names)
+        if isinstance(node, ast.CallExpression):
+            return (self.builtin(node.function) == builtins.PURE
+                    and all(self.invariant(arg, names) for arg in node.arguments))
+        return False
+
+    def hasCall(self, node : ast.Node) -> bool:
+        if isinstance(node, ast.CallExpression):
+            return True
+        return any(self.hasCall(child) for child in children(node) if child is not None)
+
+    # effect of the builtin called by function, None if it's not one
+    def builtin(self, function : ast.Expression) -> str:
+        if not isinstance(function, ast.Identifier) or function.value in self.bound:
+            return None
+        return builtins.effects.get(function.value)
+
+    # whether nothing in loop changes a value in place
+    def unchanging(self, loop : ast.Expression) -> bool:
+        work = [loop]
+        while work:
+            node = work.pop()
+            if node is None:
+                continue
+            if isinstance(node, ast.CallExpression):
+                if self.builtin(node.function) in (None, builtins.MUTATES):
+                    return False
+            elif isinstance(node, ast.InfixExpression) and node.operator == "." and isinstance(node.right, ast.CallExpression):
+                return False
+            elif isinstance(node, ast.CompoundAssignStatement) and not isinstance(node.target, ast.Identifier):
+                return False
+            elif isinstance(node, ast.LetStatement) and node.instance is not None:
+                return False
+            elif isinstance(node, (ast.AssignStatementClass, ast.Classliteral)):
+                return False
+            work += children(node)
+        return True
+
+# names bound by let or as parameters anywhere in program
+def boundNames(program : ast.Program) -> Set[str]:
+    names = set()
+    work = [program]
+    while work:
+        node = work.pop()
+        if isinstance(node, ast.LetStatement) and node.instance is None:
+            names.add(node.name.value)
+        elif isinstance(node, ast.FunctionLiteral):
+            names |= {param.value for param in node.parameters}
+        if node is not None:
+            work += children(node)
+    return names
+
+# names assigned anywhere in node
+def assignedNames(node : ast.Node) -> Set[str]:
+    names = set()
+    work = [node]
+    while work:
+        node = work.pop()
+        if isinstance(node, ast.AssignStatement):
+            names.add(node.name.value)
+        elif isinstance(node, ast.CompoundAssignStatement):
+            names |= identifiers(node.target)
+        if node is not None:
+            work += children(node)
+    return names
+
+# hoist the invariants out of the loops of program (in place), return the report
+def hoist(program : ast.Program, whole : bool = True) -> List[str]:
+    hoister = Hoister(program, whole)
+    hoister.hoist(program)
+    return hoister.report
@@ -0,0 +1,57 @@
+from dataclasses import dataclass
+import unittest
+import _Lexer.lexer as lexer
+import _Parser.parser as parser
+import _Object.object as object
+import _Resolver.resolver as resolver
+import _Evaluator.evaluator as evaluator
+import _Evaluator.builtins as builtins
+import _Optimizer.licm as licm
+
+class TestLicm(unittest.TestCase):
+    def testEffects(self):
+        self.assertEqual(set(builtins.effects), set(builtins.builtins))
+
+    def testHoist(self):
+        @dataclass
+        class TestCase:
+            input       : str
+            expected    : str
+
+        tests = [
+            TestCase("for (let i = 0; i < len(a) - 1; i = i + 1) { print(a[i]); }",
+                     "iftrue {let $0 = (len(a) - 1); for( let i = 0;; (i < $0);; i = (i + 1);){print((a[i]));};};"),
+            TestCase("while (first(a) + i > len(b)) { i += 1; }",
+                     "iftrue {let $0 = len(b); let $1 = first(a); while(($1 + i) > $0) {i += 1;};};"),
+            TestCase("while (x && len(b) > 0) { x = false; }", "while(x && (len(b) > 0)) {x = false;};"),
+            TestCase("while (len(b) > 0 && x) { x = false; }", "iftrue {let $0 = (len(b) > 0); while($0 && x) {x = false;};};"),
+            TestCase("while (i < len(a)) { i = i + 1; }", "iftrue {let $0 = len(a); while(i < $0) {i = (i + 1);};};"),
+            # values changed by the loop
+            TestCase("while (i < len(a)) { a = rest(a); }", "while(i < len(a)) {a = rest(a);};"),
+            TestCase("while (i < len(a)) { let a = 1; }", "while(i < len(a)) {let a = 1;};"),
+            TestCase("for (let a = [1]; 0 < len(a); a += [2]) { }", "for( let a = [1];; (0 < len(a));; a += [2];){};"),
+            TestCase("while (i < len(a)) { push(a, 1); }", "while(i < len(a)) {push(a, 1);};"),
+            TestCase("while (i < len(a)) { a[0] += 1; }", "while(i < len(a)) {(a[0]) += 1;};"),
+            TestCase("while (i < len(a)) { f(); }", "while(i < len(a)) {f();};"),
+            TestCase("while (i < len(a)) { o.f(); }", "while(i < len(a)) {(o . f());};"),
+            # not pure, or not the builtin
+            TestCase("while (input() != len(a)) { }", "iftrue {let $0 = len(a); while(input() != $0) {};};"),
+            TestCase("let len = fn(x) { 1 }; while (i < len(a)) { }", "let len = fn(x) {1;};while(i < len(a)) {};"),
+        ]
+
+        for elem in tests:
+            program = parser.Parser(lexer.Lexer(elem.input)).parseProgram()
+            licm.hoist(program)
+            self.assertEqual(program.string(), elem.expected, elem.input)
+
+    def testNestedLoops(self):
+        input = """
+        let a = [1, 2, 3]; let t = 0;
+        for (let i = 0; i < len(a); i = i + 1) {
+            for (let j = i; j < len(a); j = j + 1) { t = t + a[j]; }
+        }; t"""
+        program = parser.Parser(lexer.Lexer(input)).parseProgram()
+        self.assertEqual(licm.hoist(program), ["licm: len(a) out of for", "licm: len(a) out of for"])
+        env = object.Environment()
+        resolver.resolve(program, env)
+        self.assertEqual(evaluator.Eval(program, env).value, 14)
@@ -0,0 +1,62 @@
+from typing import List
+import _Ast.ast as ast
+import _Evaluator.evaluator as evaluator
+
+# direct children of a node, in evaluation order where it matters
+def children(node) -> List[ast.Node]:
+    if isinstance(node, ast.Program):
+        return list(node.statements)
+    if isinstance(node, ast.ExpressionStatement):
+        return [node.expression]
+    if isinstance(node, ast.LetStatement):
+        return [node.name, node.instance, node.value]
+    if isinstance(node, (ast.AssignStatement, ast.AssignStatementClass)):
+        return [node.name, node.value]
+    if isinstance(node, ast.CompoundAssignStatement):
+        return [node.value, node.target]
+    if isinstance(node, ast.ReturnStatement):
+        return [node.value]
+    if isinstance(node, ast.PrefixExpression):
+        return [node.right]
+    if isinstance(node, ast.InfixExpression):
+        if node.operator in evaluator.shortCircuit:
+            return [node.left, node.right]
+        return [node.right, node.left]
+    if isinstance(node, ast.BlockStatement):
+        return list(node.statements)
+    if isinstance(node, ast.IfExpression):
+        return [node.condition, node.consequence, node.alternative]
+    if isinstance(node, ast.FunctionLiteral):
+        return node.parameters + [node.body]
+    if isinstance(node, ast.CallExpression):
+        return [node.function] + node.arguments
+    if isinstance(node, ast.ArrayLiteral):
+        return list(node.elements)
+    if isinstance(node, ast.IndexExpression):
+        return [node.left, node.index]
+    if isinstance(node, ast.HashLiteral):
+        pairs = []
+        for key, value in node.pairs.items():
+            pairs += [key, value]
+        return pairs
+    if isinstance(node, ast.WhileExpression):
+        return [node.condition, node.block]
+    if isinstance(node, ast.ForExpression):
+        return [node.initial, node.condition, node.update, node.block]
+    if isinstance(node, ast.Classliteral):
+        return [node.body]
+    return []
+
+# number of nodes of the tree rooted in node
+def countNodes(node) -> int:
+    if node is None:
+        return 0
+    count = 0
+    work = [node]
+    while work:
+        node = work.pop()
+        if node is None:
+            continue
+        count += 1
+        work += children(node)
+    return count
@@ -0,0 +1,24 @@
+from typing import List
+import _Ast.ast as ast
+import _Optimizer.fold as fold
+import _Optimizer.inline as inline
+import _Optimizer.licm as licm
+
+# run the optimization passes on program (in place), return their report;
+# a program that is not whole (a line of the REPL) shares its global names
+# with the programs that follow it
+def optimize(program : ast.Program, whole : bool = True) -> List[str]:
+    report = []
+
+    sites = inline.inline(program, whole=whole)
+    report += sites
+    report.append("inline: {} call sites inlined".format(len(sites)))
+
+    hoisted = licm.hoist(program, whole=whole)
+    report += hoisted
+    report.append("licm: {} expressions hoisted".format(len(hoisted)))
+
+    removed = fold.fold(program)
+    report.append("fold: {} nodes removed".format(removed))
+
+    return report
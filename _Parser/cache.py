@@ -0,0 +1,215 @@
+import gc
+import hashlib
+import marshal
+import os
+import sys
+from typing import Callable, List, Tuple
+import _Ast.ast as ast
+import _Object.object as object
+import _Token.token as token
+import _Lexer.lexer as lexer
+import _Parser.parser as parser
+
+# Cache of parsed programs: the ast.Program of a script is written to a
+# file, as python does with .pyc files, and loaded instead of lexing and
+# parsing the script again while its content doesn't change:
+#
+#   MAGIC | key (32 bytes) | marshal of (tokens, program)
+#
+# The key is a hash of the content of the script, of the interpreter
+# version and of the sources of the modules shaping the tree (token, lexer,
+# parser, ast), so a file made by another version is never loaded.
+#
+# The tree is made of marshal values only: a node is the tuple of the index
+# of its class in CLASSES and the values of its slots, in order, its token
+# an index in the list of the distinct (type, literal) pairs of the program
+# (None for no token).
+# Loading it builds the nodes with a decoder made once for each class.
+# Programs with parser errors are not cached.
+
+# version of the interpreter (see the changelog)
+VERSION = "1.3"
+# False disables the cache
+ENABLED = True
+# directory of the cache files, None for CACHE_SUBDIR next to each script
+CACHE_DIR = None
+CACHE_SUBDIR = "__monkeycache__"
+
+MAGIC = b"YAMI"
+
+# node classes, in the order of the module
+CLASSES = [cls for cls in vars(ast).values()
+           if isinstance(cls, type) and cls.__module__ == ast.__name__ and cls.__slots__]
+
+# tags of the values that are not nodes, below the class indexes
+PAIRS = -1
+STRING = -2
+INTEGER = -3
+
+# hash of the interpreter version and of the modules shaping the tree,
+# computed once
+fingerprint = None
+
+def getFingerprint() -> bytes:
+    global fingerprint
+    if fingerprint is None:
+        digest = hashlib.sha256(VERSION.encode())
+        digest.update(bytes(sys.version_info[:2]))
+        for module in (token, lexer, parser, ast):
+            with open(module.__file__, "rb") as f:
+                digest.update(f.read())
+        fingerprint = digest.digest()
+    return fingerprint
+
+# key of the program parsed from source
+def key(source : str) -> bytes:
+    return hashlib.sha256(getFingerprint() + source.encode("utf-8", "surrogatepass")).digest()
+
+# file caching the program of the script in path
+def cachePath(path : str) -> str:
+    path = os.path.abspath(path)
+    if CACHE_DIR is None:
+        return os.path.join(os.path.dirname(path), CACHE_SUBDIR, os.path.basename(path) + ".ast")
+    # scripts with the same name in different directories don't share it
+    tag = hashlib.sha256(path.encode("utf-8", "surrogatepass")).hexdigest()[:16]
+    return os.path.join(CACHE_DIR, "{}-{}.ast".format(os.path.basename(path), tag))
+
+# program as marshal values
+class Encoder:
+    def __init__(self):
+        self.classes = {cls: idx for idx, cls in enumerate(CLASSES)}
+        self.tokens = {}
+
+    def encode(self, value):
+        cls = value.__class__
+        idx = self.classes.get(cls)
+        if idx is not None:
+            values = [idx]
+            for name in cls.__slots__:
+                if name == "token":
+                    # some nodes made by the parser have none
+                    tok = value.token
+                    pair = None if tok is None else (tok.type, tok.literal)
+                    values.append(self.tokens.setdefault(pair, len(self.tokens)))
+                else:
+                    values.append(self.encode(getattr(value, name)))
+            return tuple(values)
+        if cls is list:
+            return [self.encode(elem) for elem in value]
+        if cls is dict:
+            return (PAIRS, [self.encode(elem) for pair in value.items() for elem in pair])
+        # the values the parser gives to literal keys of hashes
+        if cls is object.String:
+            return (STRING, value.value)
+        if cls is object.Integer:
+            return (INTEGER, value.value)
+        if value is None or cls in (bool, int, float, str):
+            return value
+        raise ValueError("can't cache a {}".format(cls.__name__))
+
+# function building the program from its marshal values and tokens, made once
+decoder = None
+
+def getDecoder() -> Callable:
+    global decoder
+    if decoder is None:
+        lines = ["def decoder(tokens):",
+                 "    def decode(value):",
+                 "        cls = value.__class__",
+                 "        if cls is tuple:",
+                 "            return decoders[value[0]](value)",
+                 "        if cls is list:",
+                 "            return [decode(elem) for elem in value]",
+                 "        return value"]
+        # a node from its tuple: each slot set by name, values that are
+        # not nested taken as they are
+        for idx, cls in enumerate(CLASSES):
+            lines.append("    def decode{}(value):".format(idx))
+            lines.append("        node = C{0}.__new__(C{0})".format(idx))
+            for position, name in enumerate(cls.__slots__, 1):
+                if name == "token":
+                    lines.append("        node.token = tokens[value[{}]]".format(position))
+                else:
+                    lines.append("        elem = value[{}]".format(position))
+                    lines.append("        node.{} = decode(elem) if elem.__class__ is tuple or elem.__class__ is list else elem".format(name))
+            lines.append("        return node")
+        lines += ["    def decodePairs(value):",
+                  "        elems = [decode(elem) for elem in value[1]]",
+                  "        return dict(zip(elems[::2], elems[1::2]))",
+                  "    def decodeString(value):",
+                  "        return String(value[1])",
+                  "    def decodeInteger(value):",
+                  "        return integer(value[1])",
+                  "    decoders = {{{}, PAIRS: decodePairs, STRING: decodeString, INTEGER: decodeInteger}}".format(
+                      ", ".join("{0}: decode{0}".format(idx) for idx in range(len(CLASSES)))),
+                  "    return decode"]
+        namespace = {"String": object.String, "integer": object.integer, "PAIRS": PAIRS, "STRING": STRING, "INTEGER": INTEGER}
+        namespace.update(("C{}".format(idx), cls) for idx, cls in enumerate(CLASSES))
+        exec(compile("\n".join(lines), "<cache>", "exec"), namespace)
+        decoder = namespace["decoder"]
+    return decoder
+
+# program of source cached for the script in path, None if there isn't
+# one for this content and version
+def load(path : str, source : str) -> ast.Program:
+    try:
+        with open(cachePath(path), "rb") as f:
+            data = f.read()
+    except OSError:
+        return None
+    header = MAGIC + key(source)
+    if not data.startswith(header):
+        return None
+
+    # the many objects made at once would start collections finding
+    # nothing to free
+    collecting = gc.isenabled()
+    gc.disable()
+    try:
+        tokens, program = marshal.loads(data[len(header):])
+        program = getDecoder()([None if pair is None else token.Token(*pair) for pair in tokens])(program)
+    # a damaged file is parsed again
+    except Exception:
+        return None
+    finally:
+        if collecting:
+            gc.enable()
+    return program if isinstance(program, ast.Program) else None
+
+# cache program, parsed from source, for the script in path: a file that
+# can't be written is not an error, the script is parsed again next time
+def store(path : str, source : str, program : ast.Program):
+    try:
+        encoder = Encoder()
+        encoded = encoder.encode(program)
+        data = MAGIC + key(source) + marshal.dumps((list(encoder.tokens), encoded))
+    except (ValueError, RecursionError):
+        return
+    cache = cachePath(path)
+    temporary = "{}.{}.tmp".format(cache, os.getpid())
+    try:
+        os.makedirs(os.path.dirname(cache), exist_ok=True)
+        with open(temporary, "wb") as f:
+            f.write(data)
+        # readers never see a file being written
+        os.replace(temporary, cache)
+    except OSError:
+        try:
+            os.remove(temporary)
+        except OSError:
+            pass
+
+# program of source, read from the script in path, and the parser errors:
+# loaded from the cache if possible, else parsed (and cached)
+def parse(path : str, source : str) -> Tuple[ast.Program, List[str]]:
+    if ENABLED:
+        program = load(path, source)
+        if program is not None:
+            return program, []
+
+    p = parser.Parser(lexer.Lexer(source))
+    program = p.parseProgram()
+    errors = p.getErrors()
+    if ENABLED and not errors:
+        store(path, source, program)
+    return program, errors
@@ -0,0 +1,96 @@
+import glob
+import os
+import shutil
+import tempfile
+import unittest
+import _Parser.parser as parser
+import _Parser.cache as cache
+import _Object.object as object
+import _Evaluator.evaluator as evaluator
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+class TestCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cacheDir, cache.CACHE_DIR = cache.CACHE_DIR, None
+        self.path = os.path.join(self.directory, "script.mon")
+
+    def tearDown(self):
+        cache.CACHE_DIR = self.cacheDir
+        shutil.rmtree(self.directory)
+
+    def testRoundTrip(self):
+        sources = ['let h = {"a": 1, 2: 3.5}; h["a"] + h[2]']
+        for path in sorted(glob.glob(os.path.join(ROOT, "_Test", "*.mon"))):
+            with open(path, encoding="utf-8") as f:
+                sources.append(f.read())
+        for source in sources:
+            program, errors = cache.parse(self.path, source)
+            self.assertEqual(errors, [])
+            loaded = cache.load(self.path, source)
+            self.assertIsNotNone(loaded)
+            self.assertIsNot(loaded, program)
+            self.assertEqual(loaded.string(), program.string())
+            if source is sources[0]:
+                # literal keys of hashes are found again
+                self.assertEqual(evaluator.Eval(loaded, object.Environment()).inspect(), "4.5")
+        self.assertTrue(os.path.exists(os.path.join(self.directory, cache.CACHE_SUBDIR, "script.mon.ast")))
+
+    def testKey(self):
+        source = "let x = 1; x"
+        cache.parse(self.path, source)
+        self.assertIsNotNone(cache.load(self.path, source))
+        self.assertIsNone(cache.load(self.path, "let x = 2; x"))
+
+        # another interpreter version
+        version, fingerprint = cache.VERSION, cache.fingerprint
+        cache.VERSION, cache.fingerprint = "0.0", None
+        try:
+            self.assertIsNone(cache.load(self.path, source))
+        finally:
+            cache.VERSION, cache.fingerprint = version, fingerprint
+
+    def testDamaged(self):
+        source = "let x = 1; x"
+        cache.parse(self.path, source)
+        path = cache.cachePath(self.path)
+        with open(path, "rb") as f:
+            data = f.read()
+        with open(path, "wb") as f:
+            f.write(data[:-5])
+        self.assertIsNone(cache.load(self.path, source))
+        # parsed again, and cached again
+        program, errors = cache.parse(self.path, source)
+        self.assertEqual(program.string(), "let x = 1;x;")
+        self.assertIsNotNone(cache.load(self.path, source))
+
+    def testParse(self):
+        source = "let f = fn(x) { x * 2 }; f(21)"
+        cache.parse(self.path, source)
+        parse = parser.Parser.parseProgram
+        parser.Parser.parseProgram = None
+        try:
+            program, errors = cache.parse(self.path, source)
+        finally:
+            parser.Parser.parseProgram = parse
+        self.assertEqual(errors, [])
+        self.assertEqual(evaluator.Eval(program, object.Environment()).value, 42)
+
+        # with errors, nothing is cached
+        program, errors = cache.parse(self.path, "let = 1;")
+        self.assertNotEqual(errors, [])
+        self.assertIsNone(cache.load(self.path, "let = 1;"))
+
+    def testCacheDir(self):
+        cache.CACHE_DIR = os.path.join(self.directory, "cache")
+        other = os.path.join(self.directory, "other", "script.mon")
+        cache.parse(self.path, "1")
+        cache.parse(other, "2")
+        self.assertEqual(len(os.listdir(cache.CACHE_DIR)), 2)
+        self.assertEqual(cache.load(self.path, "1").string(), "1;")
+        self.assertEqual(cache.load(other, "2").string(), "2;")
+        self.assertFalse(os.path.exists(os.path.join(self.directory, cache.CACHE_SUBDIR)))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,6 +2,7 @@ from cmath import exp
 from typing import List
 import _Ast.ast as ast
 import _Lexer.lexer as lexer
+import _Object.object as object
 import _Token.token as token
 from _Parser.priority import *
 
@@ -85,6 +86,11 @@ class Parser:
             return self.parseAssignStatement()
         elif self.curToken.type == token.BREAK or self.curToken.type == token.CONTINUE:
             return self.parseBreakContinueStatement()
+        elif self.curToken.type == token.INCREMENT or self.curToken.type == token.DECREMENT:
+            # ++target, --target
+            tok = self.curToken
+            self.nextToken()
+            return self.parseCompoundAssignStatement(tok, self.parseExpression(PREFIX))
         else:
             return self.parseExpressionStatement()
     
@@ -174,6 +180,11 @@ class Parser:
         stmt = ast.ExpressionStatement(self.curToken)
         stmt.expression = self.parseExpression(LOWEST)
 
+        # target op= value, target++, target--
+        if self.peekToken.type in compoundOperators:
+            self.nextToken()
+            return self.parseCompoundAssignStatement(self.curToken, stmt.expression)
+
         if self.peekTokenIs(token.SEMICOLON):
             self.nextToken()
         
@@ -426,6 +437,12 @@ class Parser:
 
             value = self.parseExpression(LOWEST)
             hash.pairs[key] = value
+
+            # a literal key gets its value right away
+            if isinstance(key, ast.StringLiteral):
+                key.constant = object.String(key.value)
+            elif isinstance(key, ast.IntegerLiteral):
+                key.constant = object.integer(key.value)
         
             if not self.peekTokenIs(token.RBRACE) and not self.expectPeek(token.COMMA):
                 return None
@@ -481,6 +498,24 @@ class Parser:
         
         return stmt
     
+    # parse the value of a compound assignment of target, given its operator
+    def parseCompoundAssignStatement(self, tok : token.Token, target : ast.Expression) -> ast.CompoundAssignStatement:
+        if not isAssignable(target):
+            self.errors.append("can't apply {} to {}".format(tok.literal, target.string() if target is not None else None))
+            return None
+
+        stmt = ast.CompoundAssignStatement(tok, target, compoundOperators[tok.type])
+        if tok.type == token.INCREMENT or tok.type == token.DECREMENT:
+            stmt.value = ast.IntegerLiteral(token.newToken(token.INT, "1"), 1)
+        else:
+            self.nextToken()
+            stmt.value = self.parseExpression(LOWEST)
+
+        if self.peekTokenIs(token.SEMICOLON):
+            self.nextToken()
+
+        return stmt
+
     def parseBreakContinueStatement(self) -> ast.Statement:
         stmt = None
         if self.curTokenIs(token.BREAK):
@@ -546,4 +581,22 @@ class Parser:
         lit.body = self.parseBlockStatement()
 
         return lit
-        
\ No newline at end of file
+        
+
+# infix operator applied by each compound assignment token
+compoundOperators = {
+    token.PLUS_ASSIGN       : "+",
+    token.MINUS_ASSIGN      : "-",
+    token.ASTERISK_ASSIGN   : "*",
+    token.SLASH_ASSIGN      : "/",
+    token.MODULUS_ASSIGN    : "%",
+    token.INCREMENT         : "+",
+    token.DECREMENT         : "-",
+}
+
+# whether expression can be the target of a compound assignment
+def isAssignable(expression : ast.Expression) -> bool:
+    if isinstance(expression, (ast.Identifier, ast.IndexExpression)):
+        return True
+    return (isinstance(expression, ast.InfixExpression) and expression.operator == "."
+            and isinstance(expression.left, ast.Identifier) and isinstance(expression.right, ast.Identifier))
@@ -456,6 +456,8 @@ class TestParser(unittest.TestCase):
             self.checkInstanceOf(key, ast.StringLiteral)
             expectedValue = expected[key.string()]
             self.integerLiteral(value, expectedValue)
+            # the key object is made by the parser
+            self.assertEqual(key.constant.value, key.string())
 
     def testParsingEmptyHashLiterals(self):
         input = '{}'
@@ -557,6 +559,42 @@ class TestParser(unittest.TestCase):
             val = stmt.value
             self.literalExpression(val, elem.expectedValue)
 
+    def testCompoundAssignStatements(self):
+        @dataclass
+        class TestCase:
+            input :     str
+            expected :  str
+            operator :  str
+
+        tests = [
+            TestCase("x += 5", "x += 5;", "+"),
+            TestCase("x -= y * 2;", "x -= (y * 2);", "-"),
+            TestCase("arr[i] *= 2", "(arr[i]) *= 2;", "*"),
+            TestCase("obj.count /= 2", "(obj . count) /= 2;", "/"),
+            TestCase("x %= 3", "x %= 3;", "%"),
+            TestCase("i++", "i++;", "+"),
+            TestCase("arr[0]--;", "(arr[0])--;", "-"),
+            TestCase("++obj.count", "(obj . count)++;", "+"),
+            TestCase("--i", "i--;", "-"),
+        ]
+
+        for elem in tests:
+            p = Parser(Lexer(elem.input))
+            program = p.parseProgram()
+            self.checkParserErrors(p)
+
+            self.checkLen(program.statements, 1)
+            stmt = program.statements[0]
+            self.checkInstanceOf(stmt, CompoundAssignStatement)
+            self.assertEqual(stmt.string(), elem.expected)
+            self.assertEqual(stmt.operator, elem.operator)
+
+        # only names, elements and fields can be updated
+        for input in ["1 += 2", "f() ++", "a.f() -= 1", "--5"]:
+            p = Parser(Lexer(input))
+            p.parseProgram()
+            self.assertEqual(len(p.getErrors()), 1, input)
+
     def testBreakStatement(self):
         input = "break;"
 
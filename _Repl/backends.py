@@ -0,0 +1,15 @@
+import _Evaluator.evaluator as evaluator
+import _Vm.vm as vm
+import _Closure.closure as closure
+import _Stack.stack as stack
+
+# execution backends selectable from the command line: each one takes a
+# parsed program and an environment and returns the resulting object
+backends = {
+    "eval"    : evaluator.Eval,
+    "vm"      : vm.run,
+    "closure" : closure.run,
+    "stack"   : stack.run,
+}
+
+DEFAULT = "eval"
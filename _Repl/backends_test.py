@@ -0,0 +1,97 @@
+import os
+import shutil
+import tempfile
+import _Ast.ast as ast
+import _Object.object as object
+import _Evaluator.evaluator as evaluator
+import _Optimizer.fold as fold
+import _Optimizer.inline as inline
+import _Optimizer.licm as licm
+import _Optimizer.optimizer as optimizer
+import _Parser.cache as cache
+import _Jit.emit as emit
+import _Repl.backends as backends
+import _Evaluator.evaluator_test as evaluator_test
+from _Evaluator.evaluator_test import resolved
+
+# The evaluator test suite, run by every backend on the programs prepared
+# by each of the options (see evaluator_test.ProgramTest), plus the ways of
+# running programs that only the eval backend has.
+
+def folded(test, program : ast.Program, env : object.Environment) -> ast.Program:
+    fold.fold(program)
+    return program
+
+def inlined(test, program : ast.Program, env : object.Environment) -> ast.Program:
+    inline.inline(program)
+    return program
+
+def hoisted(test, program : ast.Program, env : object.Environment) -> ast.Program:
+    licm.hoist(program)
+    return program
+
+# all the passes, as --optimize runs them
+def optimized(test, program : ast.Program, env : object.Environment) -> ast.Program:
+    optimizer.optimize(program)
+    return program
+
+# the program written to the cache and loaded back
+def cached(test, program : ast.Program, env : object.Environment) -> ast.Program:
+    directory = tempfile.mkdtemp()
+    test.addCleanup(shutil.rmtree, directory)
+    path, source = os.path.join(directory, "test.mon"), program.string()
+    cache.store(path, source, program)
+    loaded = cache.load(path, source)
+    # programs the encoder can't write are run as they are
+    return program if loaded is None else loaded
+
+# every function compiled by the jit at its first call
+def jitted(test, program : ast.Program, env : object.Environment) -> ast.Program:
+    test.addCleanup(setattr, evaluator, "JIT_THRESHOLD", evaluator.JIT_THRESHOLD)
+    evaluator.JIT_THRESHOLD = 1
+    return program
+
+# backend running the python module emitted for the program
+def emitted(program : ast.Program, env : object.Environment) -> object.Object:
+    namespace = {"__name__": "emitted"}
+    exec(compile(emit.emitPython(program), "<emitted>", "exec"), namespace)
+    return emit.run(namespace["program"])
+
+options = {
+    "Plain"     : (),
+    "Resolved"  : (resolved,),
+    "Folded"    : (folded, resolved),
+    "Inlined"   : (inlined, resolved),
+    "Hoisted"   : (hoisted, resolved),
+    "Optimized" : (optimized, resolved),
+    "Cached"    : (cached, resolved),
+}
+
+for name, backend in backends.backends.items():
+    for option, passes in options.items():
+        # Eval on the parsed program is evaluator_test.TestEvaluator
+        if backend is evaluator.Eval and not passes:
+            continue
+        globals()["Test{}{}".format(name.capitalize(), option)] = evaluator_test.suite(backend, *passes)
+
+TestEvalJitted = evaluator_test.suite(evaluator.Eval, jitted, resolved)
+TestEmitted = evaluator_test.suite(emitted)
+
+# programs whose backends and options must all give the same value
+class TestAgreement(evaluator_test.ProgramTest):
+    def testLaterLet(self):
+        tests = [
+            ('let x = "outer"; let k = fn() { let show = fn() { x }; let x = "inner"; show() }; k();', "inner"),
+            ('let x = "global"; let h = fn() { let f = fn() { x }; let x = "local"; f() }; h();', "local"),
+            ('let x = "outer"; let k = fn() { if (true) { let show = fn() { x }; let x = "inner"; show() } }; k();', "inner"),
+            ('let x = "outer"; let h = fn() { x }; let g = fn() { let x = "local"; h() }; g();', "outer"),
+            ('let k = fn() { let show = fn() { x }; show() }; let x = "global"; k();', "global"),
+        ]
+
+        runs = [(backend, passes) for backend in backends.backends.values() for passes in options.values()]
+        runs += [(evaluator.Eval, (jitted, resolved)), (emitted, ())]
+        for input, expected in tests:
+            for self.backend, self.options in runs:
+                with self.subTest(input=input, backend=self.backend.__name__, options=self.options):
+                    evaluated = self.eval(input)
+                    self.typeObject(evaluated, expected, object.String)
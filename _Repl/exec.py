@@ -1,32 +1,68 @@
 import os
-import _Lexer.lexer as lexer
-import _Parser.parser as parser
+import sys
+import _Parser.cache as cache
 import _Object.object as object
-import _Evaluator.evaluator as evaluator
+import _Resolver.resolver as resolver
+import _Optimizer.optimizer as optimizer
+import _Repl.backends as backends
+import _Jit.jit as jit
+import _Jit.emit as emit
 
-def start(path : str):
+def start(path : str, backend : str = backends.DEFAULT, optimize : bool = False, report : bool = False):
     filePath = os.getcwd() + "/" + str(path)
     if not os.path.exists(filePath):
         print("File not found!")
         return
     
-    with open(filePath, 'r', encoding="ASCII") as f:
+    with open(filePath, 'r', encoding="utf-8") as f:
         lines = f.read()
         env = object.Environment()
 
-        l = lexer.Lexer(lines)   
-        p = parser.Parser(l)
-
-        program = p.parseProgram()
-        if len(p.getErrors()) != 0:
-            printParserErrors(p.getErrors())
+        # parsed once for each content of the file
+        program, errors = cache.parse(filePath, lines)
+        if len(errors) != 0:
+            printParserErrors(errors)
     
-        evaluated = evaluator.Eval(program, env)
+        if optimize:
+            changes = optimizer.optimize(program)
+            if report:
+                printReport(changes)
+        resolver.resolve(program, env)
+        evaluated = backends.backends[backend](program, env)
         if evaluated is not None:
             res = evaluated.inspect()
             if res != "null":
                 print(evaluated.inspect())
 
-def printParserErrors(errors):
+# print the python module running the program in path (see _Jit/emit.py);
+# when there is none, the errors go to stderr and the exit status is 1
+def emitPython(path : str, optimize : bool = False, report : bool = False):
+    filePath = os.getcwd() + "/" + str(path)
+    if not os.path.exists(filePath):
+        print("File not found!", file=sys.stderr)
+        sys.exit(1)
+
+    with open(filePath, 'r', encoding="utf-8") as f:
+        program, errors = cache.parse(filePath, f.read())
+    if len(errors) != 0:
+        printParserErrors(errors, sys.stderr)
+        sys.exit(1)
+
+    if optimize:
+        changes = optimizer.optimize(program)
+        if report:
+            printReport(changes)
+    try:
+        module = emit.emitPython(program, path)
+    except jit.Unsupported as error:
+        print("Can't compile {} to python: {}".format(path, error), file=sys.stderr)
+        sys.exit(1)
+    print(module)
+
+def printParserErrors(errors, file=sys.stdout):
     for msg in errors:
-        print("\t" + msg)
\ No newline at end of file
+        print("\t" + msg, file=file)
+
+def printReport(lines):
+    for line in lines:
+        print(line, file=sys.stderr)
@@ -1,11 +1,14 @@
+import sys
 import _Lexer.lexer as lexer
 import _Parser.parser as parser
 import _Object.object as object
-import _Evaluator.evaluator as evaluator
+import _Resolver.resolver as resolver
+import _Optimizer.optimizer as optimizer
+import _Repl.backends as backends
 
 PROMPT = ">> "
 
-def start():
+def start(backend : str = backends.DEFAULT, optimize : bool = False, report : bool = False):
 
     env = object.Environment()
 
@@ -18,7 +21,12 @@ def start():
         if len(p.getErrors()) != 0:
             printParserErrors(p.getErrors())
         
-        evaluated = evaluator.Eval(program, env)
+        if optimize:
+            changes = optimizer.optimize(program, whole=False)
+            if report:
+                printReport(changes)
+        resolver.resolve(program, env)
+        evaluated = backends.backends[backend](program, env)
         if evaluated is not None:
             print(evaluated.inspect())
             if evaluated.type() == object.EXIT_OBJ:
@@ -29,4 +37,6 @@ def printParserErrors(errors):
     for msg in errors:
         print("\t" + msg)
 
-
+def printReport(lines):
+    for line in lines:
+        print(line, file=sys.stderr)
@@ -0,0 +1,34 @@
+import contextlib
+import io
+import unittest
+import _Repl.repl as repl
+import _Repl.backends as backends
+
+# output of a REPL session reading lines, without the prompts
+def session(lines, backend : str) -> str:
+    lines = iter(lines)
+    output = io.StringIO()
+    repl.input = lambda prompt: next(lines)
+    try:
+        with contextlib.redirect_stdout(output):
+            repl.start(backend)
+    finally:
+        del repl.input
+    return output.getvalue()
+
+class TestRepl(unittest.TestCase):
+    def testSession(self):
+        # the values of a line are used by the next ones
+        lines = [
+            "let f = fn() { 1 };",
+            "f()",
+            "let g = fn(x) { x + f() + 2 };",
+            "g(2)",
+            "let c = class { let n = \"n\"; let get = fn() { n } };",
+            "let o = c(); o.get()",
+            "let a = [f, g]; a[1](a[0]())",
+            "exit()",
+        ]
+        expected = "1\n5\nn\n4\nprogram exited\n"
+        for backend in backends.backends:
+            self.assertEqual(session(lines, backend), expected, backend)
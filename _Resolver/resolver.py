@@ -0,0 +1,289 @@
+from typing import Dict, List, Set, Tuple
+import _Ast.ast as ast
+import _Object.object as object
+
+# kinds of scope, mirroring the environments Eval creates
+GLOBAL   = "GLOBAL"     # environment given to Eval
+BLOCK    = "BLOCK"      # branch of an if, new environment per evaluation
+LOOP     = "LOOP"       # body of a loop, one environment for all the iterations
+FUNCTION = "FUNCTION"   # call of a function, inside the scope it was created in
+CLASS    = "CLASS"      # body of a class literal, it has no outer environment
+
+class Scope:
+    def __init__(self, kind : str, layout : Dict[str, int] = None, env : object.Environment = None,
+                 names : Set[str] = None, elided : bool = False):
+        self.kind = kind
+        # a scope binding no names gets no environment of its own
+        self.elided = elided
+        # a function is created inside the scope, its environment outlives it
+        self.captured = False
+        self.layout = layout if layout is not None else {}
+        self.env = env
+        # names bound by let in the scope: before their let, a name may
+        # still hold the value of the previous iteration of a loop, and a
+        # function created there reads the binding of the let once it ran
+        self.names = names if names is not None else set()
+
+    def slot(self, name : str) -> int:
+        if self.env is not None:
+            return self.env.names.get(name)
+        return self.layout.get(name)
+
+    def declare(self, name : str) -> int:
+        if self.env is not None:
+            return self.env.declare(name)
+        if name not in self.layout:
+            self.layout[name] = len(self.layout)
+        return self.layout[name]
+
+# Resolver: annotates identifiers, let and assign statements with the
+# lexical address (depth, slot) of the binding they use, and blocks with
+# the layout of their scope, so that Eval can index environments directly.
+#
+# Blocks and functions that bind no names are marked as not scoped: they
+# run in the enclosing environment, which is not counted in the depth of
+# the addresses. Break and continue statements are annotated with whether
+# they are inside a loop, since the environment may not tell it anymore.
+# Functions without functions inside them get a pool for the environments
+# of their calls, which nothing can reference once the call is over (class
+# instances can't either: their environments have no outer one).
+# Counting loops, for (let i = a; i < b; i = i + k), are annotated with
+# their variable when nothing but the update assigns it.
+#
+# Names that can't be resolved statically keep an empty address and are
+# looked up by name: names used before a let of theirs in an enclosing
+# scope (or in a loop), names outside of a class body used by its methods,
+# and everything evaluated inside a class instance.
+class Resolver:
+    def __init__(self, env : object.Environment):
+        self.scopes = [Scope(GLOBAL, env=env)]
+        # names assigned, or bound again by let in the same scope, so far
+        self.writes = []
+
+    def resolveProgram(self, program : ast.Program):
+        self.scopes[0].names = letNames(program.statements)
+        for statement in program.statements:
+            self.resolve(statement)
+
+    # address of the binding name refers to in the current scope
+    def lookup(self, name : str) -> Tuple[int, int]:
+        depth = 0
+        for scope in reversed(self.scopes):
+            slot = scope.slot(name)
+            if slot is not None:
+                return depth, slot
+            if name in scope.names or scope.kind == CLASS:
+                return None, None
+            if not scope.elided:
+                depth += 1
+        return None, None
+
+    # whether a break or continue in the current scope is inside a loop
+    def insideLoop(self) -> bool:
+        for scope in reversed(self.scopes):
+            if scope.kind == LOOP:
+                return True
+            if scope.kind == GLOBAL:
+                return scope.env.inLoop
+            if scope.kind != BLOCK:
+                return False
+        return False
+
+    def resolve(self, node : ast.Node):
+        if node is None:
+            return
+        resolver = resolvers.get(type(node))
+        if resolver is not None:
+            resolver(self, node)
+
+    def resolveStatements(self, statements : List[ast.Node]):
+        for statement in statements:
+            self.resolve(statement)
+
+    # run statements in a new scope, store its layout in block
+    def resolveScope(self, kind : str, block : ast.BlockStatement,
+                     parameters : List[ast.Identifier] = None, initial : ast.Statement = None,
+                     tail : List[ast.Node] = None):
+        statements = block.statements if block is not None else []
+        names = letNames(statements + [initial])
+        elided = kind != CLASS and not parameters and not names
+        scope = Scope(kind, names=names, elided=elided)
+        self.scopes.append(scope)
+        for param in parameters or []:
+            param.depth, param.slot = 0, scope.declare(param.value)
+        self.resolve(initial)
+        if block is not None:
+            self.resolveStatements(block.statements)
+            block.layout = scope.layout
+            block.scoped = not elided
+            if kind == FUNCTION and not elided and not scope.captured:
+                block.frames = []
+        for node in tail or []:
+            self.resolve(node)
+        self.scopes.pop()
+
+    def resolveIdentifier(self, node : ast.Identifier):
+        node.depth, node.slot = self.lookup(node.value)
+
+    def resolveLetStatement(self, node : ast.LetStatement):
+        self.resolve(node.value)
+        if node.instance is not None:
+            self.resolve(node.name)
+            node.depth, node.slot = None, None
+            return
+        if self.scopes[-1].slot(node.name.value) is not None:
+            self.writes.append(node.name.value)
+        node.depth, node.slot = 0, self.scopes[-1].declare(node.name.value)
+        node.name.depth, node.name.slot = node.depth, node.slot
+
+    def resolveAssignStatement(self, node : ast.AssignStatement):
+        self.resolve(node.value)
+        self.resolve(node.name)
+        node.depth, node.slot = node.name.depth, node.name.slot
+        self.writes.append(node.name.value)
+
+    def resolveCompoundAssignStatement(self, node : ast.CompoundAssignStatement):
+        self.resolve(node.value)
+        self.resolve(node.target)
+        if isinstance(node.target, ast.Identifier):
+            self.writes.append(node.target.value)
+
+    def resolveIfExpression(self, node : ast.IfExpression):
+        self.resolve(node.condition)
+        self.resolveScope(BLOCK, node.consequence)
+        if node.alternative is not None:
+            self.resolveScope(BLOCK, node.alternative)
+
+    def resolveWhileExpression(self, node : ast.WhileExpression):
+        # the condition is evaluated in the enclosing scope
+        self.resolve(node.condition)
+        self.resolveScope(LOOP, node.block)
+
+    def resolveForExpression(self, node : ast.ForExpression):
+        start = len(self.writes)
+        self.resolveScope(LOOP, node.block, initial=node.initial,
+                          tail=[node.condition, node.update])
+        # the update must be the only assignment of the loop variable
+        counter = countingVariable(node)
+        node.counter = counter if self.writes[start:].count(counter) == 1 else None
+
+    def resolveFunctionLiteral(self, node : ast.FunctionLiteral):
+        # the new function keeps the environments of the calls it is created in
+        for scope in self.scopes:
+            scope.captured = True
+        self.resolveScope(FUNCTION, node.body, parameters=node.parameters)
+
+    def resolveClassliteral(self, node : ast.Classliteral):
+        self.resolveScope(CLASS, node.body)
+
+    def resolveBreakStatement(self, node : ast.BreakStatement):
+        node.inLoop = self.insideLoop()
+
+    def resolveContinueStatement(self, node : ast.ContinueStatement):
+        node.inLoop = self.insideLoop()
+
+    def resolveInfixExpression(self, node : ast.InfixExpression):
+        if node.operator == ".":
+            # members are looked up in the instance
+            self.resolve(node.left)
+            if isinstance(node.right, ast.CallExpression):
+                self.resolveStatements(node.right.arguments)
+            return
+        self.resolve(node.left)
+        self.resolve(node.right)
+
+    def resolveExpressionStatement(self, node : ast.ExpressionStatement):
+        self.resolve(node.expression)
+
+    def resolveReturnStatement(self, node : ast.ReturnStatement):
+        self.resolve(node.value)
+
+    def resolvePrefixExpression(self, node : ast.PrefixExpression):
+        self.resolve(node.right)
+
+    def resolveBlockStatement(self, node : ast.BlockStatement):
+        self.resolveStatements(node.statements)
+
+    def resolveCallExpression(self, node : ast.CallExpression):
+        self.resolve(node.function)
+        self.resolveStatements(node.arguments)
+
+    def resolveArrayLiteral(self, node : ast.ArrayLiteral):
+        self.resolveStatements(node.elements)
+
+    def resolveIndexExpression(self, node : ast.IndexExpression):
+        self.resolve(node.left)
+        self.resolve(node.index)
+
+    def resolveHashLiteral(self, node : ast.HashLiteral):
+        for key, value in node.pairs.items():
+            self.resolve(key)
+            self.resolve(value)
+
+# names bound by the let statements of a block
+def letNames(statements : List[ast.Statement]) -> Set[str]:
+    names = set()
+    for statement in statements:
+        if isinstance(statement, ast.LetStatement) and statement.instance is None:
+            names.add(statement.name.value)
+    return names
+
+# variable of a loop for (let i = a; i < b; i = i + k) (or <=, and
+# i += k, i++ as update), where k is an integer literal, else None
+def countingVariable(node : ast.ForExpression) -> str:
+    initial, condition, update = node.initial, node.condition, node.update
+    if not isinstance(initial, ast.LetStatement) or initial.instance is not None:
+        return None
+    name = initial.name.value
+    if not isinstance(condition, ast.ExpressionStatement):
+        return None
+    condition = condition.expression
+    if not isinstance(condition, ast.InfixExpression) or condition.operator not in ("<", "<="):
+        return None
+    if not isinstance(condition.left, ast.Identifier) or condition.left.value != name:
+        return None
+    # i = i + k, i += k or i++
+    if isinstance(update, ast.AssignStatement):
+        target, step = update.name, update.value
+        if not isinstance(step, ast.InfixExpression) or not isinstance(step.left, ast.Identifier):
+            return None
+        if step.left.value != name:
+            return None
+        operator, amount = step.operator, step.right
+    elif isinstance(update, ast.CompoundAssignStatement):
+        target, operator, amount = update.target, update.operator, update.value
+    else:
+        return None
+    if not isinstance(target, ast.Identifier) or target.value != name:
+        return None
+    if operator != "+" or not isinstance(amount, ast.IntegerLiteral):
+        return None
+    return name
+
+resolvers = {
+    ast.Identifier          : Resolver.resolveIdentifier,
+    ast.LetStatement        : Resolver.resolveLetStatement,
+    ast.AssignStatement     : Resolver.resolveAssignStatement,
+    ast.CompoundAssignStatement : Resolver.resolveCompoundAssignStatement,
+    ast.IfExpression        : Resolver.resolveIfExpression,
+    ast.WhileExpression     : Resolver.resolveWhileExpression,
+    ast.ForExpression       : Resolver.resolveForExpression,
+    ast.FunctionLiteral     : Resolver.resolveFunctionLiteral,
+    ast.Classliteral        : Resolver.resolveClassliteral,
+    ast.BreakStatement      : Resolver.resolveBreakStatement,
+    ast.ContinueStatement   : Resolver.resolveContinueStatement,
+    ast.InfixExpression     : Resolver.resolveInfixExpression,
+    ast.ExpressionStatement : Resolver.resolveExpressionStatement,
+    ast.ReturnStatement     : Resolver.resolveReturnStatement,
+    ast.PrefixExpression    : Resolver.resolvePrefixExpression,
+    ast.BlockStatement      : Resolver.resolveBlockStatement,
+    ast.CallExpression      : Resolver.resolveCallExpression,
+    ast.ArrayLiteral        : Resolver.resolveArrayLiteral,
+    ast.IndexExpression     : Resolver.resolveIndexExpression,
+    ast.HashLiteral         : Resolver.resolveHashLiteral,
+}
+
+# annotate program for evaluation in env (new global names are declared in env)
+def resolve(program : ast.Program, env : object.Environment) -> ast.Program:
+    Resolver(env).resolveProgram(program)
+    return program
@@ -0,0 +1,179 @@
+from dataclasses import dataclass
+import _Lexer.lexer as lexer
+import _Parser.parser as parser
+import _Object.object as object
+import _Ast.ast as ast
+import _Resolver.resolver as resolver
+import _Evaluator.evaluator as evaluator
+import _Stack.stack as stack
+import _Evaluator.evaluator_test as evaluator_test
+
+# resolved programs, run by Eval (the evaluator test suite runs on them in
+# _Repl/backends_test.py)
+class TestResolver(evaluator_test.ProgramTest):
+    options = (evaluator_test.resolved,)
+
+    def resolveProgram(self, input : str) -> ast.Program:
+        program = parser.Parser(lexer.Lexer(input)).parseProgram()
+        return resolver.resolve(program, object.Environment())
+
+    def testAddresses(self):
+        @dataclass
+        class TestCase:
+            input    : str
+            depth    : int
+            slot     : int
+
+        # address of the identifier used by the last statement
+        tests = [
+            TestCase("let a = 1; let b = 2; b", 0, 1),
+            TestCase("let a = 1; if (true) { a }", 0, 0),
+            TestCase("let a = 1; if (true) { let b = 2; a }", 1, 0),
+            TestCase("fn(x, y) { y }", 0, 1),
+            TestCase("let a = 1; fn(x) { a }", 1, 0),
+            TestCase("let a = 1; fn() { if (true) { fn(x) { a } } }", 1, 0),
+            TestCase("let a = 1; fn(y) { if (true) { let z = y; fn(x) { a } } }", 3, 0),
+            TestCase("let a = 1; class { let b = 2; let f = fn() { a } }", None, None),
+            TestCase("let a = 1; while (true) { let b = a; a }", 1, 0),
+            TestCase("let a = 1; while (true) { let a = a + 1; }", None, None),
+            TestCase("for (let i = 0; i < 3; i = i + 1) { i }", 0, 0),
+        ]
+
+        for elem in tests:
+            program = self.resolveProgram(elem.input)
+            identifier = lastIdentifier(program)
+            self.assertEqual(identifier.depth, elem.depth, elem.input)
+            self.assertEqual(identifier.slot, elem.slot, elem.input)
+
+    def testLayouts(self):
+        program = self.resolveProgram("let f = fn(x) { let y = x; if (y) { let z = 1; } }")
+        body = program.statements[0].value.body
+        self.assertEqual(body.layout, {"x": 0, "y": 1})
+        self.assertEqual(body.statements[1].expression.consequence.layout, {"z": 0})
+
+    def testScopeElision(self):
+        program = self.resolveProgram("""
+            let f = fn() { while (true) { if (true) { break; } else { let a = 1; continue; } } };
+            for (let i = 0; i < 1; i = i + 1) { }
+            fn(x) { break; }
+        """)
+        body = program.statements[0].value.body
+        loop = body.statements[0].expression
+        branch = loop.block.statements[0].expression
+        self.assertFalse(body.scoped)
+        self.assertFalse(loop.block.scoped)
+        self.assertFalse(branch.consequence.scoped)
+        self.assertTrue(branch.alternative.scoped)
+        self.assertTrue(program.statements[1].expression.block.scoped)
+        self.assertTrue(program.statements[2].expression.body.scoped)
+
+        # break and continue know whether they are in a loop without its environment
+        self.assertTrue(branch.consequence.statements[0].inLoop)
+        self.assertTrue(branch.alternative.statements[1].inLoop)
+        self.assertFalse(program.statements[2].expression.body.statements[0].inLoop)
+
+    def testFramePools(self):
+        program = self.resolveProgram("let f = fn(x) { x }; let g = fn(x) { fn() { x } }; let h = fn() { 1 };")
+        self.assertEqual(program.statements[0].value.body.frames, [])
+        self.assertIsNone(program.statements[1].value.body.frames)
+        self.assertIsNone(program.statements[2].value.body.frames)
+
+        # calls in a loop and in a recursion reuse the environments of finished calls
+        counts = dict(evaluator.frameCounts)
+        evaluated = self.eval("""
+            let f = fn(x) { let y = x + 1; y };
+            let sum = fn(n) { if (n == 0) { return 0; } n + sum(n - 1) };
+            let r = 0;
+            for (let i = 0; i < 100; i = i + 1) { r = f(r); }
+            r + sum(10) + sum(10)
+        """)
+        self.typeObject(evaluated, 210, object.Integer)
+        self.assertEqual(evaluator.frameCounts["allocated"] - counts["allocated"], 1 + 11)
+        self.assertEqual(evaluator.frameCounts["reused"] - counts["reused"], 99 + 11)
+
+    def testFramesNotReachable(self):
+        @dataclass
+        class TestCase:
+            input       : str
+            expected    : int
+
+        tests = [
+            # closures keep the environments of their calls
+            TestCase("let make = fn(x) { let y = x; fn() { y } }; let a = make(1); let b = make(2); a() * 10 + b()", 12),
+            TestCase("let make = fn(x) { let y = x; let C = class { let get = fn() { 3 }; }; [C, fn() { y }] }; let a = make(1); make(2); a[1]()", 1),
+            # instances have no outer environment
+            TestCase("let make = fn(x) { let y = x; let C = class { let n = 5; }; C() }; let a = make(1); let b = make(2); let b.n = 7; a.n * 10 + b.n", 57),
+            # a reused environment holds no value of the previous call
+            TestCase("let v = 1; let f = fn(x) { let r = v; let v = x; r }; f(5); f(6) * 10 + f(7)", 11),
+            TestCase("let f = fn(x) { let a = [x]; a }; let a = f(1); let b = f(2); a[0] * 10 + b[0]", 12),
+        ]
+
+        for elem in tests:
+            for backend in (evaluator.Eval, stack.run):
+                program, env = parser.Parser(lexer.Lexer(elem.input)).parseProgram(), object.Environment()
+                resolver.resolve(program, env)
+                self.typeObject(backend(program, env), elem.expected, object.Integer)
+
+    def testCountingLoops(self):
+        @dataclass
+        class TestCase:
+            input       : str
+            expected    : str
+
+        tests = [
+            TestCase("for (let i = 0; i < 10; i = i + 1) { i }", "i"),
+            TestCase("for (let i = 0; i <= n; i = i + 2) { let j = i; }", "i"),
+            TestCase("for (let i = 0; i < 10; i = i + 1) { if (true) { let i = 2; } }", "i"),
+            TestCase("for (let i = 0; i < 10; i = i + 1) { i = 3; }", None),
+            TestCase("for (let i = 0; i < 10; i = i + 1) { let i = 3; }", None),
+            TestCase("for (let i = 0; i < 10; i = i + 1) { fn() { i = 3; } }", None),
+            TestCase("for (let i = 0; i < 10; i = i + 1) { while (true) { i = 1; let i = 0; } }", None),
+            TestCase("for (let i = 0; i > 10; i = i + 1) { }", None),
+            TestCase("for (let i = 0; i < 10; i = i - 1) { }", None),
+            TestCase("for (let i = 0; i < 10; i = i + j) { }", None),
+            TestCase("let i = 0; for (; i < 10; i = i + 1) { }", None),
+            TestCase("for (let i = 0; i < 10; i++) { }", "i"),
+            TestCase("for (let i = 0; i < 10; i += 2) { }", "i"),
+            TestCase("for (let i = 0; i < 10; i -= 2) { }", None),
+            TestCase("for (let i = 0; i < 10; i++) { i++; }", None),
+            TestCase("for (let i = 0; i < 10; i++) { let a = [i]; a[0] += 1; }", "i"),
+        ]
+
+        for elem in tests:
+            program = self.resolveProgram(elem.input)
+            self.assertEqual(program.statements[-1].expression.counter, elem.expected, elem.input)
+
+    def testGlobalsDeclaredInEnv(self):
+        env = object.Environment()
+        program = parser.Parser(lexer.Lexer("let a = 1; let b = a + 1;")).parseProgram()
+        resolver.resolve(program, env)
+        self.assertEqual(env.names, {"a": 0, "b": 1})
+
+        # a later program (as in the repl) keeps the same slots
+        evaluator.Eval(program, env)
+        program = parser.Parser(lexer.Lexer("b")).parseProgram()
+        resolver.resolve(program, env)
+        self.assertEqual(program.statements[0].expression.slot, 1)
+        self.typeObject(evaluator.Eval(program, env), 2, object.Integer)
+
+# last identifier of the last statement, depth first
+def lastIdentifier(program : ast.Program) -> ast.Identifier:
+    node = program.statements[-1]
+    while not isinstance(node, ast.Identifier):
+        if isinstance(node, ast.ExpressionStatement):
+            node = node.expression
+        elif isinstance(node, ast.LetStatement):
+            node = node.value
+        elif isinstance(node, ast.InfixExpression):
+            node = node.left
+        elif isinstance(node, ast.FunctionLiteral):
+            node = node.body.statements[-1]
+        elif isinstance(node, ast.Classliteral):
+            node = node.body.statements[-1]
+        elif isinstance(node, ast.IfExpression):
+            node = node.consequence.statements[-1]
+        elif isinstance(node, (ast.WhileExpression, ast.ForExpression)):
+            node = node.block.statements[-1]
+        else:
+            node = node.statements[-1]
+    return node
@@ -0,0 +1,417 @@
+from typing import Generator, List
+import _Ast.ast as ast
+import _Object.object as object
+import _Evaluator.evaluator as evaluator
+from _Evaluator.evaluator import isTruthy, memberCache
+from _Evaluator.utils import newError
+
+# maximum number of pending evaluations, None means limited only by memory
+MAX_DEPTH = None
+
+# Evaluator running on an explicit work stack instead of the Python call
+# stack. The evaluation of a node is a generator: to evaluate a child it
+# yields (child, env) and gets back its value, so the nesting of Monkey
+# calls and expressions only grows the work stack. Results are the same
+# objects evaluator.Eval returns.
+def run(program : ast.Program, env : object.Environment, maxDepth : int = None) -> object.Object:
+    if maxDepth is None:
+        maxDepth = MAX_DEPTH
+
+    work = [evalProgram(program, env)]
+    value = None
+    while True:
+        try:
+            node, env = work[-1].send(value)
+        except StopIteration as stop:
+            work.pop()
+            if not work:
+                return stop.value
+            value = stop.value
+            continue
+
+        # an expression statement has the value of its expression
+        while node.__class__ is ast.ExpressionStatement:
+            node = node.expression
+
+        # nodes without children are evaluated in place
+        leaf = leaves.get(node.__class__)
+        if leaf is not None:
+            value = leaf(node, env)
+            continue
+
+        evaluate = evaluators.get(node.__class__)
+        if evaluate is None:
+            value = None
+            continue
+
+        if maxDepth is not None and len(work) >= maxDepth:
+            return newError("maximum evaluation depth exceeded: {}", maxDepth)
+        work.append(evaluate(node, env))
+        value = None
+
+# -------------------- EVALUATION OF THE NODES ----------------------------------
+
+# Unlike Eval, which raises exceptions, the generators give errors and
+# returns back as values: an Error, or the value of a return statement
+# wrapped in a ReturnValue until the function or program it ends
+
+def isError(obj : object.Object) -> bool:
+    if obj is not None:
+        return obj.type() == object.ERROR_OBJ
+    return False
+
+def unwrapReturnValue(ev : object.Object) -> object.Object:
+    if isinstance(ev, object.ReturnValue):
+        return ev.value
+    
+    return ev
+
+def evalProgram(program : ast.Program, env : object.Environment) -> Generator:
+    result = None
+    for statement in program.statements:
+        result = yield statement, env
+
+        if isinstance(result, object.ReturnValue):
+            if isinstance(result.value, object.TailCall):
+                call = result.value
+                return (yield from applyFunction(call.fn, call.args))
+            return result.value
+        elif isinstance(result, (object.Exit, object.Error)):
+            return result
+    return result
+
+def evalBlockStatements(block : ast.BlockStatement, env : object.Environment) -> Generator:
+    result = None
+    for statement in block.statements:
+        result = yield statement, env
+
+        if result is not None:
+            if result.type() in [object.BREAK_OBJ, object.CONTINUE_OBJ, object.RETURN_VALUE_OBJ, object.ERROR_OBJ, object.EXIT_OBJ]:
+                return result
+
+    return result
+
+def evalPrefixExpression(node : ast.PrefixExpression, env : object.Environment) -> Generator:
+    right = yield node.right, env
+    if isError(right):
+        return right
+
+    return evaluator.evalPrefixExpression(node.operator, right)
+
+def evalInfixExpression(node : ast.InfixExpression, env : object.Environment) -> Generator:
+    if node.operator == ".":
+        return (yield from evalClassInstanceExpression(node, env))
+    if node.operator in evaluator.shortCircuit:
+        return (yield from evalLogicalExpression(node, env))
+
+    right = yield node.right, env
+    if isError(right):
+        return right
+
+    left = yield node.left, env
+    if isError(left):
+        return left
+
+    return evaluator.applyInfix(node, left, right)
+
+# as evaluator.evalLogicalNode
+def evalLogicalExpression(node : ast.InfixExpression, env : object.Environment) -> Generator:
+    left = yield node.left, env
+    if isError(left) or left is evaluator.shortCircuit[node.operator]:
+        return left
+
+    right = yield node.right, env
+    if isError(right):
+        return right
+
+    return evaluator.applyInfix(node, left, right)
+
+def evalIfExpression(ie : ast.IfExpression, env : object.Environment) -> Generator:
+    condition = yield ie.condition, env
+    if isError(condition):
+        return condition
+
+    if isTruthy(condition):
+        return (yield ie.consequence, evaluator.blockEnvironment(ie.consequence, env, env.inLoop))
+    elif ie.alternative is not None:
+        return (yield ie.alternative, evaluator.blockEnvironment(ie.alternative, env, env.inLoop))
+    else:
+        return object.NULL
+
+def evalWhileExpression(we : ast.WhileExpression, env : object.Environment) -> Generator:
+    result = object.NULL
+    newEnv = evaluator.blockEnvironment(we.block, env, True)
+    while True:
+        condition = yield we.condition, env
+        if isError(condition):
+            return condition
+
+        if isTruthy(condition):
+            result = yield we.block, newEnv
+            if isinstance(result, object.Break):
+                return object.NULL
+            elif isinstance(result, (object.Error, object.Exit, object.ReturnValue)):
+                return result
+            elif isinstance(result, object.Continue):
+                result = object.NULL
+        else:
+            return result
+
+def evalForExpression(floop : ast.ForExpression, env : object.Environment) -> Generator:
+    result = object.NULL
+    newEnv = evaluator.blockEnvironment(floop.block, env, True)
+
+    if floop.initial is not None:
+        initial = yield floop.initial, newEnv
+        if isError(initial):
+            return initial
+
+    while True:
+        condition = object.TRUE
+        if floop.condition is not None:
+            condition = yield floop.condition, newEnv
+            if isError(condition):
+                return condition
+
+        if isTruthy(condition):
+            result = yield floop.block, newEnv
+
+            if isinstance(result, (object.Error, object.Exit, object.ReturnValue, object.Break)):
+                return object.NULL if isinstance(result, object.Break) else result
+
+            if floop.update is not None:
+                update = yield floop.update, newEnv
+                if isError(update):
+                    return update
+
+            if isinstance(result, object.Continue):
+                result = object.NULL
+        else:
+            return result
+
+def evalReturnStatement(node : ast.ReturnStatement, env : object.Environment) -> Generator:
+    if node.value is None:
+        return object.ReturnValue(object.integer(0))
+
+    # return f(...): let the caller run the call, as Eval does
+    if isinstance(node.value, ast.CallExpression):
+        function = yield node.value.function, env
+        if isError(function):
+            return function
+
+        if not isinstance(function, object.Function):
+            val = yield from callFunction(function, node.value.arguments, env)
+            if isError(val):
+                return val
+            return object.ReturnValue(val)
+
+        args = yield from evalExpressions(node.value.arguments, env)
+        if len(args) == 1 and isError(args[0]):
+            return args[0]
+        return object.ReturnValue(object.TailCall(function, args))
+
+    val = yield node.value, env
+    if isError(val):
+        return val
+
+    return object.ReturnValue(val)
+
+def evalLetStatement(node : ast.LetStatement, env : object.Environment) -> Generator:
+    val = yield node.value, env
+    if isError(val):
+        return val
+
+    return evaluator.bindLetStatement(node, val, env)
+
+def evalAssignStatement(node : ast.AssignStatement, env : object.Environment) -> Generator:
+    val = yield node.value, env
+    if isError(val):
+        return val
+
+    return evaluator.bindAssignStatement(node, val, env)
+
+# as evaluator.evalCompoundAssignStatement
+def evalCompoundAssignStatement(node : ast.CompoundAssignStatement, env : object.Environment) -> Generator:
+    value = yield node.value, env
+    if isError(value):
+        return value
+
+    target = node.target
+    if isinstance(target, ast.Identifier):
+        cell = evaluator.identifierCell(target, env)
+    elif isinstance(target, ast.IndexExpression):
+        left = yield target.left, env
+        if isError(left):
+            return left
+        index = yield target.index, env
+        if isError(index):
+            return index
+        cell = evaluator.indexCell(left, index)
+    else:
+        cell = evaluator.memberCell(node, env)
+    if cell.__class__ is object.Error:
+        return cell
+
+    return evaluator.updateCell(node, cell, value)
+
+def evalCallExpression(node : ast.CallExpression, env : object.Environment) -> Generator:
+    function = yield node.function, env
+    if isError(function):
+        return function
+
+    return (yield from callFunction(function, node.arguments, env))
+
+# call an already evaluated function
+def callFunction(function : object.Object, arguments : List[ast.Expression], env : object.Environment) -> Generator:
+    if isinstance(function, object.Class):
+        return function.instance()
+
+    args = yield from evalExpressions(arguments, env)
+    if len(args) == 1 and isError(args[0]):
+        return args[0]
+
+    return (yield from applyFunction(function, args))
+
+def evalExpressions(exps : List[ast.Expression], env : object.Environment) -> Generator:
+    result = []
+
+    for elem in exps:
+        evaluated = yield elem, env
+        if isError(evaluated):
+            return [evaluated]
+        result.append(evaluated)
+
+    return result
+
+def applyFunction(fn : object.Object, args : List[object.Object]) -> Generator:
+    if isinstance(fn, object.Function):
+        while True:
+            if len(fn.parameters) != len(args):
+                return newError("wrong number of parametrs: wanted {}, got {}", len(fn.parameters), len(args))
+            extendedEnv = evaluator.extendFunctionEnvironment(fn, args)
+            evaluated = unwrapReturnValue((yield fn.body, extendedEnv))
+            evaluator.releaseFunctionEnvironment(fn, extendedEnv)
+            if not isinstance(evaluated, object.TailCall):
+                return evaluated
+
+            fn, args = evaluated.fn, evaluated.args
+
+    if isinstance(fn, object.Builtin):
+        return fn.fn(*args)
+
+    return newError("not a function: {}", fn.type())
+
+def evalArrayLiteral(node : ast.ArrayLiteral, env : object.Environment) -> Generator:
+    elements = yield from evalExpressions(node.elements, env)
+    if len(elements) == 1 and isError(elements[0]):
+        return elements[0]
+    return object.Array(elements)
+
+def evalIndexExpression(node : ast.IndexExpression, env : object.Environment) -> Generator:
+    left = yield node.left, env
+    if isError(left):
+        return left
+
+    index = yield node.index, env
+    if isError(index):
+        return index
+
+    return evaluator.applyIndex(node, left, index)
+
+def evalHashLiteral(node : ast.HashLiteral, env : object.Environment) -> Generator:
+    pairs = {}
+
+    for keyNode, valueNode in node.pairs.items():
+        key = yield keyNode, env
+        if isError(key):
+            return key
+
+        if not isinstance(key, object.Hashable):
+            return newError("unusable as hash key: {}".format(key.type()))
+
+        value = yield valueNode, env
+        if isError(value):
+            return value
+
+        pairs[key.hashKey()] = object.HashPair(key, value)
+
+    return object.Hash(pairs)
+
+def evalClassLiteral(classLiteral : ast.Classliteral, env : object.Environment) -> Generator:
+    newClass = object.Class(classLiteral.body, object.Environment(None, False, classLiteral.body.layout))
+    for statement in classLiteral.body.statements:
+        if not isinstance(statement, ast.LetStatement):
+            return newError("in class declaration there must be only Let statements")
+        _ = yield statement, newClass.env
+    return newClass
+
+def evalClassInstanceExpression(node : ast.InfixExpression, env : object.Environment) -> Generator:
+    if not isinstance(node.left, ast.Identifier):
+        return newError("Can't find a way to execute DOT operator")
+
+    classInst, exist = env.get(node.left.value)
+    if not exist or not isinstance(classInst, object.ClassInstance):
+        return newError("{} does not exist in current scope", node.left.value)
+
+    if isinstance(node.right, ast.Identifier):
+        return memberCache(node, node.right).get(classInst.env)
+
+    elif isinstance(node.right, ast.CallExpression):
+        function = None
+        if isinstance(node.right.function, ast.Identifier):
+            function = memberCache(node, node.right.function).get(classInst.env)
+        if function is None:
+            function = yield node.right.function, classInst.env
+            if isError(function):
+                return function
+
+        if isinstance(function, object.Class):
+            return object.ClassInstance(function.env)
+
+        args = yield from evalExpressions(node.right.arguments, env)
+        if len(args) == 1 and isError(args[0]):
+            return args[0]
+
+        return (yield from applyFunction(function, args))
+
+    else:
+        return newError("Can't find a way to execute DOT operator")
+
+def evalContinueStatement(node : ast.ContinueStatement, env : object.Environment) -> object.Object:
+    if not evaluator.inLoop(node, env):
+        return newError("Can't use continue outside a loop")
+    return object.CONTINUE
+
+def evalBreakStatement(node : ast.BreakStatement, env : object.Environment) -> object.Object:
+    if not evaluator.inLoop(node, env):
+        return newError("Can't use break outside a loop")
+    return object.BREAK
+
+# nodes evaluated without a generator
+leaves = {
+    ast.IntegerLiteral    : evaluator.evalIntegerLiteral,
+    ast.StringLiteral     : evaluator.evalStringLiteral,
+    ast.Boolean           : lambda node, env: evaluator.nativeBoolToBooleanObject(node.value),
+    ast.Identifier        : evaluator.evalIdentifier,
+    ast.FunctionLiteral   : lambda node, env: object.Function(node.parameters, node.body, env),
+    ast.ContinueStatement : evalContinueStatement,
+    ast.BreakStatement    : evalBreakStatement,
+}
+
+evaluators = {
+    ast.BlockStatement    : evalBlockStatements,
+    ast.PrefixExpression  : evalPrefixExpression,
+    ast.InfixExpression   : evalInfixExpression,
+    ast.IfExpression      : evalIfExpression,
+    ast.WhileExpression   : evalWhileExpression,
+    ast.ForExpression     : evalForExpression,
+    ast.ReturnStatement   : evalReturnStatement,
+    ast.LetStatement      : evalLetStatement,
+    ast.AssignStatement   : evalAssignStatement,
+    ast.CompoundAssignStatement : evalCompoundAssignStatement,
+    ast.CallExpression    : evalCallExpression,
+    ast.ArrayLiteral      : evalArrayLiteral,
+    ast.IndexExpression   : evalIndexExpression,
+    ast.HashLiteral       : evalHashLiteral,
+    ast.Classliteral      : evalClassLiteral,
+}
@@ -0,0 +1,33 @@
+import _Lexer.lexer as lexer
+import _Parser.parser as parser
+import _Object.object as object
+import _Stack.stack as stack
+import _Evaluator.evaluator_test as evaluator_test
+
+# programs run on the explicit work stack (the evaluator test suite runs on
+# every backend in _Repl/backends_test.py)
+class TestStack(evaluator_test.ProgramTest):
+    def eval(self, input : str, maxDepth : int = None) -> object.Object:
+        l = lexer.Lexer(input)
+        p = parser.Parser(l)
+        program = p.parseProgram()
+        env = object.Environment()
+
+        return stack.run(program, env, maxDepth)
+
+    def testDeepRecursion(self):
+        # not in tail position: each call stays on the work stack
+        input = "let sum = fn(n) { if (n == 0) { return 0; } return n + sum(n - 1); }; sum(5000);"
+        self.typeObject(self.eval(input), 12502500, object.Integer)
+
+    def testDeepExpression(self):
+        input = "1" + " + 1" * 5000
+        self.typeObject(self.eval(input), 5001, object.Integer)
+
+    def testMaxDepth(self):
+        input = "let f = fn(n) { if (n == 0) { return 0; } return 1 + f(n - 1); }; f(100);"
+        self.typeObject(self.eval(input, 10000), 100, object.Integer)
+
+        evaluated = self.eval(input, 50)
+        self.checkInstanceOf(evaluated, object.Error)
+        self.assertEqual(evaluated.message, "maximum evaluation depth exceeded: 50")
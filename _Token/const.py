@@ -49,4 +49,12 @@ NOT_EQ      =   "!="
 AND         =   "&&"
 OR         =    "||"
 
+PLUS_ASSIGN     =   "+="
+MINUS_ASSIGN    =   "-="
+ASTERISK_ASSIGN =   "*="
+SLASH_ASSIGN    =   "/="
+MODULUS_ASSIGN  =   "%="
+INCREMENT       =   "++"
+DECREMENT       =   "--"
+
 STRING      =   "STRING"
\ No newline at end of file
@@ -0,0 +1,426 @@
+import _Ast.ast as ast
+import _Code.code as code
+import _Compiler.compiler as compiler
+import _Object.object as object
+import _Evaluator.builtins as builtins
+import _Evaluator.evaluator as evaluator
+from _Evaluator.evaluator import Abort
+from _Evaluator.utils import newError
+
+# active loop of a frame: where to unwind the stack and the scopes
+class Block:
+    __slots__ = ("sp", "env", "breakTarget", "continueTarget", "loopEnv")
+    def __init__(self, sp : int, env : object.Environment, breakTarget : int,
+                 continueTarget : int, loopEnv : object.Environment = None):
+        self.sp = sp
+        self.env = env
+        self.breakTarget = breakTarget
+        self.continueTarget = continueTarget
+        self.loopEnv = loopEnv
+
+# activation of the main program, of a function or of a class body
+class Frame:
+    __slots__ = ("fn", "ip", "env", "base", "blocks")
+    def __init__(self, fn : object.CompiledFunction, env : object.Environment, base : int):
+        self.fn = fn
+        self.ip = 0
+        self.env = env
+        self.base = base
+        self.blocks = []
+
+class VM:
+    def __init__(self, bytecode : compiler.Bytecode, env : object.Environment):
+        self.main = object.CompiledFunction(bytecode.instructions, constants=bytecode.constants)
+        self.env = env
+
+    # execute the program, return the same object Eval would
+    def run(self) -> object.Object:
+        try:
+            return self.execute()
+        except Abort as abort:
+            return abort.value
+
+    def execute(self) -> object.Object:
+        Integer, integer = object.Integer, object.integer
+        TRUE, FALSE, NULL, EXIT = object.TRUE, object.FALSE, object.NULL, object.EXIT
+        frame = Frame(self.main, self.env, 0)
+        frames = [frame]
+        stack = []
+        ins = frame.fn.instructions
+        consts = frame.fn.constants
+        blocks = frame.blocks
+        env = frame.env
+        ip = 0
+
+        while True:
+            op = ins[ip]
+            ip += 1
+
+            if op == code.OpGetName:
+                name = consts[ins[ip]]
+                ip += 1
+                val, ok = env.get(name)
+                if not ok:
+                    if name in builtins.builtins:
+                        val = builtins.builtins[name]
+                    else:
+                        raise Abort(newError("identifier not found: " + name))
+                stack.append(val)
+
+            elif op == code.OpConstant:
+                stack.append(consts[ins[ip]])
+                ip += 1
+
+            elif op == code.OpPopStatement:
+                # an exit() used as a statement ends the current function
+                if stack.pop() is EXIT:
+                    stack.append(EXIT)
+                    ip = len(ins) - 1
+
+            elif op == code.OpJumpIfFalse:
+                condition = stack.pop()
+                if condition is FALSE or condition is NULL:
+                    ip = ins[ip]
+                else:
+                    ip += 1
+
+            elif op == code.OpJump:
+                ip = ins[ip]
+
+            elif op == code.OpJumpAnd:
+                if stack[-1] is FALSE:
+                    ip = ins[ip]
+                else:
+                    ip += 1
+
+            elif op == code.OpJumpOr:
+                if stack[-1] is TRUE:
+                    ip = ins[ip]
+                else:
+                    ip += 1
+
+            elif op == code.OpAnd or op == code.OpOr:
+                right = stack.pop()
+                stack[-1] = infix(binaryOps[op], stack[-1], right)
+
+            elif op == code.OpPop:
+                stack.pop()
+
+            elif op == code.OpLessThan:
+                left = stack.pop()
+                right = stack[-1]
+                if left.__class__ is Integer and right.__class__ is Integer:
+                    stack[-1] = TRUE if left.value < right.value else FALSE
+                else:
+                    stack[-1] = infix("<", left, right)
+
+            elif op == code.OpAdd:
+                left = stack.pop()
+                right = stack[-1]
+                if left.__class__ is Integer and right.__class__ is Integer:
+                    stack[-1] = integer(left.value + right.value)
+                else:
+                    stack[-1] = infix("+", left, right)
+
+            elif op == code.OpSub:
+                left = stack.pop()
+                right = stack[-1]
+                if left.__class__ is Integer and right.__class__ is Integer:
+                    stack[-1] = integer(left.value - right.value)
+                else:
+                    stack[-1] = infix("-", left, right)
+
+            elif op == code.OpEqual:
+                left = stack.pop()
+                right = stack[-1]
+                if left.__class__ is Integer and right.__class__ is Integer:
+                    stack[-1] = TRUE if left.value == right.value else FALSE
+                else:
+                    stack[-1] = infix("==", left, right)
+
+            elif op in binaryOps:
+                left = stack.pop()
+                stack[-1] = infix(binaryOps[op], left, stack[-1])
+
+            elif op == code.OpSetAssign:
+                name = consts[ins[ip]]
+                ip += 1
+                _, ok = env.get(name)
+                if not ok:
+                    raise Abort(newError("Can't assign value before declaration"))
+                env.set(name, stack[-1], False)
+                stack[-1] = None
+
+            elif op == code.OpSetLet:
+                env.set(consts[ins[ip]], stack[-1], True)
+                stack[-1] = None
+                ip += 1
+
+            elif op == code.OpCall or op == code.OpCallMethod:
+                argc = ins[ip]
+                ip += 1
+                fn = stack[-1 - argc]
+                if op == code.OpCallMethod:
+                    # stack: instance, method, arguments
+                    del stack[-2 - argc]
+
+                if isinstance(fn, object.Closure):
+                    if len(fn.parameters) != argc:
+                        raise Abort(newError("wrong number of parametrs: wanted {}, got {}",
+                                             len(fn.parameters), argc))
+                    newEnv = object.Environment(fn.env)
+                    base = len(stack) - argc
+                    for idx, param in enumerate(fn.parameters):
+                        newEnv.set(param.value, stack[base + idx], True)
+                    del stack[base - 1:]
+
+                    frame.ip = ip
+                    frame.env = env
+                    frame = Frame(fn.fn, newEnv, base - 1)
+                    frames.append(frame)
+                    ins = fn.fn.instructions
+                    consts = fn.fn.constants
+                    blocks = frame.blocks
+                    env = newEnv
+                    ip = 0
+
+                elif isinstance(fn, object.Builtin):
+                    base = len(stack) - argc
+                    result = fn.fn(*stack[base:])
+                    del stack[base - 1:]
+                    if isinstance(result, object.Error):
+                        raise Abort(result)
+                    stack.append(result)
+
+                elif isinstance(fn, object.Class):
+                    # classes take no arguments: they are ignored
+                    del stack[len(stack) - argc - 1:]
+                    if op == code.OpCallMethod:
+                        stack.append(object.ClassInstance(fn.env))
+                    else:
+                        stack.append(fn.instance())
+
+                else:
+                    raise Abort(newError("not a function: {}", fn.type()))
+
+            elif op == code.OpReturnValue:
+                value = stack.pop()
+                if len(frames) == 1:
+                    return value
+                del stack[frame.base:]
+                stack.append(value)
+                frames.pop()
+                frame = frames[-1]
+                ins = frame.fn.instructions
+                consts = frame.fn.constants
+                blocks = frame.blocks
+                env = frame.env
+                ip = frame.ip
+
+            elif op == code.OpTrue:
+                stack.append(TRUE)
+
+            elif op == code.OpFalse:
+                stack.append(FALSE)
+
+            elif op == code.OpNull:
+                stack.append(NULL)
+
+            elif op == code.OpNone:
+                stack.append(None)
+
+            elif op == code.OpIndex:
+                index = stack.pop()
+                left = stack[-1]
+                if left.__class__ is object.Array and index.__class__ is Integer:
+                    idx = index.value
+                    stack[-1] = left.elements[idx] if 0 <= idx < len(left.elements) else NULL
+                else:
+                    stack[-1] = check(evaluator.evalIndexExpression(left, index))
+
+            elif op == code.OpCheckExit:
+                if stack[-1] is EXIT:
+                    ip = len(ins) - 1
+
+            elif op == code.OpPushScope:
+                inLoop = ins[ip]
+                ip += 1
+                env = object.Environment(env, env.inLoop if inLoop == 2 else inLoop == 1)
+
+            elif op == code.OpPopScope:
+                env = env.outer
+
+            elif op == code.OpSetupLoop:
+                loopEnv = object.Environment(env, True) if ins[ip + 2] == 1 else None
+                blocks.append(Block(len(stack), env, ins[ip], ins[ip + 1], loopEnv))
+                ip += 3
+
+            elif op == code.OpLoopScope:
+                env = blocks[-1].loopEnv
+
+            elif op == code.OpPopBlock:
+                blocks.pop()
+
+            elif op == code.OpBreak or op == code.OpContinue:
+                block = blocks[-1]
+                del stack[block.sp:]
+                stack.append(NULL)
+                env = block.env
+                if op == code.OpBreak:
+                    blocks.pop()
+                    ip = block.breakTarget
+                else:
+                    ip = block.continueTarget
+
+            elif op == code.OpMinus or op == code.OpBang:
+                operator = "-" if op == code.OpMinus else "!"
+                stack[-1] = check(evaluator.evalPrefixExpression(operator, stack[-1]))
+
+            elif op == code.OpClosure:
+                stack.append(object.Closure(consts[ins[ip]], env))
+                ip += 1
+
+            elif op == code.OpArray:
+                count = ins[ip]
+                ip += 1
+                base = len(stack) - count
+                elements = stack[base:]
+                del stack[base:]
+                stack.append(object.Array(elements))
+
+            elif op == code.OpHash:
+                count = ins[ip]
+                ip += 1
+                base = len(stack) - 2 * count
+                pairs = {}
+                for idx in range(base, len(stack), 2):
+                    key = stack[idx]
+                    if not isinstance(key, object.Hashable):
+                        raise Abort(newError("unusable as hash key: {}".format(key.type())))
+                    pairs[key.hashKey()] = object.HashPair(key, stack[idx + 1])
+                del stack[base:]
+                stack.append(object.Hash(pairs))
+
+            elif op == code.OpGetInstance:
+                name = consts[ins[ip]]
+                ip += 1
+                instance, ok = env.get(name)
+                if not ok or not isinstance(instance, object.ClassInstance):
+                    raise Abort(newError("{} does not exist in current scope", name))
+                stack.append(instance)
+
+            elif op == code.OpGetField:
+                stack[-1] = consts[ins[ip]].get(stack[-1].env)
+                ip += 1
+
+            elif op == code.OpLoadMethod:
+                member = consts[ins[ip]]
+                ip += 1
+                method = member.get(stack[-1].env)
+                if method is None:
+                    name = member.name
+                    if name in builtins.builtins:
+                        method = builtins.builtins[name]
+                    else:
+                        raise Abort(newError("identifier not found: " + name))
+                stack.append(method)
+
+            elif op == code.OpSetField:
+                name = consts[ins[ip]]
+                field = consts[ins[ip + 1]]
+                ip += 2
+                instance, ok = env.get(name)
+                if not ok or not isinstance(instance, object.ClassInstance):
+                    raise Abort(newError("Can't find object {}", name))
+                _, ok = instance.env.get(field)
+                if not ok:
+                    raise Abort(newError("Can't find instance {}", field))
+                instance.env.set(field, stack[-1], True)
+                stack[-1] = None
+
+            elif op == code.OpUpdateName:
+                name = consts[ins[ip]]
+                operator = consts[ins[ip + 1]]
+                ip += 2
+                scope, slot = env.find(name)
+                if scope is None:
+                    raise Abort(newError("Can't assign value before declaration"))
+                scope.values[slot] = infix(operator, scope.values[slot], stack[-1])
+                stack[-1] = None
+
+            elif op == code.OpUpdateIndex:
+                operator = consts[ins[ip]]
+                ip += 1
+                index = stack.pop()
+                values, idx = check(evaluator.indexCell(stack.pop(), index))
+                values[idx] = infix(operator, values[idx], stack[-1])
+                stack[-1] = None
+
+            elif op == code.OpUpdateField:
+                name = consts[ins[ip]]
+                member = consts[ins[ip + 1]]
+                operator = consts[ins[ip + 2]]
+                ip += 3
+                instance, ok = env.get(name)
+                if not ok or not isinstance(instance, object.ClassInstance):
+                    raise Abort(newError("Can't find object {}", name))
+                if member.get(instance.env) is None:
+                    raise Abort(newError("Can't find instance {}", member.name))
+                values = instance.env.values
+                values[member.slot] = infix(operator, values[member.slot], stack[-1])
+                stack[-1] = None
+
+            elif op == code.OpClass:
+                frame.ip = ip + 1
+                frame.env = env
+                frame = Frame(consts[ins[ip]], object.Environment(None, False), len(stack))
+                frames.append(frame)
+                ins = frame.fn.instructions
+                consts = frame.fn.constants
+                blocks = frame.blocks
+                env = frame.env
+                ip = 0
+
+            elif op == code.OpClassEnd:
+                newClass = object.Class(frame.fn.body, env)
+                del stack[frame.base:]
+                frames.pop()
+                frame = frames[-1]
+                ins = frame.fn.instructions
+                consts = frame.fn.constants
+                blocks = frame.blocks
+                env = frame.env
+                ip = frame.ip
+                stack.append(newClass)
+
+            elif op == code.OpError:
+                raise Abort(newError(consts[ins[ip]]))
+
+            else:
+                raise Abort(newError("unknown opcode {}", op))
+
+# operators without a dedicated fast path
+binaryOps = {
+    code.OpMul          : "*",
+    code.OpDiv          : "/",
+    code.OpMod          : "%",
+    code.OpNotEqual     : "!=",
+    code.OpGreaterThan  : ">",
+    code.OpLessEqual    : "<=",
+    code.OpGreaterEqual : ">=",
+    code.OpAnd          : "&&",
+    code.OpOr           : "||",
+}
+
+def check(obj : object.Object) -> object.Object:
+    if isinstance(obj, object.Error):
+        raise Abort(obj)
+    return obj
+
+def infix(operator : str, left : object.Object, right : object.Object) -> object.Object:
+    return check(evaluator.evalInfixExpression(operator, left, right))
+
+# compile and run a program: same signature and result as evaluator.Eval
+def run(program : ast.Program, env : object.Environment) -> object.Object:
+    bytecode = compiler.Compiler().compileProgram(program)
+    return VM(bytecode, env).run()
@@ -0,0 +1,69 @@
+from dataclasses import dataclass
+import _Object.object as object
+import _Vm.vm as vm
+import _Evaluator.evaluator_test as evaluator_test
+
+# programs run through the compiler and the vm (the evaluator test suite
+# runs on every backend in _Repl/backends_test.py)
+class TestVM(evaluator_test.ProgramTest):
+    backend = staticmethod(vm.run)
+
+    def testLoopResults(self):
+        @dataclass
+        class TestCase:
+            input : str
+            expected : any
+
+        tests = [
+            TestCase("let a = 0; while (a < 3) { a = a + 1; a; }", 3),
+            TestCase("let a = 0; while (a < 3) { a = a + 1; continue; }", None),
+            TestCase("let a = 0; while (true) { a = a + 1; if (a == 5) { break; } }", None),
+            TestCase("for(let i = 0; i < 3; i = i + 1) { i; }", 2),
+            TestCase("let f = fn() { for(let i = 0; i < 10; i = i + 1) { if (i == 4) { return i; } } }; f();", 4),
+            TestCase("let s = 0; for(let i = 0; i < 5; i = i + 1) { if (i % 2 == 0) { continue; } s = s + i; }; s;", 4),
+        ]
+
+        for elem in tests:
+            evaluated = self.eval(elem.input)
+            if isinstance(elem.expected, int):
+                self.typeObject(evaluated, elem.expected, object.Integer)
+            else:
+                self.nullObject(evaluated)
+
+    def testClasses(self):
+        input = """
+            let Counter = class {
+                let count = 0;
+                let inc = fn(n) { count = count + n; return count; };
+            };
+            let a = Counter();
+            let b = Counter();
+            a.inc(2);
+            a.inc(3);
+            let b.count = 10;
+            b.inc(1) + a.count;
+        """
+
+        self.typeObject(self.eval(input), 16, object.Integer)
+
+    def testControlFlowErrors(self):
+        @dataclass
+        class TestCase:
+            input : str
+            expectedMessage : str
+
+        tests = [
+            TestCase("break;", "Can't use break outside a loop"),
+            TestCase("while (true) { let f = fn() { continue; }; f(); }", "Can't use continue outside a loop"),
+            TestCase("let f = fn(x) { x }; f(1, 2);", "wrong number of parametrs: wanted 1, got 2"),
+            TestCase("let a = 1; a.field;", "a does not exist in current scope"),
+        ]
+
+        for elem in tests:
+            evaluated = self.eval(elem.input)
+            self.checkInstanceOf(evaluated, object.Error)
+            self.checkValue(evaluated.message, elem.expectedMessage)
+
+    def testExit(self):
+        evaluated = self.eval("let f = fn() { exit(); 10 }; let x = f(); 5; exit(); 20;")
+        self.assertEqual(evaluated, object.EXIT, "program did not exit")
@@ -1,12 +1,49 @@
 import _Repl.repl as repl
 import _Repl.exec as exec
-import sys
+import _Repl.backends as backends
+import _Stack.stack as stack
+import _Evaluator.evaluator as evaluator
+import _Optimizer.inline as inline
+import _Parser.cache as cache
+import argparse
 
 def main():
-    if len(sys.argv) == 1:
-        repl.start()
+    argParser = argparse.ArgumentParser(description="YAMI: Yet Another Monkey Interpreter")
+    argParser.add_argument("file", nargs="?", help="script to execute, REPL if omitted")
+    argParser.add_argument("--backend", choices=backends.backends.keys(), default=backends.DEFAULT,
+                           help="execution backend (default: {})".format(backends.DEFAULT))
+    argParser.add_argument("--max-depth", type=int, default=None,
+                           help="maximum evaluation depth of the stack backend (default: unlimited)")
+    argParser.add_argument("--optimize", action="store_true",
+                           help="run the optimization passes on the program before executing it")
+    argParser.add_argument("--report", action="store_true",
+                           help="print what the optimization passes did on stderr")
+    argParser.add_argument("--inline-size", type=int, default=inline.MAX_NODES,
+                           help="largest function body, in nodes, inlined by --optimize (default: {})".format(inline.MAX_NODES))
+    argParser.add_argument("--inline-sites", type=int, default=inline.MAX_SITES,
+                           help="most calls of a function inlined by --optimize (default: {})".format(inline.MAX_SITES))
+    argParser.add_argument("--jit-threshold", type=int, default=evaluator.JIT_THRESHOLD,
+                           help="calls of a function after which the eval backend compiles it to python, 0 disables (default: {})".format(evaluator.JIT_THRESHOLD))
+    argParser.add_argument("--emit-python", action="store_true",
+                           help="print a python module running the script, instead of executing it")
+    argParser.add_argument("--no-cache", action="store_true",
+                           help="parse the script again instead of loading its cached program")
+    argParser.add_argument("--cache-dir", default=None,
+                           help="directory of the cached programs (default: {} next to the script)".format(cache.CACHE_SUBDIR))
+    args = argParser.parse_args()
+    stack.MAX_DEPTH = args.max_depth
+    inline.MAX_NODES = args.inline_size
+    inline.MAX_SITES = args.inline_sites
+    evaluator.JIT_THRESHOLD = args.jit_threshold
+    cache.ENABLED = not args.no_cache
+    cache.CACHE_DIR = args.cache_dir
+
+    if args.file is None:
+        repl.start(args.backend, args.optimize, args.report)
+    elif args.emit_python:
+        exec.emitPython(args.file, args.optimize, args.report)
     else:
-        exec.start(sys.argv[1])
+        exec.start(args.file, args.backend, args.optimize, args.report)
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()